@@ -0,0 +1,100 @@
+# CryptoTerminal-slim.spec
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Облегченная сборка: из ccxt только площадки терминала (вместо ~110 бирж и async/pro-версий),
+# без неиспользуемых модулей Qt и без async-стека ccxt (aiohttp и т.п.).
+# Раскладка onedir: exe лежит рядом с библиотеками, поэтому при каждом запуске
+# ничего не распаковывается во временный каталог, как в onefile.
+#
+#   pyinstaller CryptoTerminal-slim.spec          ->  dist/CryptoTerminal/CryptoTerminal(.exe)
+#   python -m benchmarks.build_startup dist/CryptoTerminal/CryptoTerminal
+#
+# ccxt/__init__.py импортирует все биржи, поэтому в рантайме пакет ccxt
+# регистрирует packaging/rthook_ccxt_slim.py без выполнения __init__.py.
+
+import os
+
+import ccxt
+
+block_cipher = None
+
+BASE_DIR = SPECPATH
+# mexc — основная площадка; остальные — для сводных котировок (src.core.venues.SUPPORTED_VENUES)
+USED_EXCHANGES = {'mexc', 'binance', 'bybit', 'okx'}
+
+added_datas = [
+    (os.path.join(BASE_DIR, '.env'), '.')
+] if os.path.exists(os.path.join(BASE_DIR, '.env')) else []
+
+hidden_imports_list = [
+    'pyqt5.sip',
+    'dotenv',
+] + [f'ccxt.{exchange_id}' for exchange_id in sorted(USED_EXCHANGES)] + [
+    f'ccxt.abstract.{exchange_id}' for exchange_id in sorted(USED_EXCHANGES)
+]
+
+unused_exchanges = [exchange_id for exchange_id in ccxt.exchanges if exchange_id not in USED_EXCHANGES]
+excludes_list = (
+    [f'ccxt.{exchange_id}' for exchange_id in unused_exchanges] +
+    [f'ccxt.abstract.{exchange_id}' for exchange_id in unused_exchanges] +
+    ['ccxt.async_support', 'ccxt.pro', 'ccxt.test'] +
+    # Async-стек нужен только ccxt.async_support
+    ['aiohttp', 'aiodns', 'pycares', 'yarl', 'multidict', 'frozenlist', 'aiosignal', 'aiohappyeyeballs', 'propcache'] +
+    # Используются только QtCore, QtGui и QtWidgets
+    ['PyQt5.QtNetwork', 'PyQt5.QtQml', 'PyQt5.QtQuick', 'PyQt5.QtSql', 'PyQt5.QtSvg', 'PyQt5.QtWebEngine',
+     'PyQt5.QtWebEngineCore', 'PyQt5.QtWebEngineWidgets', 'PyQt5.QtMultimedia', 'PyQt5.QtOpenGL',
+     'PyQt5.QtPrintSupport', 'PyQt5.QtTest', 'PyQt5.QtXml', 'PyQt5.QtBluetooth', 'PyQt5.QtPositioning',
+     'PyQt5.QtDBus', 'PyQt5.QtDesigner', 'PyQt5.QtHelp', 'PyQt5.Qt3DCore'] +
+    ['tkinter', 'numpy', 'pandas', 'IPython']
+)
+
+a = Analysis(
+    [os.path.join(BASE_DIR, 'src', 'main_app.py')],
+    pathex=[os.path.join(BASE_DIR, 'src'), BASE_DIR],
+    binaries=[],
+    datas=added_datas,
+    hiddenimports=hidden_imports_list,
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[os.path.join(BASE_DIR, 'packaging', 'rthook_ccxt_slim.py')],
+    excludes=excludes_list,
+    win_no_prefer_redirects=False,
+    win_private_assemblies=False,
+    cipher=block_cipher,
+    noarchive=False,
+)
+
+# Переводы Qt и QML приложению не нужны (интерфейс на русском задан в коде)
+a.datas = [entry for entry in a.datas
+           if not any(part in entry[0].replace('\\', '/') for part in ('/translations/', '/qml/'))]
+
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='CryptoTerminal',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,  # Распаковка UPX замедляет запуск сильнее, чем экономит места
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='CryptoTerminal',
+)
@@ -0,0 +1,157 @@
+# benchmarks/build_startup.py
+"""
+Бенчмарк собранного приложения: размер сборки, время до main (включая
+распаковку onefile) и время до показа экрана логина.
+
+    python -m benchmarks.build_startup dist/CryptoTerminal.exe dist/CryptoTerminal/CryptoTerminal.exe
+    python -m benchmarks.build_startup source          # запуск из исходников для сравнения
+
+Приложение запускается с CRYPTO_STARTUP_REPORT=exit: после прогрева биржи оно
+пишет startup_report.json в CRYPTO_DATA_DIR и закрывается. Проверка версии
+клиента отвечает локальная заглушка бэкенда. Время до main — от запуска
+процесса до начала выполнения main_app (загрузчик PyInstaller, распаковка
+onefile, инициализация интерпретатора); разница этого времени между onefile
+и onedir — оценка стоимости распаковки.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+LOGIN_MARK = "окно показано"
+EXCHANGE_MARK = "биржа готова"
+
+
+class _VersionCheckHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = json.dumps({'message': 'ok'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_backend_stub():
+    server = HTTPServer(('127.0.0.1', 0), _VersionCheckHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def describe_build(target: str):
+    """Returns: (команда запуска, раскладка 'onefile'/'onedir'/'source', размер в байтах или None)."""
+    if target == 'source':
+        return [sys.executable, '-m', 'src.main_app'], 'source', None
+    target = os.path.abspath(target)
+    build_dir = os.path.dirname(target)
+    # Сборка onedir: рядом с exe каталог _internal (PyInstaller 6) или библиотеки Qt
+    if os.path.isdir(os.path.join(build_dir, '_internal')) or os.path.isdir(os.path.join(build_dir, 'PyQt5')):
+        return [target], 'onedir', _dir_size(build_dir)
+    return [target], 'onefile', os.path.getsize(target)
+
+
+def run_once(command, backend_url, timeout):
+    data_dir = tempfile.mkdtemp(prefix='crypto_startup_')
+    env = dict(os.environ, CRYPTO_STARTUP_REPORT='exit', CRYPTO_DATA_DIR=data_dir,
+               CRYPTO_BACKEND_URL=backend_url, BACKFILL_SYMBOLS='')
+    launched_at = time.time()
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        return None, f"не завершилось за {timeout} с"
+    wall_ms = (time.time() - launched_at) * 1000
+    report_path = os.path.join(data_dir, 'startup_report.json')
+    if not os.path.exists(report_path):
+        return None, f"нет startup_report.json (код возврата {process.returncode})"
+    with open(report_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    marks = {mark['name']: mark['ms'] for mark in report['marks']}
+    pre_main_ms = (report['started_at'] - launched_at) * 1000
+    if LOGIN_MARK not in marks:
+        return None, "в отчете нет отметки показа окна"
+    return {
+        'pre_main_ms': pre_main_ms,
+        'login_screen_ms': pre_main_ms + marks[LOGIN_MARK],
+        'exchange_ready_ms': pre_main_ms + marks[EXCHANGE_MARK] if EXCHANGE_MARK in marks else None,
+        'wall_ms': wall_ms,
+    }, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Размер и время запуска сборок Крипто-Терминала")
+    parser.add_argument('targets', nargs='+', help="пути к exe (onefile или onedir) или 'source'")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    server, backend_url = _start_backend_stub()
+    results = {}
+    try:
+        for target in args.targets:
+            command, layout, size = describe_build(target)
+            runs, errors = [], []
+            for _ in range(args.runs):
+                run, error = run_once(command, backend_url, args.timeout)
+                if error:
+                    errors.append(error)
+                else:
+                    runs.append(run)
+            summary = {'layout': layout, 'size_mb': size / 2 ** 20 if size else None, 'runs': runs, 'errors': errors}
+            for key in ('pre_main_ms', 'login_screen_ms', 'exchange_ready_ms'):
+                values = [run[key] for run in runs if run[key] is not None]
+                summary[key] = statistics.median(values) if values else None
+            results[target] = summary
+
+            size_text = f"{summary['size_mb']:.1f} МБ" if size else "—"
+            print(f"{target} [{layout}], размер {size_text}")
+            if runs:
+                exchange_text = f"{summary['exchange_ready_ms']:.0f}" if summary['exchange_ready_ms'] else "—"
+                print(f"  до main {summary['pre_main_ms']:.0f} мс, до экрана логина {summary['login_screen_ms']:.0f} мс, "
+                      f"биржа готова {exchange_text} мс (медиана из {len(runs)})")
+            for error in errors:
+                print(f"  ошибка: {error}")
+    finally:
+        server.shutdown()
+
+    onefile = [r for r in results.values() if r['layout'] == 'onefile' and r['pre_main_ms'] is not None]
+    onedir = [r for r in results.values() if r['layout'] == 'onedir' and r['pre_main_ms'] is not None]
+    if onefile and onedir:
+        extraction_ms = onefile[0]['pre_main_ms'] - onedir[0]['pre_main_ms']
+        speedup = onefile[0]['login_screen_ms'] / onedir[0]['login_screen_ms']
+        print(f"\nОценка распаковки onefile: {extraction_ms:.0f} мс; экран логина onedir быстрее в {speedup:.1f} раза")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, time.strftime('startup-%Y%m%d-%H%M%S.json'))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Результаты: {path}")
+    return 1 if any(r['errors'] for r in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
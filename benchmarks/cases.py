@@ -0,0 +1,227 @@
+# benchmarks/cases.py
+"""
+Сценарии бенчмарков горячих путей: разбор рынков, поиск/сортировка списка,
+обновление цен в списке, индекс сканера спредов, фильтры скринера, проверка
+оповещений, предсказание и отрисовка графика.
+
+Каждый сценарий — функция setup(context), возвращающая вызываемый объект
+без аргументов; замеряется только он. context содержит общие для прогона
+объекты (QApplication, фикстуру, MexcService на FakeExchange).
+"""
+import random
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPainter
+
+from src.core.fake_exchange import FakeExchange
+from src.core.mexc_service import MexcService
+from src.core.simple_predictor import get_simple_price_prediction
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def _make_service(context):
+    fixture = context['fixture']
+    return MexcService(exchange_factory=lambda config: FakeExchange(fixture, config))
+
+
+def _synthetic_ohlcv(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    price, candles = 100.0, []
+    for i in range(count):
+        open_ = price
+        price = max(0.01, price * (1 + rng.gauss(0, 0.003)))
+        candles.append([1_700_000_000_000 + i * 300_000, open_, max(open_, price) * 1.001,
+                        min(open_, price) * 0.999, price, rng.uniform(1, 100)])
+    return candles
+
+
+@benchmark("load_markets_data")
+def bench_load_markets_data(context):
+    service = _make_service(context)
+    service.exchange.load_markets()  # Замеряем разбор, а не "загрузку" из фикстуры
+
+    def run():
+        service._markets_cache = {}  # Полный разбор, без повторного использования уже разобранных рынков
+        service.load_markets_data()
+    return run
+
+
+@benchmark("load_markets_data/cached")
+def bench_load_markets_data_cached(context):
+    service = _make_service(context)
+    service.load_markets_data()
+    return service.load_markets_data
+
+
+@benchmark("parse_precision_value")
+def bench_parse_precision_value(context):
+    service = context['service']
+    inputs = []
+    for market in context['fixture']['markets'].values():
+        inputs.extend((market['precision']['price'], market['precision']['amount']))
+    inputs.extend([None, 0, 8, 2, '0.001', 1e-8, 10])
+
+    def run():
+        parse = service._parse_precision_value
+        for value in inputs:
+            parse(value)
+    return run
+
+
+def _make_coin_list_widget(context, markets):
+    from src.widgets.coin_list_widget import CoinListWidget
+    widget = CoinListWidget(context['service'])
+    # Запросы цен после фильтрации не нужны: замеряется только поиск/сортировка и заполнение списка
+    widget.request_price_updates_for_displayed_items = lambda: None
+    widget.all_markets_data_full = markets
+    context.setdefault('_keep_alive', []).append(widget)
+    return widget
+
+
+@benchmark("sort_search/name_desc")
+def bench_sort_search_name(context):
+    widget = _make_coin_list_widget(context, context['markets'])
+    widget.ui.sort_combo_box.blockSignals(True)
+    widget.ui.sort_combo_box.setCurrentIndex(2)  # "Имя ↓"
+    return widget.handle_sort_or_search_changed
+
+
+@benchmark("sort_search/search_text")
+def bench_sort_search_text(context):
+    widget = _make_coin_list_widget(context, context['markets'])
+    widget.ui.search_line_edit.blockSignals(True)
+    widget.ui.search_line_edit.setText("c01")
+    return widget.handle_sort_or_search_changed
+
+
+@benchmark("handle_tickers_fetched/50_rows")
+def bench_handle_tickers_fetched(context):
+    widget = _make_coin_list_widget(context, context['markets'])
+    widget.handle_sort_or_search_changed()
+    symbols = [info['symbol'] for info in widget.currently_displayed_items_info]
+    tickers, _ = context['service'].fetch_tickers(symbols)
+    widget.price_update_timer.stop()
+
+    def run():
+        widget._handle_tickers_fetched(tickers, None)
+        widget.price_update_timer.stop()
+    return run
+
+
+@benchmark("spread_scanner/update_venue")
+def bench_spread_scanner_update(context):
+    from src.core.spread_scanner import SpreadScanner
+    # Тикеры фикстуры на трех "площадках" с небольшим расхождением цен; замеряется приход одной из них
+    rng = random.Random(11)
+    venues = {}
+    for venue_id in ('mexc', 'binance', 'okx'):
+        venues[venue_id] = {}
+        for symbol, ticker in context['fixture']['tickers'].items():
+            shift = 1 + rng.uniform(-0.003, 0.003)
+            venues[venue_id][symbol] = {'bid': ticker['bid'] * shift, 'ask': ticker['ask'] * shift}
+    scanner = SpreadScanner()
+    for venue_id, tickers in venues.items():
+        scanner.update(venue_id, tickers)
+    # Чередуем два набора цен: неизменившиеся котировки сканер пропускает, а замеряем пересчет
+    moved = {symbol: {'bid': t['bid'] * 1.001, 'ask': t['ask'] * 1.001} for symbol, t in venues['okx'].items()}
+    batches = [moved, venues['okx']]
+    state = {'i': 0}
+
+    def run():
+        state['i'] ^= 1
+        scanner.update('okx', batches[state['i']])
+        scanner.top(100)
+    return run
+
+
+def _make_screener(context):
+    from src.core.screener import MarketScreener
+    service = _make_service(context)
+    markets, _ = service.load_markets_data()
+    tickers, _ = service.fetch_tickers()
+    screener = MarketScreener()
+    screener.set_universe(markets)
+    for _ in range(screener.TREND_LOOKBACK):
+        screener.update_tickers(tickers)
+    return screener, tickers
+
+
+@benchmark("screener/update_tickers")
+def bench_screener_update_tickers(context):
+    screener, tickers = _make_screener(context)
+    return lambda: screener.update_tickers(tickers)
+
+
+@benchmark("screener/evaluate")
+def bench_screener_evaluate(context):
+    from src.core.screener import TREND_FLAT
+    screener, _ = _make_screener(context)
+    # Изменение, объем, спред и тренд по всем USDT-парам фикстуры с сортировкой по объему
+    filters = [('change_pct', '>', -1.0), ('volume', '>', 1000.0), ('spread_pct', '<', 5.0), ('trend', '==', TREND_FLAT)]
+    return lambda: screener.evaluate(filters, sort_by='volume')
+
+
+@benchmark("alerts/check_tickers/5000_rules")
+def bench_alerts_check_tickers(context):
+    from src.core.alerts import AlertEngine
+    # Полный ответ fetch_tickers против 5000 правил, ни одно из которых не срабатывает (обычный тик)
+    rng = random.Random(5)
+    tickers = {symbol: {'last_price': t['last'], 'bid': t['bid'], 'ask': t['ask'], 'change_pct': 0.0}
+               for symbol, t in context['fixture']['tickers'].items() if t.get('last') and t.get('bid') and t.get('ask')}
+    symbols = list(tickers)
+    engine = AlertEngine()
+    for _ in range(5000):
+        symbol = rng.choice(symbols)
+        metric = rng.choice(('price', 'change_pct'))
+        direction = rng.choice(('above', 'below'))
+        if metric == 'price':
+            factor = rng.uniform(1.05, 1.5) if direction == 'above' else rng.uniform(0.5, 0.95)
+            threshold = tickers[symbol]['last_price'] * factor
+        else:
+            threshold = rng.uniform(5, 50) if direction == 'above' else -rng.uniform(5, 50)
+        engine.add_rule(symbol, metric, direction, threshold)
+    return lambda: engine.check_tickers(tickers)
+
+
+@benchmark("simple_price_prediction")
+def bench_simple_price_prediction(context):
+    ohlcv = _synthetic_ohlcv(100)
+    return lambda: get_simple_price_prediction(ohlcv, 5)
+
+
+def _bench_draw_price_chart(context, count: int):
+    from src.ui.trade_ui import TradeUi
+    ui = TradeUi()
+    ui.resize(1000, 700)
+    ui.show()
+    context['app'].processEvents()
+    context.setdefault('_keep_alive', []).append(ui)
+    ohlcv = _synthetic_ohlcv(count)
+    prediction = (ohlcv[-1][4] * 1.01, "Рост", None)
+    image = QImage(ui.chart_view.viewport().size(), QImage.Format_ARGB32_Premultiplied)
+
+    def run():
+        # Построение сцены + растеризация, как при реальной отрисовке вьюпорта
+        ui.draw_price_chart(ohlcv, prediction, 2)
+        painter = QPainter(image)
+        ui.chart_scene.render(painter)
+        painter.end()
+    return run
+
+
+@benchmark("draw_price_chart/100")
+def bench_draw_price_chart_100(context):
+    return _bench_draw_price_chart(context, 100)
+
+
+@benchmark("draw_price_chart/1000")
+def bench_draw_price_chart_1000(context):
+    return _bench_draw_price_chart(context, 1000)
@@ -0,0 +1,157 @@
+# benchmarks/run_benchmarks.py
+"""
+Воспроизводимые бенчмарки горячих путей на офлайн-бирже (FakeExchange).
+
+Запуск из корня проекта:
+    python -m benchmarks.run_benchmarks                  # все сценарии
+    python -m benchmarks.run_benchmarks -k draw_price     # фильтр по имени
+    python -m benchmarks.run_benchmarks --fixture rec.json  # записанная фикстура вместо синтетической
+
+Результаты пишутся в benchmarks/results/<коммит>.json и сравниваются с
+предыдущим прогоном (или с --baseline). Замедление медианы больше
+--threshold считается регрессией, код возврата при этом 1.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('BACKFILL_SYMBOLS', '')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from PyQt5.QtWidgets import QApplication
+
+from src.core.fake_exchange import FakeExchange, generate_fixture, load_fixture
+from src.core.mexc_service import MexcService
+from benchmarks.cases import BENCHMARKS
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+MIN_RUN_TIME_SEC = 0.2  # Каждый повтор длится не меньше этого (подбирается число вызовов)
+
+
+def _git_revision():
+    try:
+        sha = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                      stderr=subprocess.DEVNULL, text=True).strip()
+        dirty = subprocess.call(['git', 'diff', '--quiet', 'HEAD', '--', 'src', 'benchmarks'], cwd=PROJECT_ROOT,
+                                stderr=subprocess.DEVNULL)
+        return sha + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return time.strftime('run-%Y%m%d-%H%M%S')
+
+
+def _autorange(func):
+    # Как timeit.autorange: удваиваем число вызовов, пока один повтор не займет MIN_RUN_TIME_SEC
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= MIN_RUN_TIME_SEC:
+            return number
+        number *= 2
+
+
+def run_case(setup, context, repeat: int):
+    func = setup(context)
+    func()  # Прогрев: ленивые импорты, кэши Qt
+    number = _autorange(func)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number * 1e6)
+    return {'number': number, 'repeat': repeat, 'min_us': min(samples),
+            'median_us': statistics.median(samples), 'max_us': max(samples)}
+
+
+def _latest_results(exclude_revision: str):
+    paths = [p for p in glob.glob(os.path.join(RESULTS_DIR, '*.json'))
+             if os.path.splitext(os.path.basename(p))[0] != exclude_revision]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def compare(current: dict, baseline: dict, threshold: float):
+    """Returns: list (имя, было мкс, стало мкс, отношение, регрессия ли)."""
+    rows = []
+    for name, result in current['results'].items():
+        old = baseline['results'].get(name)
+        if not old:
+            continue
+        ratio = result['median_us'] / old['median_us'] if old['median_us'] else 1.0
+        rows.append((name, old['median_us'], result['median_us'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки горячих путей Крипто-Терминала")
+    parser.add_argument('-k', '--filter', default='', help="подстрока имени сценария")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--markets', type=int, default=2000, help="размер синтетической фикстуры")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--fixture', help="JSON-фикстура, записанная record_fixture")
+    parser.add_argument('--baseline', help="файл результатов или ревизия для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.15, help="допустимое замедление (0.15 = 15%%)")
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    fixture = load_fixture(args.fixture) if args.fixture else generate_fixture(args.markets, args.seed)
+    service = MexcService(exchange_factory=lambda config: FakeExchange(fixture, config))
+    markets, error_msg = service.load_markets_data()
+    if error_msg:
+        print(f"Не удалось разобрать фикстуру: {error_msg}")
+        return 2
+    context = {'app': app, 'fixture': fixture, 'service': service, 'markets': markets}
+
+    revision = _git_revision()
+    current = {
+        'revision': revision, 'created_at': time.time(), 'python': platform.python_version(),
+        'platform': platform.platform(), 'markets': len(markets), 'results': {},
+    }
+    print(f"Ревизия {revision}, рынков в фикстуре: {len(fixture['markets'])} (USDT-спот: {len(markets)})")
+    for name, setup in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+        result = run_case(setup, context, args.repeat)
+        current['results'][name] = result
+        print(f"  {name:<34} {result['median_us']:>12.1f} мкс  (min {result['min_us']:.1f}, x{result['number']})")
+
+    baseline_path = args.baseline
+    if baseline_path and not os.path.exists(baseline_path):
+        baseline_path = os.path.join(RESULTS_DIR, f"{baseline_path}.json")
+    if not baseline_path:
+        baseline_path = _latest_results(revision)
+
+    exit_code = 0
+    if baseline_path and os.path.exists(baseline_path):
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nСравнение с {baseline.get('revision')} (порог +{args.threshold * 100:.0f}%):")
+        for name, old_us, new_us, ratio, regressed in compare(current, baseline, args.threshold):
+            mark = "РЕГРЕССИЯ" if regressed else ""
+            print(f"  {name:<34} {old_us:>12.1f} -> {new_us:>12.1f} мкс  x{ratio:.2f} {mark}")
+            if regressed:
+                exit_code = 1
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{revision}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"\nРезультаты: {path}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
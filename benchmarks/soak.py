@@ -0,0 +1,190 @@
+# benchmarks/soak.py
+"""
+Длительный прогон приложения на офлайн-бирже с ускоренными обновлениями.
+
+Окно работает как обычно (список монет, экран торговли, фоновая догрузка
+свечей), но все таймеры обновления ускорены в --speedup раз, а биржа
+FakeExchange добавляет задержки, ошибки и серверный лимит запросов.
+Каждые --sample-sec секунд снимаются RSS процесса, память Python
+(tracemalloc), число потоков и живых QThread. В конце считается наклон
+роста памяти (МБ/час); превышение --max-growth-mb-per-hour — код возврата 1.
+
+    python -m benchmarks.soak --minutes 120 --speedup 10 --latency-ms 80 --error-rate 0.02
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('CRYPTO_DATA_DIR', tempfile.mkdtemp(prefix='crypto_soak_'))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+
+
+def _rss_mb():
+    # Текущий RSS (Linux: /proc/self/statm); на других ОС — пиковый из getrusage
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+def _os_thread_count():
+    # QThread не видны в threading, поэтому считаем потоки процесса у ОС
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return threading.active_count()
+
+
+def _slope_per_hour(samples, key):
+    # Наклон линейной регрессии значения по времени, в единицах в час
+    if len(samples) < 2:
+        return 0.0
+    xs = [s['t'] for s in samples]
+    ys = [s[key] for s in samples]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if not var_x:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x * 3600
+
+
+def _speed_up_timers(TradeWidget, CoinListWidget, RefreshScheduler, speedup: float):
+    # Интервалы виджетов — атрибуты *_INTERVAL_MS; ускоряем их до создания окна
+    RefreshScheduler.MIN_INTERVAL_MS = max(50, int(RefreshScheduler.MIN_INTERVAL_MS / speedup))
+    RefreshScheduler.MAX_TICK_MS = max(50, int(RefreshScheduler.MAX_TICK_MS / speedup))
+    RefreshScheduler.IDLE_FACTOR = 1.0  # Нагрузка не должна зависеть от фокуса окна во время прогона
+    for name in dir(TradeWidget):
+        if name.endswith('_INTERVAL_MS'):
+            setattr(TradeWidget, name, max(50, int(getattr(TradeWidget, name) / speedup)))
+    original_init = CoinListWidget.__init__
+
+    def patched_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.PRICE_UPDATE_INTERVAL_MS = max(50, int(self.PRICE_UPDATE_INTERVAL_MS / speedup))
+    CoinListWidget.__init__ = patched_init
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak-прогон Крипто-Терминала на офлайн-бирже")
+    parser.add_argument('--minutes', type=float, default=60)
+    parser.add_argument('--speedup', type=float, default=10, help="во сколько раз ускорить таймеры обновления")
+    parser.add_argument('--fixture', help="JSON-фикстура (по умолчанию синтетическая)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=30)
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    parser.add_argument('--rate-limit', type=float, default=20, help="серверный лимит запросов/сек")
+    parser.add_argument('--switch-sec', type=float, default=20, help="как часто менять экран/пару")
+    parser.add_argument('--sample-sec', type=float, default=10)
+    parser.add_argument('--max-growth-mb-per-hour', type=float, default=20)
+    args = parser.parse_args(argv)
+
+    # Офлайн-биржу MainWindow собирает из конфига, поэтому окружение задаем до импорта src
+    os.environ['CRYPTO_FAKE_EXCHANGE'] = args.fixture or 'synthetic'
+    os.environ['CRYPTO_FAKE_LATENCY_MS'] = str(args.latency_ms)
+    os.environ['CRYPTO_FAKE_JITTER_MS'] = str(args.jitter_ms)
+    os.environ['CRYPTO_FAKE_ERROR_RATE'] = str(args.error_rate)
+    os.environ['CRYPTO_FAKE_RATE_LIMIT'] = str(args.rate_limit)
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QThread, QTimer
+    from src.widgets.trade_widget import TradeWidget
+    from src.widgets.coin_list_widget import CoinListWidget
+    from src.core.refresh_scheduler import RefreshScheduler
+    from src.main_window import MainWindow
+
+    _speed_up_timers(TradeWidget, CoinListWidget, RefreshScheduler, args.speedup)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = MainWindow()
+    # Вход через бэкенд не нужен: "ключи" для приватных запросов к FakeExchange
+    service = window.mexc_service
+    service.set_api_credentials('soak', 'soak')
+    window.show()
+    window.show_coin_list_screen()
+
+    rng = random.Random(args.seed)
+    tracemalloc.start()
+    started = time.monotonic()
+    samples = []
+
+    def switch_screen():
+        # Чередуем список монет и экран торговли случайной пары
+        if window.stacked_widget.currentWidget() is window.trade_widget or not window.coin_list_widget.all_markets_data_full:
+            window.show_coin_list_screen()
+            return
+        markets = {m['symbol']: m for m in window.coin_list_widget.all_markets_data_full}
+        symbol = rng.choice(sorted(markets)[:200])
+        window.show_trade_screen(dict(markets[symbol]))
+
+    def take_sample():
+        current, _ = tracemalloc.get_traced_memory()
+        sample = {
+            't': time.monotonic() - started,
+            'rss_mb': _rss_mb(),
+            'py_heap_mb': current / 2 ** 20,
+            'threads': _os_thread_count(),
+            'qthreads': len(window.findChildren(QThread)),
+            'requests': sum(getattr(e, 'request_count', 0) for e in (service.exchange, service.private_exchange)),
+            'rejected': sum(getattr(e, 'rejected_count', 0) for e in (service.exchange, service.private_exchange)),
+        }
+        samples.append(sample)
+        print(f"[{sample['t'] / 60:6.1f} мин] RSS {sample['rss_mb']:7.1f} МБ, heap {sample['py_heap_mb']:6.1f} МБ, "
+              f"потоков {sample['threads']}, QThread {sample['qthreads']}, запросов {sample['requests']} "
+              f"(429: {sample['rejected']})")
+
+    switch_timer = QTimer()
+    switch_timer.timeout.connect(switch_screen)
+    switch_timer.start(int(args.switch_sec * 1000))
+    sample_timer = QTimer()
+    sample_timer.timeout.connect(take_sample)
+    sample_timer.start(int(args.sample_sec * 1000))
+    QTimer.singleShot(int(args.minutes * 60 * 1000), app.quit)
+    app.exec_()
+
+    take_sample()
+    window.close()
+    for thread in window.findChildren(QThread):
+        thread.wait(5000)
+
+    # Первые 10% прогона — прогрев (кэши, ленивые импорты), в наклон не входят
+    steady = [s for s in samples if s['t'] >= samples[-1]['t'] * 0.1] or samples
+    summary = {
+        'minutes': args.minutes, 'speedup': args.speedup, 'seed': args.seed,
+        'rss_growth_mb_per_hour': _slope_per_hour(steady, 'rss_mb'),
+        'heap_growth_mb_per_hour': _slope_per_hour(steady, 'py_heap_mb'),
+        'max_threads': max(s['threads'] for s in samples),
+        'max_qthreads': max(s['qthreads'] for s in samples),
+        'metrics': service.metrics.snapshot(),
+        'samples': samples,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, time.strftime('soak-%Y%m%d-%H%M%S.json'))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"\nРост RSS: {summary['rss_growth_mb_per_hour']:.1f} МБ/ч, heap: {summary['heap_growth_mb_per_hour']:.1f} МБ/ч, "
+          f"макс. потоков: {summary['max_threads']}, макс. QThread: {summary['max_qthreads']}")
+    print(f"Результаты: {path}")
+    return 1 if summary['rss_growth_mb_per_hour'] > args.max_growth_mb_per_hour else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# packaging/rthook_ccxt_slim.py
+# Runtime-hook слим-сборки (CryptoTerminal-slim.spec).
+# В сборку из ccxt попадают только base, static_dependencies и площадки
+# терминала (USED_EXCHANGES в spec), а ccxt/__init__.py импортирует все ~110
+# бирж. Поэтому пакет ccxt регистрируется вручную, без выполнения __init__.py;
+# имена верхнего уровня (ccxt.mexc, ccxt.InsufficientFunds, ccxt.TICK_SIZE, ...)
+# подгружаются при первом обращении.
+import importlib
+import importlib.util
+import sys
+import types
+
+
+def _install_slim_ccxt():
+    spec = importlib.util.find_spec('ccxt')
+    if spec is None or 'ccxt' in sys.modules:
+        return
+    package = types.ModuleType('ccxt')
+    package.__spec__ = spec
+    package.__file__ = spec.origin
+    package.__path__ = list(spec.submodule_search_locations or [])
+    package.__package__ = 'ccxt'
+    package.exchanges = ['binance', 'bybit', 'mexc', 'okx']
+
+    def __getattr__(name):
+        if name == '__version__':
+            value = importlib.import_module('ccxt.base.exchange').__version__
+        elif name in package.exchanges:
+            value = getattr(importlib.import_module(f'ccxt.{name}'), name)
+        else:
+            for module_name in ('ccxt.base.errors', 'ccxt.base.decimal_to_precision', 'ccxt.base.exchange'):
+                module = importlib.import_module(module_name)
+                if hasattr(module, name):
+                    value = getattr(module, name)
+                    break
+            else:
+                raise AttributeError(f"module 'ccxt' has no attribute '{name}' (slim build)")
+        setattr(package, name, value)
+        return value
+
+    package.__getattr__ = __getattr__
+    sys.modules['ccxt'] = package
+
+
+_install_slim_ccxt()
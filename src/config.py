@@ -1,24 +1,49 @@
 # src/config.py
 import os
-from dotenv import load_dotenv
 
 # Определяем путь к .env файлу относительно текущего файла (config.py)
 # config.py находится в src/, .env - на уровень выше (в корне проекта)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # Это будет корень проекта
 DOTENV_PATH = os.path.join(BASE_DIR, '.env')
 
-# Загружаем переменные из .env файла
+# Загружаем переменные из .env файла (python-dotenv импортируем, только если файл есть)
 if os.path.exists(DOTENV_PATH):
+    from dotenv import load_dotenv
     load_dotenv(dotenv_path=DOTENV_PATH)
-else:
-    print(f"Warning: .env file not found at {DOTENV_PATH}. Using default values or expecting system env vars.")
 
 # Версия клиентского PyQt приложения из .env
 CLIENT_APP_VERSION = os.environ.get("CLIENT_APP_VERSION_ENV", "1.0.0") # Значение по умолчанию, если в .env нет
 BACKEND_BASE_URL = os.environ.get("CRYPTO_BACKEND_URL", "http://127.0.0.1:8000")
 
-print(BACKEND_BASE_URL)
-print(f"Client App Version loaded from config: {CLIENT_APP_VERSION}") # Для отладки
+# Каталог для локальных данных (архив свечей, чекпоинты и т.п.)
+DATA_DIR = os.environ.get("CRYPTO_DATA_DIR", os.path.join(BASE_DIR, 'data'))
+
+# Фоновая догрузка истории свечей: список пар, таймфреймов и глубина (в свечах)
+BACKFILL_SYMBOLS = [s.strip() for s in os.environ.get("BACKFILL_SYMBOLS", "BTC/USDT,ETH/USDT").split(',') if s.strip()]
+BACKFILL_TIMEFRAMES = [t.strip() for t in os.environ.get("BACKFILL_TIMEFRAMES", "5m,1h").split(',') if t.strip()]
+BACKFILL_MAX_CANDLES = int(os.environ.get("BACKFILL_MAX_CANDLES", "20000"))
+
+# Профилирование UI (время слотов, отрисовки и задержки цикла событий): CRYPTO_UI_PROFILE=1
+UI_PROFILE_ENABLED = os.environ.get("CRYPTO_UI_PROFILE", "0") == "1"
+UI_PROFILE_STALL_MS = float(os.environ.get("CRYPTO_UI_PROFILE_STALL_MS", "16"))
+
+# Офлайн-биржа вместо MEXC: путь к JSON-фикстуре или "synthetic"; пусто — настоящая биржа
+FAKE_EXCHANGE = os.environ.get("CRYPTO_FAKE_EXCHANGE", "")
+FAKE_EXCHANGE_LATENCY_MS = float(os.environ.get("CRYPTO_FAKE_LATENCY_MS", "0"))
+FAKE_EXCHANGE_JITTER_MS = float(os.environ.get("CRYPTO_FAKE_JITTER_MS", "0"))
+FAKE_EXCHANGE_ERROR_RATE = float(os.environ.get("CRYPTO_FAKE_ERROR_RATE", "0"))
+FAKE_EXCHANGE_RATE_LIMIT = float(os.environ.get("CRYPTO_FAKE_RATE_LIMIT", "0")) or None  # запросов/сек
+
+# Дополнительные площадки для сводных котировок (лучший bid/ask в списке монет), через запятую:
+# например "binance,bybit,okx". Торговля и приватные данные — только на MEXC
+MARKET_DATA_VENUES = [v.strip().lower() for v in os.environ.get("CRYPTO_MARKET_DATA_VENUES", "").split(',')
+                      if v.strip()]
+
+# Отчет о времени запуска (импорты модулей и этапы до экрана логина): CRYPTO_STARTUP_REPORT=1;
+# "exit" — записать отчет и закрыть приложение (для бенчмарка сборки)
+STARTUP_REPORT_MODE = os.environ.get("CRYPTO_STARTUP_REPORT", "0")
+STARTUP_REPORT_ENABLED = STARTUP_REPORT_MODE in ("1", "exit")
+STARTUP_REPORT_EXIT = STARTUP_REPORT_MODE == "exit"
 
 def configure_logging():
     pass
\ No newline at end of file
@@ -0,0 +1,119 @@
+# src/core/account_state.py
+import threading
+import time
+
+
+class BalanceCache:
+    """
+    Кэш балансов аккаунта.
+
+    Полный снимок (fetch_balance) загружается один раз, дальше балансы
+    поддерживаются дельтами: исполнения ордеров (apply_fill / apply_order_update)
+    и, если подключен, приватный поток обновлений аккаунта: apply_stream_update —
+    точка подключения для его обработчика (источника потока пока нет).
+    Периодическая сверка полным снимком нужна только для коррекции дрейфа,
+    поэтому может выполняться редко. Если исполнение не удалось применить
+    дельтой (в ответе нет ни cost, ни average), кэш помечается устаревшим
+    (mark_stale) до следующего снимка.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.free = {}
+        self.used = {}
+        self.snapshot_at = None  # time.time() последнего полного снимка
+        self.updated_at = None
+        self.version = 0  # растет при каждом изменении, удобно для проверки "есть ли новое"
+        self.stale = False  # пропущена дельта исполнения — нужна сверка снимком
+
+    def clear(self):
+        with self._lock:
+            self.free = {}
+            self.used = {}
+            self.stale = False
+            self.snapshot_at = None
+            self.updated_at = None
+            self.version += 1
+
+    def is_loaded(self):
+        return self.snapshot_at is not None
+
+    def needs_reconciliation(self, max_age_sec: float):
+        return self.stale or self.snapshot_at is None or time.time() - self.snapshot_at >= max_age_sec
+
+    def mark_stale(self):
+        self.stale = True
+
+    def apply_snapshot(self, raw_balance: dict):
+        # raw_balance в формате ccxt fetch_balance: {'free': {...}, 'used': {...}, 'total': {...}}
+        free = raw_balance.get('free') if isinstance(raw_balance, dict) else None
+        used = raw_balance.get('used') if isinstance(raw_balance, dict) else None
+        with self._lock:
+            self.free = {asset: float(v or 0.0) for asset, v in (free or {}).items()}
+            self.used = {asset: float(v or 0.0) for asset, v in (used or {}).items()}
+            self.stale = False
+            self.snapshot_at = self.updated_at = time.time()
+            self.version += 1
+
+    def apply_stream_update(self, asset: str, free: float, used: float = None):
+        # Приватный поток аккаунта присылает абсолютные значения по активу
+        with self._lock:
+            self.free[asset] = float(free)
+            if used is not None:
+                self.used[asset] = float(used)
+            self.updated_at = time.time()
+            self.version += 1
+
+    def apply_fill(self, base_asset: str, quote_asset: str, side: str, filled_base: float, cost_quote: float,
+                   fee: dict = None):
+        """
+        Применяет исполнение (или его часть) к свободным балансам.
+        filled_base: исполненное кол-во BASE, cost_quote: его стоимость в QUOTE.
+        """
+        if filled_base <= 0 and cost_quote <= 0:
+            return
+        with self._lock:
+            if side == 'buy':
+                self.free[base_asset] = self.free.get(base_asset, 0.0) + filled_base
+                self.free[quote_asset] = max(self.free.get(quote_asset, 0.0) - cost_quote, 0.0)
+            else:
+                self.free[base_asset] = max(self.free.get(base_asset, 0.0) - filled_base, 0.0)
+                self.free[quote_asset] = self.free.get(quote_asset, 0.0) + cost_quote
+            if fee and fee.get('currency') and fee.get('cost'):
+                currency = fee['currency']
+                self.free[currency] = max(self.free.get(currency, 0.0) - float(fee['cost']), 0.0)
+            self.updated_at = time.time()
+            self.version += 1
+
+    def apply_order_update(self, order: dict, base_asset: str, quote_asset: str,
+                           previous_filled: float = 0.0, previous_cost: float = 0.0):
+        """
+        Применяет прирост исполнения ордера ccxt относительно ранее учтенного.
+        Returns:
+            bool: True если в ответе было достаточно данных для применения дельты.
+        """
+        if not order:
+            return False
+        filled = order.get('filled')
+        cost = order.get('cost')
+        if filled is None:
+            return False
+        filled = float(filled)
+        if cost is None:
+            average = order.get('average') or order.get('price')
+            if average is None:
+                return False
+            cost = filled * float(average)
+        cost = float(cost)
+        delta_filled = filled - previous_filled
+        delta_cost = cost - previous_cost
+        if delta_filled <= 0:
+            return True
+        # Комиссию учитываем только один раз, на финальном обновлении
+        fee = order.get('fee') if order.get('status') == 'closed' else None
+        self.apply_fill(base_asset, quote_asset, order.get('side', ''), delta_filled, delta_cost, fee)
+        return True
+
+    def get_free(self, asset: str, default: float = 0.0):
+        with self._lock:
+            return self.free.get(asset, default)
@@ -0,0 +1,250 @@
+# src/core/alerts.py
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+# Метрики, по которым можно поставить оповещение: значение берется из тикера потока цен
+ALERT_METRICS = ('price', 'change_pct', 'spread_pct')
+ALERT_DIRECTIONS = ('above', 'below')
+
+
+def _metric_value(ticker: dict, metric: str):
+    if metric == 'price':
+        return ticker.get('last_price')
+    if metric == 'change_pct':
+        return ticker.get('change_pct')
+    bid, ask = ticker.get('bid'), ticker.get('ask')
+    return (ask - bid) / ask * 100 if bid and ask else None
+
+
+class AlertEngine:
+    """
+    Оповещения о цене, изменении за 24ч и спреде (разовые: сработавшее правило выключается).
+
+    Активные правила разложены по символу и паре (метрика, направление) в
+    отсортированные списки порогов. Для "выше" срабатывают все пороги <= значения —
+    это префикс списка, для "ниже" все пороги >= значения — суффикс; граница
+    находится через bisect, поэтому тикер проверяется за O(log n) независимо от
+    числа правил, а символы без правил пропускаются одним поиском в dict.
+
+    Правила (и сработавшие — для истории) хранятся в JSON по пути path.
+    Потокобезопасен: проверка идет из потоков воркеров, изменение правил — из GUI.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # Запись файла целиком: сохранения из воркера и GUI не пересекаются
+        self.rules = {}  # id -> {'id', 'symbol', 'metric', 'direction', 'threshold', 'active', 'created_at', ...}
+        self._books = {}  # символ -> {(метрика, направление): ([пороги по возрастанию], [id правил])}
+
+    def __len__(self):
+        return len(self.rules)
+
+    # --- Индекс порогов ---
+    def _index_rule(self, rule: dict):
+        book = self._books.setdefault(rule['symbol'], {})
+        thresholds, rule_ids = book.setdefault((rule['metric'], rule['direction']), ([], []))
+        idx = bisect_right(thresholds, rule['threshold'])
+        thresholds.insert(idx, rule['threshold'])
+        rule_ids.insert(idx, rule['id'])
+
+    def _unindex_rule(self, rule: dict):
+        book = self._books.get(rule['symbol'], {})
+        key = (rule['metric'], rule['direction'])
+        if key not in book:
+            return
+        thresholds, rule_ids = book[key]
+        idx = bisect_left(thresholds, rule['threshold'])
+        while idx < len(thresholds) and thresholds[idx] == rule['threshold']:
+            if rule_ids[idx] == rule['id']:
+                del thresholds[idx]
+                del rule_ids[idx]
+                break
+            idx += 1
+        if not thresholds:
+            del book[key]
+        if not book:
+            self._books.pop(rule['symbol'], None)
+
+    # --- Правила ---
+    def add_rule(self, symbol: str, metric: str, direction: str, threshold: float):
+        """
+        Returns:
+            tuple: (dict копия правила или None, str ошибки или None)
+        """
+        symbol = (symbol or '').strip().upper()
+        if not symbol:
+            return None, "Не указана пара"
+        if metric not in ALERT_METRICS:
+            return None, f"Неизвестная метрика: {metric}"
+        if direction not in ALERT_DIRECTIONS:
+            return None, f"Неизвестное направление: {direction}"
+        try:
+            threshold = float(threshold)
+        except (TypeError, ValueError):
+            return None, "Порог должен быть числом"
+        if not math.isfinite(threshold):
+            return None, "Порог должен быть числом"
+        rule = {
+            'id': uuid.uuid4().hex, 'symbol': symbol, 'metric': metric, 'direction': direction,
+            'threshold': threshold, 'active': True, 'created_at': time.time(),
+            'triggered_at': None, 'triggered_value': None,
+        }
+        with self._lock:
+            self.rules[rule['id']] = rule
+            self._index_rule(rule)
+        error_msg = self.save()
+        return dict(rule), error_msg
+
+    def remove_rule(self, rule_id: str):
+        """Returns: tuple (bool удалено, str ошибки сохранения или None)."""
+        with self._lock:
+            rule = self.rules.pop(rule_id, None)
+            if rule is None:
+                return False, None
+            if rule['active']:
+                self._unindex_rule(rule)
+        return True, self.save()
+
+    def list_rules(self) -> list:
+        """Копии правил: сначала активные, затем по времени создания."""
+        with self._lock:
+            rules = [dict(rule) for rule in self.rules.values()]
+        rules.sort(key=lambda rule: (not rule['active'], rule['created_at']))
+        return rules
+
+    def active_symbols(self) -> list:
+        with self._lock:
+            return sorted(self._books)
+
+    # --- Проверка потока тикеров ---
+    def check_tickers(self, tickers: dict) -> list:
+        """
+        Проверяет тикеры ({символ: {'last_price', 'bid', 'ask', 'change_pct', ...}}).
+        Returns:
+            list: копии сработавших правил (с triggered_at и triggered_value)
+        """
+        fired = []
+        now = time.time()
+        with self._lock:
+            if not self._books:
+                return fired
+            # Обходим меньшую сторону: правил обычно на порядки меньше, чем тикеров в ответе
+            if len(self._books) < len(tickers):
+                symbols = [symbol for symbol in self._books if symbol in tickers]
+            else:
+                symbols = [symbol for symbol in tickers if symbol in self._books]
+            for symbol in symbols:
+                book = self._books[symbol]
+                ticker = tickers[symbol]
+                for key in list(book):
+                    metric, direction = key
+                    value = _metric_value(ticker, metric)
+                    if value is None:
+                        continue
+                    thresholds, rule_ids = book[key]
+                    if direction == 'above':
+                        count = bisect_right(thresholds, value)
+                        if not count:
+                            continue
+                        fired_ids = rule_ids[:count]
+                        del thresholds[:count]
+                        del rule_ids[:count]
+                    else:
+                        start = bisect_left(thresholds, value)
+                        if start == len(thresholds):
+                            continue
+                        fired_ids = rule_ids[start:]
+                        del thresholds[start:]
+                        del rule_ids[start:]
+                    for rule_id in fired_ids:
+                        rule = self.rules[rule_id]
+                        rule.update(active=False, triggered_at=now, triggered_value=value)
+                        fired.append(dict(rule))
+                    if not thresholds:
+                        del book[key]
+                if not book:
+                    del self._books[symbol]
+        if fired:
+            self.save()
+        return fired
+
+    # --- Хранение ---
+    def load(self):
+        """Returns: tuple (int загружено правил, str ошибки или None)."""
+        if not self.path or not os.path.exists(self.path):
+            return 0, None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            rules = {rule['id']: rule for rule in data.get('rules', [])}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return 0, f"Ошибка чтения оповещений: {e}"
+        with self._lock:
+            self.rules = rules
+            self._books = {}
+            for rule in rules.values():
+                if rule.get('active'):
+                    self._index_rule(rule)
+        return len(rules), None
+
+    def save(self):
+        """Атомарная запись (через временный файл). Returns: str ошибки или None."""
+        if not self.path:
+            return None
+        tmp_path = f"{self.path}.tmp"
+        with self._save_lock:
+            # Снимок берется под блокировкой записи: последним в файл попадает самое свежее состояние
+            with self._lock:
+                data = {'version': 1, 'rules': [dict(rule) for rule in self.rules.values()]}
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"AlertEngine: save failed: {e}")
+                return f"Ошибка сохранения оповещений: {e}"
+        return None
+
+
+class AlertMonitor(QObject):
+    """
+    Подписчик TickerCache: каждый ответ fetch_tickers (список монет, скринер,
+    опрос оповещений) проверяется AlertEngine в потоке воркера, сработавшие
+    правила уходят в GUI-поток сигналом alerts_triggered.
+    """
+    alerts_triggered = pyqtSignal(object)  # list сработавших правил
+
+    def __init__(self, engine: AlertEngine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+
+    def handle_tickers(self, tickers: dict):
+        fired = self.engine.check_tickers(tickers)
+        if fired:
+            self.alerts_triggered.emit(fired)
+
+
+class AlertTickersWorker(QThread):
+    """Опрос цен пар с активными оповещениями; проверка — через подписку AlertMonitor на TickerCache."""
+    fetch_finished = pyqtSignal(object)  # str ошибки или None
+
+    def __init__(self, mexc_service_instance, symbols: list, parent=None):
+        super().__init__(parent)
+        self.mexc_service = mexc_service_instance
+        self.symbols = symbols
+
+    def run(self):
+        try:
+            _, error_msg = self.mexc_service.fetch_tickers(symbols=self.symbols)
+            self.fetch_finished.emit(error_msg)
+        except Exception as e:
+            self.fetch_finished.emit(f"Ошибка получения цен: {e}")
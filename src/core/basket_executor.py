@@ -0,0 +1,156 @@
+# src/core/basket_executor.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .order_rules import validate_market_order
+
+
+class _RequestSpacer:
+    # Разносит старты запросов минимум на min_interval сек. (общий для всех потоков)
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def parse_basket_text(text: str):
+    """
+    Разбирает корзину из текста: по одной ноге на строку "SYMBOL SIDE AMOUNT",
+    например "BTC/USDT buy 0.001". Пустые строки и строки с '#' пропускаются.
+    Returns:
+        tuple: (list ног [{'symbol', 'side', 'amount'}], list ошибок разбора)
+    """
+    legs, errors = [], []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        parts = line.replace(',', ' ').split()
+        if len(parts) != 3:
+            errors.append(f"Строка {line_no}: ожидается 'SYMBOL SIDE AMOUNT'")
+            continue
+        symbol, side, amount_str = parts[0].upper(), parts[1].lower(), parts[2]
+        if side not in ('buy', 'sell'):
+            errors.append(f"Строка {line_no}: сторона должна быть buy или sell")
+            continue
+        try:
+            amount = float(amount_str)
+            if amount <= 0: raise ValueError
+        except ValueError:
+            errors.append(f"Строка {line_no}: некорректное количество '{amount_str}'")
+            continue
+        legs.append({'symbol': symbol, 'side': side, 'amount': amount})
+    return legs, errors
+
+
+class BasketOrderExecutor:
+    """
+    Исполнение корзины рыночных ордеров по нескольким парам.
+
+    Все ноги проверяются вместе (правила пар + суммарная потребность в каждом
+    активе против кэша балансов), затем отправляются параллельно пулом потоков.
+    Старты запросов разносятся по rateLimit биржи, поэтому общая задержка
+    близка к одному сетевому запросу, а не к N последовательным.
+    """
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    def __init__(self, mexc_service, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.mexc_service = mexc_service
+        self.max_concurrency = max_concurrency
+
+    def _request_interval(self):
+        rate_limit_ms = getattr(self.mexc_service.private_exchange, 'rateLimit', 50) or 50  # Ордера идут приватным каналом
+        return rate_limit_ms / 1000.0
+
+    def prepare(self, legs: list, prices: dict = None):
+        """
+        Проверяет и округляет все ноги. prices: {symbol: цена}; недостающие цены
+        запрашиваются одним вызовом fetch_tickers.
+        Returns:
+            tuple: (list подготовленных ног, list ошибок)
+        """
+        prices = dict(prices or {})
+        errors = []
+        rules = {}
+        for leg in legs:
+            rule = self.mexc_service.order_rules.get(leg['symbol'])
+            if rule is None:
+                errors.append(f"{leg['symbol']}: пара не найдена среди загруженных рынков")
+            rules[leg['symbol']] = rule
+        if errors:
+            return [], errors
+
+        missing = [leg['symbol'] for leg in legs if leg['symbol'] not in prices]
+        if missing:
+            tickers, error_msg = self.mexc_service.fetch_tickers(symbols=sorted(set(missing)))
+            if error_msg:
+                return [], [error_msg]
+            for symbol, ticker in (tickers or {}).items():
+                side_prices = [leg['side'] for leg in legs if leg['symbol'] == symbol]
+                # Для покупки ориентируемся на ask, для продажи — на bid
+                price = ticker.get('ask') if 'buy' in side_prices else ticker.get('bid')
+                prices[symbol] = price or ticker.get('last_price')
+
+        cache = self.mexc_service.balance_cache
+        prepared = []
+        needed = {}  # суммарная потребность корзины по активам
+        for leg in legs:
+            rule = rules[leg['symbol']]
+            check = validate_market_order(rule, leg['side'], leg['amount'], prices.get(leg['symbol']))
+            if not check['ok']:
+                errors.append(f"{leg['symbol']} {leg['side']}: {check['error']}")
+                continue
+            asset = rule.quote if leg['side'] == 'buy' else rule.base
+            needed[asset] = needed.get(asset, 0.0) + check['api_amount']
+            prepared.append(dict(leg, api_amount=check['api_amount'], base=rule.base, quote=rule.quote,
+                                 expected_cost=check['cost']))
+
+        if cache.is_loaded():
+            for asset, amount in needed.items():
+                free = cache.get_free(asset)
+                if amount > free:
+                    errors.append(f"Корзине нужно {amount:.8g} {asset}, доступно {free:.8g}")
+        return (prepared if not errors else []), errors
+
+    def _submit_leg(self, leg: dict, spacer: _RequestSpacer):
+        spacer.wait()
+        started = time.monotonic()
+        order, error_msg = self.mexc_service.create_market_order(
+            symbol=leg['symbol'], side=leg['side'], amount=leg['api_amount']
+        )
+        return dict(leg, order=order, error=error_msg, latency=time.monotonic() - started)
+
+    def execute(self, prepared_legs: list):
+        """
+        Отправляет подготовленные ноги параллельно.
+        Returns:
+            dict: legs (результат по каждой ноге), ok_count, error_count, elapsed, events (события OrderTracker)
+        """
+        started = time.monotonic()
+        spacer = _RequestSpacer(self._request_interval())
+        workers = max(1, min(self.max_concurrency, len(prepared_legs)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="basket") as pool:
+            results = list(pool.map(lambda leg: self._submit_leg(leg, spacer), prepared_legs))
+
+        events = []
+        for result in results:
+            order = result.get('order')
+            if order and not result.get('error'):
+                if not order.get('symbol'): order['symbol'] = result['symbol']
+                if not order.get('side'): order['side'] = result['side']
+                events.extend(self.mexc_service.order_tracker.track(order, result['base'], result['quote']))
+        ok_count = sum(1 for r in results if r.get('order') and not r.get('error'))
+        return {
+            'legs': results, 'ok_count': ok_count, 'error_count': len(results) - ok_count,
+            'elapsed': time.monotonic() - started, 'events': events,
+        }
@@ -0,0 +1,102 @@
+# src/core/candle_archive.py
+import os
+import sqlite3
+import threading
+import time
+
+
+class CandleArchive:
+    """
+    Локальный архив OHLCV свечей на SQLite.
+
+    Хранит свечи по (symbol, timeframe, timestamp) и состояние фоновой догрузки
+    истории (самая старая загруженная свеча, признак завершения), чтобы догрузку
+    можно было продолжить после перезапуска приложения.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir, exist_ok=True)
+        # Соединение используется из фонового потока и из GUI, поэтому доступ через lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS candles (
+                    symbol TEXT NOT NULL, timeframe TEXT NOT NULL, ts INTEGER NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL,
+                    PRIMARY KEY (symbol, timeframe, ts)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS backfill_state (
+                    symbol TEXT NOT NULL, timeframe TEXT NOT NULL,
+                    oldest_ts INTEGER, candles_count INTEGER NOT NULL DEFAULT 0,
+                    complete INTEGER NOT NULL DEFAULT 0, updated_at INTEGER,
+                    PRIMARY KEY (symbol, timeframe)
+                )
+            """)
+            self._conn.commit()
+
+    def store_candles(self, symbol: str, timeframe: str, ohlcv_data: list):
+        # Возвращает количество новых (ранее отсутствовавших) свечей
+        if not ohlcv_data:
+            return 0
+        rows = [(symbol, timeframe, int(c[0]), c[1], c[2], c[3], c[4], c[5]) for c in ohlcv_data]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO candles (symbol, timeframe, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def load_candles(self, symbol: str, timeframe: str, since: int = None, limit: int = None):
+        # Свечи от старых к новым в формате ccxt: [timestamp, open, high, low, close, volume]
+        query = "SELECT ts, open, high, low, close, volume FROM candles WHERE symbol = ? AND timeframe = ?"
+        params = [symbol, timeframe]
+        if since is not None:
+            query += " AND ts >= ?"
+            params.append(int(since))
+        if limit is not None:
+            # Берем последние limit свечей, затем разворачиваем в хронологический порядок
+            query += " ORDER BY ts DESC LIMIT ?"
+            params.append(int(limit))
+        else:
+            query += " ORDER BY ts ASC"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        if limit is not None:
+            rows.reverse()
+        return [list(row) for row in rows]
+
+    def get_backfill_state(self, symbol: str, timeframe: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT oldest_ts, candles_count, complete FROM backfill_state WHERE symbol = ? AND timeframe = ?",
+                (symbol, timeframe)
+            ).fetchone()
+        if not row:
+            return {'oldest_ts': None, 'candles_count': 0, 'complete': False}
+        return {'oldest_ts': row[0], 'candles_count': row[1], 'complete': bool(row[2])}
+
+    def save_backfill_state(self, symbol: str, timeframe: str, oldest_ts, candles_count: int, complete: bool):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO backfill_state (symbol, timeframe, oldest_ts, candles_count, complete, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (symbol, timeframe, oldest_ts, int(candles_count), 1 if complete else 0, int(time.time() * 1000))
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
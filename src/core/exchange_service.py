@@ -0,0 +1,413 @@
+# src/core/exchange_service.py
+import os
+import time
+import math
+import threading
+
+from .account_state import BalanceCache
+from .order_rules import OrderRulesTable, parse_precision, TICK_SIZE
+from .order_tracker import OrderTracker
+from .ticker_cache import TickerCache
+from .metrics import ServiceMetrics, instrumented
+
+
+class ExchangeService:
+    """
+    Рыночные данные и торговля на одной площадке через ccxt.
+
+    Площадка задается EXCHANGE_ID подкласса (MexcService) или параметром
+    exchange_id; EXCHANGE_OPTIONS дополняют options экземпляра ccxt.
+    Все методы возвращают (данные, str ошибки или None).
+    """
+    EXCHANGE_ID = None
+    EXCHANGE_OPTIONS = {}
+    FETCH_ALL_TICKERS = False  # Площадка на запрос нескольких символов отдает тикеры всех пар
+    MARKETS_CHUNK_SIZE = 200  # Рынков в одной порции для on_chunk
+    MARKETS_MAX_AGE_SEC = 15 * 60  # Старше — load_markets_data перезапрашивает рынки у биржи
+
+    def __init__(self, api_key=None, api_secret=None, passphrase=None, exchange_factory=None,
+                 exchange_id: str = None, exchange_options: dict = None):
+        self.exchange_id = exchange_id or self.EXCHANGE_ID
+        self.exchange_options = dict(self.EXCHANGE_OPTIONS, **(exchange_options or {}))
+        # exchange_factory(config) позволяет подставить замену ccxt (например, FakeExchange для бенчмарков).
+        # Без него класс биржи берется из ccxt при первом обращении к self.exchange
+        self.exchange_class = exchange_factory
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.passphrase = passphrase
+        # Два канала к бирже: публичный (рынки, тикеры, свечи, стакан) и приватный (баланс, ордера).
+        # У каждого свой экземпляр ccxt — свой пул соединений и свой rate limit, поэтому
+        # нагрузка от рыночных данных не задерживает ордера
+        self._exchange = None
+        self._private_exchange = None
+        self._exchange_lock = threading.Lock()
+        self.balance_cache = BalanceCache()  # Кэш балансов аккаунта (пополняется fetch_balances и дельтами)
+        self.order_rules = OrderRulesTable()  # Правила ордеров по парам (шаги, лимиты) для локальной валидации
+        self.order_tracker = OrderTracker(self.balance_cache)  # Открытые/недавние ордера
+        self.ticker_cache = TickerCache()  # Последние тикеры всех пар (пополняется fetch_tickers)
+        self.metrics = ServiceMetrics()  # Задержки, ошибки, rate limit и объем ответов по методам
+        self._markets_cache = {}  # symbol -> (сигнатура сырого рынка, разобранный рынок)
+        self._markets_loaded_at = 0
+        self.last_markets_diff = {'changed': [], 'removed': []}  # Что изменилось при последней загрузке
+
+    @property
+    def exchange(self):
+        # Публичный канал. Экземпляр ccxt создается при первом обращении: импорт ccxt — самая долгая часть
+        # холодного старта, поэтому окно показывается без него, а биржу заранее создает warm_up() в фоне
+        if self._exchange is None:
+            with self._exchange_lock:
+                if self._exchange is None:
+                    self._exchange = self._create_exchange(with_credentials=False)
+        return self._exchange
+
+    @property
+    def private_exchange(self):
+        # Приватный канал (с ключами); создается так же лениво
+        if self._private_exchange is None:
+            with self._exchange_lock:
+                if self._private_exchange is None:
+                    self._private_exchange = self._create_exchange(with_credentials=True)
+        return self._private_exchange
+
+    def warm_up(self):
+        """Создает экземпляры обоих каналов (с импортом ccxt). Returns: bool, готова ли биржа."""
+        return self.exchange is not None and self.private_exchange is not None
+
+    def _private_channel(self):
+        """Приватный экземпляр с рынками публичного канала (без повторной загрузки) или None."""
+        exchange = self.private_exchange
+        if exchange is not None and not exchange.markets:
+            public_exchange = self.exchange
+            if public_exchange is not None and public_exchange.markets:
+                exchange.set_markets(list(public_exchange.markets.values()), public_exchange.currencies)
+        return exchange
+
+    def _parse_precision_value(self, precision_input):
+        # Преобразует значение точности от ccxt в количество знаков после запятой (с учетом precisionMode).
+        return parse_precision(precision_input, self._precision_mode())[0]
+
+    def _precision_mode(self):
+        return getattr(self.exchange, 'precisionMode', TICK_SIZE)
+
+    def _create_exchange(self, with_credentials: bool):
+        try:
+            if self.exchange_class is None:
+                import ccxt
+                self.exchange_class = getattr(ccxt, self.exchange_id)
+            config = {'enableRateLimit': True, 'options': {'defaultType': 'spot', **self.exchange_options}}
+            if with_credentials and self.api_key and self.api_secret:
+                config['apiKey'] = self.api_key
+                config['secret'] = self.api_secret
+                if self.passphrase: config['password'] = self.passphrase
+            exchange = self.exchange_class(config)
+            self.metrics.attach_exchange(exchange)
+            return exchange
+        except Exception as e:
+            # Без исключения наружу: методы сервиса вернут "Биржа не инициализирована", следующий вызов повторит попытку
+            print(f"ExchangeService[{self.exchange_id}]: Error initializing exchange: {e}")
+            return None
+
+    def set_api_credentials(self, api_key: str, api_secret: str, passphrase: str = None):
+        self.api_key = api_key;
+        self.api_secret = api_secret;
+        self.passphrase = passphrase
+        self.balance_cache.clear()
+        self.order_tracker.clear()
+        with self._exchange_lock:
+            # Ключи меняем на живом экземпляре приватного канала: пересоздание биржи выбросило бы загруженные рынки,
+            # и следующий вызов заново скачал бы и разобрал их все. Если канала еще нет, ключи возьмет _create_exchange
+            if self._private_exchange is not None:
+                self._apply_credentials(self._private_exchange)
+        print(f"ExchangeService[{self.exchange_id}]: API credentials updated. API Key: {'Set' if self.api_key else 'Not Set'}")
+
+    def _apply_credentials(self, exchange):
+        has_keys = bool(self.api_key and self.api_secret)
+        exchange.apiKey = self.api_key if has_keys else ''
+        exchange.secret = self.api_secret if has_keys else ''
+        exchange.password = self.passphrase if has_keys and self.passphrase else ''
+
+    def _fetch_spot_markets(self):
+        # Только спот: fetch_markets у ccxt mexc всегда тянет еще и фьючерсы, поэтому зовем fetch_spot_markets.
+        # У площадок без него типы рынков ограничивает options['fetchMarkets'] (см. venues.VENUE_OPTIONS)
+        fetch_spot_markets = getattr(self.exchange, 'fetch_spot_markets', None)
+        if fetch_spot_markets is None:
+            raw_markets = [m for m in self.exchange.load_markets(True).values() if m.get('spot')]
+        else:
+            raw_markets = fetch_spot_markets()
+            self.exchange.set_markets(raw_markets)
+        if self._private_exchange is not None:
+            # Приватный канал получает обновленные рынки без собственного запроса
+            self._private_exchange.set_markets(raw_markets, self.exchange.currencies)
+        return raw_markets
+
+    @staticmethod
+    def _parse_market(market_data: dict, precision_mode):
+        precision = market_data.get('precision') or {}
+        price_prec_raw = precision.get('price')
+        amount_prec_raw = precision.get('amount')
+        cost_prec_raw = precision.get('cost')
+
+        parsed_price_prec, price_tick = parse_precision(price_prec_raw, precision_mode)
+        parsed_amount_prec, amount_tick = parse_precision(amount_prec_raw, precision_mode)
+        if cost_prec_raw is not None:
+            parsed_cost_prec, cost_tick = parse_precision(cost_prec_raw, precision_mode)
+        else:
+            parsed_cost_prec, cost_tick = 2, None
+
+        return {
+            'symbol': market_data['symbol'], 'base': market_data['base'],
+            'quote': market_data['quote'], 'id': market_data['id'],
+            'precision': {
+                'price': parsed_price_prec, 'amount': parsed_amount_prec, 'cost': parsed_cost_prec,
+                'raw_price': price_prec_raw, 'raw_amount': amount_prec_raw, 'raw_cost': cost_prec_raw,
+                # Точные шаги для округления (Decimal; None — шаг не задан биржей)
+                'price_tick': price_tick, 'amount_tick': amount_tick, 'cost_tick': cost_tick
+            },
+            'limits': market_data.get('limits', {}),
+        }
+
+    @instrumented()
+    def load_markets_data(self, reload: bool = False, on_chunk=None, chunk_size: int = None):
+        """
+        Активные USDT-пары спота, отсортированные по символу.
+
+        Рынки запрашиваются заново, если их еще нет, они старше MARKETS_MAX_AGE_SEC или reload=True.
+        Разбираются только новые и изменившиеся рынки, остальные берутся из кэша (те же объекты dict).
+        on_chunk(list) вызывается по ходу разбора порциями по chunk_size, чтобы UI показал первые пары сразу.
+
+        Returns:
+            tuple: (list рынков, str ошибки или None)
+        """
+        if not self.exchange: return None, "Биржа не инициализирована"
+        try:
+            stale = self._markets_loaded_at and time.time() - self._markets_loaded_at > self.MARKETS_MAX_AGE_SEC
+            if reload or stale or not self.exchange.markets:
+                raw_markets = self._fetch_spot_markets()
+                self._markets_loaded_at = time.time()
+            else:
+                raw_markets = list(self.exchange.markets.values())
+
+            precision_mode = self._precision_mode()
+            chunk_size = chunk_size or self.MARKETS_CHUNK_SIZE
+            previous_cache, markets_cache = self._markets_cache, {}
+            filtered_markets, changed_markets, chunk = [], [], []
+            for market_data in sorted(raw_markets, key=lambda m: m.get('symbol') or ''):
+                if not (market_data.get('active', False) and
+                        market_data.get('spot', False) and
+                        market_data.get('quote', '').upper() == 'USDT'):
+                    continue
+                symbol = market_data['symbol']
+                signature = (market_data.get('id'), market_data.get('base'),
+                             market_data.get('precision'), market_data.get('limits'))
+                cached = previous_cache.get(symbol)
+                if cached is not None and cached[0] == signature:
+                    parsed_market = cached[1]
+                else:
+                    parsed_market = self._parse_market(market_data, precision_mode)
+                    changed_markets.append(parsed_market)
+                markets_cache[symbol] = (signature, parsed_market)
+                filtered_markets.append(parsed_market)
+                if on_chunk is not None:
+                    chunk.append(parsed_market)
+                    if len(chunk) >= chunk_size:
+                        on_chunk(chunk)
+                        chunk = []
+            if on_chunk is not None and chunk:
+                on_chunk(chunk)
+
+            removed_symbols = [symbol for symbol in previous_cache if symbol not in markets_cache]
+            self._markets_cache = markets_cache
+            self.order_rules.update_from_markets(changed_markets)
+            self.order_rules.remove(removed_symbols)
+            self.last_markets_diff = {'changed': [m['symbol'] for m in changed_markets], 'removed': removed_symbols}
+            return filtered_markets, None
+        except Exception as e:
+            return None, f"Ошибка загрузки рынков: {e}"
+
+    @instrumented()
+    def fetch_tickers(self, symbols: list = None):
+        if not self.exchange: return None, "Биржа не инициализирована"
+        if not hasattr(self.exchange, 'fetch_tickers'): return None, "fetch_tickers не поддерживается"
+        try:
+            if symbols and not isinstance(symbols, list): symbols = [symbols]
+            if self.FETCH_ALL_TICKERS:
+                # На несколько символов площадка все равно отдает (и ccxt разбирает) тикеры всех пар,
+                # поэтому запрашиваем все и сохраняем в ticker_cache — другие строки списка возьмут цены оттуда
+                request_symbols = symbols if symbols and len(symbols) == 1 else None
+            elif symbols:
+                # Пары, которых нет на площадке, ccxt отвергает целым запросом (BadSymbol)
+                markets = self.exchange.markets or self.exchange.load_markets()
+                request_symbols = [symbol for symbol in symbols if symbol in markets]
+                if not request_symbols: return {}, None
+            else:
+                request_symbols = None
+            tickers_data = self.exchange.fetch_tickers(symbols=request_symbols)
+            simplified_tickers = {}
+            if tickers_data:
+                for symbol, data in tickers_data.items():
+                    if data and 'last' in data and data['last'] is not None:
+                        simplified_tickers[symbol] = {
+                            'symbol': symbol, 'last_price': data['last'], 'timestamp': data.get('timestamp'),
+                            'bid': data.get('bid'), 'ask': data.get('ask'), 'volume': data.get('quoteVolume'),
+                            'change_pct': data.get('percentage')
+                        }
+            self.ticker_cache.update(simplified_tickers)
+            if symbols:
+                simplified_tickers = {s: simplified_tickers[s] for s in symbols if s in simplified_tickers}
+            return simplified_tickers, None
+        except Exception as e:
+            return None, f"Ошибка получения цен: {e}"
+
+    @instrumented()
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '5m', since: int = None, limit: int = 100):
+        if not self.exchange: return None, "Биржа не инициализирована"
+        if not self.exchange.has['fetchOHLCV']: return None, "fetchOHLCV не поддерживается"
+        try:
+            ohlcv_data = self.exchange.fetch_ohlcv(symbol, timeframe, since, limit)
+            return ohlcv_data, None
+        except Exception as e:
+            return None, f"Ошибка OHLCV ({symbol}): {e}"
+
+    @instrumented()
+    def fetch_order_book(self, symbol: str, limit: int = 50):
+        if not self.exchange: return None, "Биржа не инициализирована"
+        if not self.exchange.has.get('fetchOrderBook'): return None, "fetchOrderBook не поддерживается"
+        try:
+            order_book = self.exchange.fetch_order_book(symbol, limit)
+            return {
+                'symbol': symbol, 'bids': order_book.get('bids', []), 'asks': order_book.get('asks', []),
+                'nonce': order_book.get('nonce'), 'timestamp': order_book.get('timestamp')
+            }, None
+        except Exception as e:
+            return None, f"Ошибка стакана ({symbol}): {e}"
+
+    @instrumented()
+    def fetch_trades(self, symbol: str, since: int = None, limit: int = 100):
+        # Возвращает компактные записи (id, timestamp, price, amount, is_buy) от старых к новым
+        if not self.exchange: return None, "Биржа не инициализирована"
+        if not self.exchange.has.get('fetchTrades'): return None, "fetchTrades не поддерживается"
+        try:
+            raw_trades = self.exchange.fetch_trades(symbol, since, limit)
+            trades = []
+            for t in raw_trades or []:
+                if t.get('timestamp') is None or t.get('price') is None or t.get('amount') is None:
+                    continue
+                trades.append((t.get('id'), t['timestamp'], float(t['price']), float(t['amount']),
+                               t.get('side') == 'buy'))
+            trades.sort(key=lambda x: x[1])
+            return trades, None
+        except Exception as e:
+            return None, f"Ошибка ленты сделок ({symbol}): {e}"
+
+    @instrumented()
+    def fetch_balances(self):
+        exchange = self._private_channel()
+        if not exchange: return None, "Биржа не инициализирована"
+        if not self.api_key or not self.api_secret: return None, "API ключи не установлены"
+        try:
+            raw_balance_data = exchange.fetch_balance()
+            self.balance_cache.apply_snapshot(raw_balance_data)
+            return raw_balance_data, None
+        except Exception as e:
+            return None, f"Ошибка получения балансов: {e}"
+
+    @instrumented()
+    def fetch_orders_for_symbols(self, symbols_since: dict):
+        """
+        Общий опрос ордеров: один запрос fetch_orders на символ (открытые и недавно закрытые вместе),
+        независимо от количества отслеживаемых ордеров по нему.
+        symbols_since: {symbol: timestamp самого раннего отслеживаемого ордера}
+        Returns:
+            tuple: (list ордеров ccxt, str ошибок или None)
+        """
+        exchange = self._private_channel()
+        if not exchange: return None, "Биржа не инициализирована"
+        if not self.api_key or not self.api_secret: return None, "API ключи не установлены"
+        all_orders, errors = [], []
+        for symbol, since in symbols_since.items():
+            try:
+                all_orders.extend(exchange.fetch_orders(symbol, since))
+            except Exception as e:
+                errors.append(f"{symbol}: {e}")
+        return all_orders, ("Ошибка опроса ордеров: " + "; ".join(errors)) if errors else None
+
+    @instrumented()
+    def create_market_order(self, symbol: str, side: str, amount: float):
+        exchange = self._private_channel()
+        if not exchange: return None, "Биржа не инициализирована"
+        if not self.api_key or not self.api_secret: return None, "API ключи не установлены"
+        import ccxt  # Классы исключений; сам модуль уже загружен вместе с биржей
+
+        actual_side = side.lower()
+        order_response = None
+
+        try:
+            if actual_side == 'buy':
+                if not exchange.has.get('createMarketBuyOrder'):
+                    # Если ccxt не заявляет поддержку createMarketBuyOrder, это проблема для MEXC,
+                    # так как покупка по рынку на сумму QUOTE - стандартная операция.
+                    # Это может быть индикатором очень старой версии ccxt или неполной поддержки MEXC в ней.
+                    # В этом случае, использование create_order потребует точного знания params для cost.
+                    print(
+                        f"ExchangeService[{self.exchange_id}]: Предупреждение! ccxt не заявляет поддержку 'createMarketBuyOrder' для {self.exchange_id}. Ордер может не сработать как ожидается.")
+                    # Тем не менее, попробуем стандартный вызов, возможно, он все же есть, но флаг has не выставлен.
+                order_response = exchange.create_market_buy_order(symbol, amount)  # amount здесь - cost
+
+            elif actual_side == 'sell':
+                if not exchange.has.get('createMarketSellOrder'):
+                    print(
+                        f"ExchangeService[{self.exchange_id}]: Предупреждение! ccxt не заявляет поддержку 'createMarketSellOrder' для {self.exchange_id}.")
+                order_response = exchange.create_market_sell_order(symbol, amount)  # amount здесь - кол-во BASE
+            else:
+                return None, "Неверная сторона ордера (должно быть 'buy' или 'sell')."
+
+            return order_response, None
+
+        except ccxt.InsufficientFunds as e:
+            return None, f"Недостаточно средств: {e}"
+        except ccxt.InvalidOrder as e:
+            return None, f"Некорректный ордер: {e}"
+        except ccxt.NetworkError as e:
+            return None, f"Ошибка сети: {e}"
+        except ccxt.ExchangeError as e:
+            return None, f"Ошибка биржи: {e}"
+        except Exception as e:
+            return None, f"Непредвиденная ошибка ордера: {e}"
+
+    @instrumented()
+    def create_limit_order(self, symbol: str, side: str, amount: float, price: float):
+        exchange = self._private_channel()
+        if not exchange: return None, "Биржа не инициализирована"
+        if not self.api_key or not self.api_secret: return None, "API ключи не установлены"
+        import ccxt  # Классы исключений; сам модуль уже загружен вместе с биржей
+        actual_side = side.lower()
+        if actual_side not in ('buy', 'sell'):
+            return None, "Неверная сторона ордера (должно быть 'buy' или 'sell')."
+        try:
+            order_response = exchange.create_limit_order(symbol, actual_side, amount, price)
+            return order_response, None
+        except ccxt.InsufficientFunds as e:
+            return None, f"Недостаточно средств: {e}"
+        except ccxt.InvalidOrder as e:
+            return None, f"Некорректный ордер: {e}"
+        except ccxt.NetworkError as e:
+            return None, f"Ошибка сети: {e}"
+        except ccxt.ExchangeError as e:
+            return None, f"Ошибка биржи: {e}"
+        except Exception as e:
+            return None, f"Непредвиденная ошибка ордера: {e}"
+
+    @instrumented()
+    def cancel_order(self, order_id: str, symbol: str):
+        exchange = self._private_channel()
+        if not exchange: return None, "Биржа не инициализирована"
+        if not self.api_key or not self.api_secret: return None, "API ключи не установлены"
+        import ccxt  # Классы исключений; сам модуль уже загружен вместе с биржей
+        try:
+            return exchange.cancel_order(order_id, symbol), None
+        except ccxt.OrderNotFound as e:
+            return None, f"Ордер не найден: {e}"
+        except ccxt.NetworkError as e:
+            return None, f"Ошибка сети: {e}"
+        except Exception as e:
+            return None, f"Ошибка отмены ордера: {e}"
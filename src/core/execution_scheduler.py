@@ -0,0 +1,373 @@
+# src/core/execution_scheduler.py
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .order_book import L2OrderBook
+from .order_rules import validate_market_order, validate_limit_order
+
+TASK_ACTIVE = 'active'
+TASK_DONE = 'done'
+TASK_FAILED = 'failed'
+TASK_CANCELED = 'canceled'
+
+_task_ids = itertools.count(1)
+
+
+class ExecutionTask(ABC):
+    """Базовая задача локального исполнения (стоп-лимит, TWAP, айсберг)."""
+    kind = 'task'
+
+    def __init__(self, symbol: str, side: str, amount: float):
+        self.task_id = next(_task_ids)
+        self.symbol = symbol
+        self.side = side.lower()
+        self.amount = float(amount)
+        self.status = TASK_ACTIVE
+        self.message = ""
+        self.submitted = 0.0  # Отправлено в дочерних ордерах (BASE)
+        self.filled = 0.0  # Исполнено по данным OrderTracker (BASE)
+        self.child_order_ids = []
+        self.created_at = time.time()
+
+    def is_active(self):
+        return self.status == TASK_ACTIVE
+
+    def remaining(self):
+        # Округление гасит накопленную ошибку суммирования float-частей
+        return max(round(self.amount - self.submitted, 12), 0.0)
+
+    def finish_dust(self):
+        self.status = TASK_DONE
+        self.message = f"Отправлено {self.submitted:.8g}, остаток меньше минимального лота"
+
+    @abstractmethod
+    def step(self, scheduler, now: float, book: L2OrderBook):
+        """Один проход планировщика по задаче: решение по стакану book и отправка дочерних ордеров."""
+
+    def progress(self):
+        return {
+            'task_id': self.task_id, 'kind': self.kind, 'symbol': self.symbol, 'side': self.side,
+            'amount': self.amount, 'submitted': self.submitted, 'filled': self.filled,
+            'status': self.status, 'message': self.message, 'children': len(self.child_order_ids),
+        }
+
+
+class StopLimitTask(ExecutionTask):
+    """
+    Стоп-лимит на стороне клиента: спотовое API MEXC не принимает стоп-ордера,
+    поэтому лимитный ордер выставляется, когда цена в стакане пересекает stop_price.
+    """
+    kind = 'stop_limit'
+
+    def __init__(self, symbol: str, side: str, amount: float, stop_price: float, limit_price: float):
+        super().__init__(symbol, side, amount)
+        self.stop_price = float(stop_price)
+        self.limit_price = float(limit_price)
+        self.message = f"Ожидание стоп-цены {self.stop_price}"
+
+    def step(self, scheduler, now, book):
+        if self.side == 'buy':
+            price = book.best_ask()
+            triggered = price is not None and price >= self.stop_price
+        else:
+            price = book.best_bid()
+            triggered = price is not None and price <= self.stop_price
+        if not triggered:
+            return
+        order_id, error_msg = scheduler.submit_limit(self, self.amount, self.limit_price)
+        if error_msg:
+            self.status, self.message = TASK_FAILED, error_msg
+        else:
+            self.submitted = self.amount
+            self.status, self.message = TASK_DONE, f"Стоп сработал по {price}, лимитный ордер ID:{order_id}"
+
+
+class SlicedOrderTask(ExecutionTask):
+    """
+    TWAP / айсберг: крупный ордер режется на дочерние по таймеру.
+
+    TWAP отправляет рыночные части раз в duration/num_slices секунд; размер
+    части ограничивается долей видимой глубины стакана рядом с лучшей ценой,
+    недоотправленный остаток переносится на следующие интервалы.
+    Айсберг держит на рынке одну лимитную часть по лучшей цене и выставляет
+    следующую, когда предыдущая исполнилась (или переставляет устаревшую).
+    Устаревшая часть переставляется только после успешной отмены и после того,
+    как общий опрос ордеров сообщил ее финальное исполнение: до этого неизвестно,
+    сколько из нее успело исполниться.
+    """
+    MAX_DEPTH_FRACTION = 0.25  # Доля видимой глубины, которую может забрать одна часть
+    DEPTH_PRICE_RANGE_PCT = 0.5  # Учитываемая глубина: уровни в пределах 0.5% от лучшей цены
+
+    def __init__(self, symbol: str, side: str, amount: float, duration_sec: float, num_slices: int,
+                 mode: str = 'twap'):
+        super().__init__(symbol, side, amount)
+        self.kind = mode
+        self.num_slices = max(1, int(num_slices))
+        self.duration_sec = max(1.0, float(duration_sec))
+        self.interval = self.duration_sec / self.num_slices
+        self.next_slice_at = self.created_at
+        self.slices_sent = 0
+        self.active_child_id = None
+        self.active_child_placed_at = None
+        self.cancel_requested = False  # Отмена активной части принята биржей, ждем финальный статус из опроса
+        self.message = f"0/{self.num_slices} частей"
+
+    def _visible_depth(self, book: L2OrderBook):
+        # Объем на противоположной стороне в пределах DEPTH_PRICE_RANGE_PCT от лучшей цены
+        bids, asks = book.top(50)
+        levels = asks if self.side == 'buy' else bids
+        if not levels:
+            return None
+        best = levels[0][0]
+        limit = best * self.DEPTH_PRICE_RANGE_PCT / 100
+        return sum(amount for price, amount in levels if abs(price - best) <= limit)
+
+    def _next_slice_amount(self, book: L2OrderBook):
+        remaining = self.remaining()
+        slices_left = max(1, self.num_slices - self.slices_sent)
+        target = round(remaining / slices_left, 12)
+        depth = self._visible_depth(book)
+        if depth:
+            target = min(target, depth * self.MAX_DEPTH_FRACTION)
+        return min(max(target, 0.0), remaining)
+
+    def step(self, scheduler, now, book):
+        if self.kind == 'iceberg':
+            self._step_iceberg(scheduler, now, book)
+        else:
+            self._step_twap(scheduler, now, book)
+        if self.status == TASK_ACTIVE:
+            self.message = f"{self.slices_sent} частей, отправлено {self.submitted:.8g}/{self.amount:.8g}"
+
+    def _step_twap(self, scheduler, now, book):
+        if now < self.next_slice_at:
+            return
+        slice_amount = scheduler.adjust_slice(self, self._next_slice_amount(book))
+        self.next_slice_at = now + self.interval
+        if slice_amount <= 0:
+            self.finish_dust()
+            return
+        order_id, error_msg = scheduler.submit_market(self, slice_amount, book)
+        if error_msg:
+            self.status, self.message = TASK_FAILED, error_msg
+            return
+        self.submitted += slice_amount
+        self.slices_sent += 1
+        if self.remaining() <= 0:
+            self.status = TASK_DONE
+            self.message = f"Отправлено {self.slices_sent} частей"
+
+    def _step_iceberg(self, scheduler, now, book):
+        if self.active_child_id is not None:
+            child = scheduler.get_tracked_order(self.active_child_id)
+            if child and child['status'] == 'open':
+                if self.cancel_requested:
+                    return  # Ждем, пока опрос сообщит финальное исполнение отмененной части
+                # Переставляем часть, если она висит дольше интервала и цена ушла
+                best = book.best_bid() if self.side == 'buy' else book.best_ask()
+                stale = now - self.active_child_placed_at > self.interval
+                if stale and best is not None and child.get('price') and best != float(child['price']):
+                    if scheduler.cancel_child(self, self.active_child_id):
+                        self.cancel_requested = True
+                    else:
+                        # Отмена не прошла (часть могла уже исполниться) — повтор не раньше следующего интервала
+                        self.active_child_placed_at = now
+                return
+            if child and child['status'] != 'closed':
+                # Отмененная часть: неисполненный по финальным данным остаток возвращаем в задачу
+                self.submitted -= max(float(child.get('amount') or 0.0) - child['filled'], 0.0)
+            self.active_child_id = None
+            self.cancel_requested = False
+            if self.remaining() <= 0:
+                self.status = TASK_DONE
+                self.message = f"Исполнено {self.slices_sent} частей"
+                return
+
+        best = book.best_bid() if self.side == 'buy' else book.best_ask()
+        if best is None:
+            return
+        slice_amount = scheduler.adjust_slice(self, min(round(self.amount / self.num_slices, 12), self.remaining()))
+        if slice_amount <= 0:
+            self.finish_dust()
+            return
+        order_id, error_msg = scheduler.submit_limit(self, slice_amount, best)
+        if error_msg:
+            self.status, self.message = TASK_FAILED, error_msg
+            return
+        self.submitted += slice_amount
+        self.slices_sent += 1
+        self.active_child_id = order_id
+        self.active_child_placed_at = now
+
+
+class ExecutionScheduler:
+    """
+    Планировщик локального исполнения: держит активные задачи, раз в тик
+    обновляет стаканы по их символам (один запрос на символ) и даёт задачам
+    отправить дочерние ордера. Дочерние ордера регистрируются в OrderTracker,
+    поэтому их исполнение приходит через общий опрос ордеров.
+    """
+
+    def __init__(self, mexc_service):
+        self.mexc_service = mexc_service
+        self._lock = threading.Lock()
+        self.tasks = {}
+        self.books = {}
+        self._events = []
+
+    def add_task(self, task: ExecutionTask):
+        with self._lock:
+            self.tasks[task.task_id] = task
+        return task.task_id
+
+    def cancel_task(self, task_id: int):
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task and task.is_active():
+                task.status, task.message = TASK_CANCELED, "Отменено пользователем"
+
+    def has_active_tasks(self):
+        with self._lock:
+            return any(t.is_active() for t in self.tasks.values())
+
+    def step(self, now: float = None):
+        """Один тик планировщика. Returns: (list прогресса задач, list событий OrderTracker)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            active = [t for t in self.tasks.values() if t.is_active()]
+        events = []
+        self._events = events
+        for symbol in {t.symbol for t in active}:
+            order_book, error_msg = self.mexc_service.fetch_order_book(symbol, 50)
+            book = self.books.setdefault(symbol, L2OrderBook(symbol))
+            if error_msg or not order_book:
+                book.needs_resync = True
+                continue
+            book.apply_snapshot(order_book['bids'], order_book['asks'], order_book.get('nonce'))
+        for task in active:
+            book = self.books.get(task.symbol)
+            if book is None or not book.is_fresh():
+                continue
+            try:
+                task.step(self, now, book)
+            except Exception as e:
+                task.status, task.message = TASK_FAILED, f"Ошибка задачи: {e}"
+            self._refresh_filled(task)
+        with self._lock:
+            progress = [t.progress() for t in self.tasks.values()]
+            # Завершенные задачи убираем после того, как их финальный прогресс отдан в UI
+            for task_id in [i for i, t in self.tasks.items() if not t.is_active()]:
+                del self.tasks[task_id]
+        return progress, events
+
+    def _refresh_filled(self, task: ExecutionTask):
+        filled = 0.0
+        for order_id in task.child_order_ids:
+            order = self.get_tracked_order(order_id)
+            if order:
+                filled += order['filled']
+        task.filled = filled
+
+    def get_tracked_order(self, order_id):
+        return self.mexc_service.order_tracker.get_order(order_id)
+
+    def adjust_slice(self, task: ExecutionTask, slice_amount: float):
+        # Округление части до шага; если часть меньше минимума пары, берем минимум (но не больше остатка)
+        rule = self.mexc_service.order_rules.get(task.symbol)
+        remaining = task.remaining()
+        if rule is None:
+            return slice_amount
+        amount = float(rule.round_amount(slice_amount))
+        if rule.min_amount is not None and amount < float(rule.min_amount):
+            amount = min(float(rule.min_amount), remaining)
+        book = self.books.get(task.symbol)
+        price = book.best_ask() if book and task.side == 'buy' else (book.best_bid() if book else None)
+        if rule.min_cost is not None and price:
+            min_amount_by_cost = float(rule.round_amount(float(rule.min_cost) / price)) + float(rule.amount_step)
+            if amount * price < float(rule.min_cost):
+                amount = min(min_amount_by_cost, remaining)
+        # Не оставляем "хвост" меньше минимальной части
+        rest = remaining - amount
+        if rule.min_amount is not None and 0 < rest < float(rule.min_amount):
+            amount = remaining
+        amount = float(rule.round_amount(amount))
+        # Остаток, который биржа не примет, не отправляем (задача завершится как "пыль")
+        if rule.min_amount is not None and amount < float(rule.min_amount):
+            return 0.0
+        if rule.min_cost is not None and price and amount * price < float(rule.min_cost):
+            return 0.0
+        return amount
+
+    def _track(self, task: ExecutionTask, order: dict, side: str):
+        rule = self.mexc_service.order_rules.get(task.symbol)
+        if not order.get('symbol'): order['symbol'] = task.symbol
+        if not order.get('side'): order['side'] = side
+        self._events.extend(self.mexc_service.order_tracker.track(
+            order, rule.base if rule else None, rule.quote if rule else None
+        ))
+        task.child_order_ids.append(order['id'])
+
+    def submit_market(self, task: ExecutionTask, amount: float, book: L2OrderBook):
+        rule = self.mexc_service.order_rules.get(task.symbol)
+        if rule is None:
+            return None, f"{task.symbol}: нет правил пары"
+        estimate = book.estimate_market_buy(amount) if task.side == 'buy' else book.estimate_market_sell(amount)
+        price = estimate['avg_price'] if estimate else None
+        cost_override = estimate['cost'] if estimate and task.side == 'buy' and estimate['fully_covered'] else None
+        check = validate_market_order(rule, task.side, amount, price, cost_override)
+        if not check['ok']:
+            return None, check['error']
+        order, error_msg = self.mexc_service.create_market_order(task.symbol, task.side, check['api_amount'])
+        if error_msg or not order:
+            return None, error_msg or "Ордер не вернул данных"
+        self._track(task, order, task.side)
+        return order.get('id'), None
+
+    def submit_limit(self, task: ExecutionTask, amount: float, price: float):
+        rule = self.mexc_service.order_rules.get(task.symbol)
+        if rule is None:
+            return None, f"{task.symbol}: нет правил пары"
+        check = validate_limit_order(rule, task.side, amount, price)
+        if not check['ok']:
+            return None, check['error']
+        order, error_msg = self.mexc_service.create_limit_order(task.symbol, task.side, check['amount'], check['price'])
+        if error_msg or not order:
+            return None, error_msg or "Ордер не вернул данных"
+        if order.get('amount') is None: order['amount'] = check['amount']
+        if order.get('price') is None: order['price'] = check['price']
+        self._track(task, order, task.side)
+        return order.get('id'), None
+
+    def cancel_child(self, task: ExecutionTask, order_id):
+        _, error_msg = self.mexc_service.cancel_order(order_id, task.symbol)
+        if error_msg:
+            print(f"ExecutionScheduler: cancel {order_id} failed: {error_msg}")
+        return error_msg is None
+
+
+class ExecutionSchedulerWorker(QThread):
+    # (list прогресса задач, list событий OrderTracker)
+    scheduler_progress = pyqtSignal(object, object)
+    TICK_SEC = 1.0
+
+    def __init__(self, scheduler: ExecutionScheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self._stop_event = threading.Event()
+
+    def run(self):
+        # Крутится, пока есть активные задачи; новый запуск — при добавлении задачи
+        while not self._stop_event.is_set() and self.scheduler.has_active_tasks():
+            try:
+                progress, events = self.scheduler.step()
+                self.scheduler_progress.emit(progress, events)
+            except Exception as e:
+                print(f"ExecutionSchedulerWorker: step error: {e}")
+            self._stop_event.wait(self.TICK_SEC)
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,359 @@
+# src/core/fake_exchange.py
+import itertools
+import json
+import math
+import random
+import threading
+import time
+import zlib
+
+from ccxt.base.errors import (
+    AuthenticationError, BadSymbol, OrderNotFound, RateLimitExceeded, RequestTimeout, ExchangeNotAvailable
+)
+
+TICK_SIZE = 4  # ccxt.TICK_SIZE: точность в рынках задана размером шага
+TIMEFRAME_MS = {'1m': 60_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+                '1h': 3_600_000, '4h': 14_400_000, '1d': 86_400_000}
+
+
+def generate_fixture(num_markets: int = 500, seed: int = 42):
+    """
+    Синтетический набор данных в формате ccxt: рынки (спот, разные котируемые
+    валюты, часть неактивных), тикеры и балансы. Один и тот же seed дает один
+    и тот же набор, поэтому бенчмарки воспроизводимы.
+    """
+    rng = random.Random(seed)
+    quotes = ['USDT'] * 8 + ['USDC', 'BTC']
+    markets, tickers = {}, {}
+    for i in range(num_markets):
+        base = f"C{i:04d}" if i >= 3 else ('BTC', 'ETH', 'SOL')[i]
+        quote = quotes[rng.randrange(len(quotes))] if base != 'BTC' else 'USDT'
+        symbol = f"{base}/{quote}"
+        if symbol in markets:
+            continue
+        price = 10 ** rng.uniform(-6, 4.8)
+        price_decimals = max(0, min(12, 4 - int(math.floor(math.log10(price)))))
+        amount_decimals = max(0, min(8, int(math.floor(math.log10(price))) + 2))
+        markets[symbol] = {
+            'id': f"{base}{quote}", 'symbol': symbol, 'base': base, 'quote': quote,
+            'type': 'spot', 'spot': True, 'swap': False, 'active': rng.random() > 0.05,
+            'precision': {'price': 10.0 ** -price_decimals, 'amount': 10.0 ** -amount_decimals, 'cost': None},
+            'limits': {'amount': {'min': 10.0 ** -amount_decimals, 'max': None},
+                       'cost': {'min': 1.0 if quote != 'BTC' else 0.0001, 'max': 2_000_000.0},
+                       'price': {'min': None, 'max': None}},
+            'info': {},
+        }
+        spread = price * rng.uniform(0.0001, 0.002)
+        tickers[symbol] = {
+            'symbol': symbol, 'last': price, 'bid': price - spread / 2, 'ask': price + spread / 2,
+            'quoteVolume': rng.uniform(1e3, 5e8), 'timestamp': None,
+        }
+    return {
+        'seed': seed, 'markets': markets, 'tickers': tickers, 'ohlcv': {},
+        'balance': {'free': {'USDT': 10_000.0, 'BTC': 0.5, 'ETH': 5.0}, 'used': {}},
+    }
+
+
+def load_fixture(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def record_fixture(exchange, path: str, ohlcv_symbols: list = (), timeframe: str = '5m', limit: int = 500):
+    """Записывает ответы настоящей биржи ccxt (рынки, тикеры, OHLCV) в фикстуру для офлайн-запуска."""
+    markets = exchange.load_markets()
+    fixture = {
+        'seed': None,
+        'markets': {s: dict(m, info={}) for s, m in markets.items() if m.get('spot')},
+        'tickers': {s: {k: t.get(k) for k in ('symbol', 'last', 'bid', 'ask', 'quoteVolume', 'timestamp')}
+                    for s, t in exchange.fetch_tickers().items()},
+        'ohlcv': {s: {timeframe: exchange.fetch_ohlcv(s, timeframe, None, limit)} for s in ohlcv_symbols},
+        'balance': {'free': {'USDT': 10_000.0}, 'used': {}},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f)
+    return fixture
+
+
+class FakeExchange:
+    """
+    Внутрипроцессная замена ccxt.mexc для офлайн-бенчмарков и нагрузочных прогонов.
+
+    Реализует подмножество sync-API ccxt, которое использует MexcService.
+    Рынки и тикеры берутся из фикстуры (записанной или generate_fixture);
+    цены двигаются детерминированным случайным блужданием от seed, свечи,
+    стакан и сделки строятся вокруг текущей цены. Ордера исполняются сразу
+    по рынку или висят открытыми (лимитные), балансы ведутся в памяти.
+
+    Сетевые условия задаются параметрами: задержка и разброс ответа,
+    доля ошибок (таймауты, 503) и серверный лимит запросов в секунду
+    (превышение — RateLimitExceeded, как HTTP 429). Случайность берется
+    из отдельного генератора с seed, поэтому прогоны повторяемы.
+    """
+    id = 'mexc'
+    rateLimit = 50
+    precisionMode = TICK_SIZE
+    MAX_STORED_ORDERS = 1000
+
+    def __init__(self, fixture: dict = None, config: dict = None, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, error_rate: float = 0.0, rate_limit_per_sec: float = None,
+                 seed: int = 0):
+        config = config or {}
+        self.fixture = fixture if fixture is not None else generate_fixture()
+        self.apiKey = config.get('apiKey')
+        self.secret = config.get('secret')
+        self.enableRateLimit = config.get('enableRateLimit', True)
+        self.options = dict(config.get('options') or {})
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_per_sec = rate_limit_per_sec
+        self.request_count = 0
+        self.rejected_count = 0
+        self.has = {
+            'fetchMarkets': True, 'fetchTickers': True, 'fetchOHLCV': True, 'fetchOrderBook': True,
+            'fetchTrades': True, 'fetchBalance': True, 'fetchOrders': True, 'createLimitOrder': True,
+            'createMarketBuyOrder': True, 'createMarketSellOrder': True, 'cancelOrder': True,
+        }
+        self.markets = None
+        self.symbols = None
+        self.currencies = None
+        self.lastRestRequestTimestamp = 0
+        self._rng = random.Random(self.fixture.get('seed') or 0)
+        self._prices = {s: t['last'] for s, t in self.fixture.get('tickers', {}).items() if t.get('last')}
+        balance = self.fixture.get('balance') or {}
+        self._free = dict(balance.get('free') or {})
+        self._used = dict(balance.get('used') or {})
+        self._orders = {}
+        self._order_ids = itertools.count(1)
+        self._lock = threading.RLock()  # Состояние (цены, ордера, балансы) меняется из нескольких QThread
+        self._sim_lock = threading.Lock()
+        self._sim_rng = random.Random(seed)
+        self._bucket_tokens = rate_limit_per_sec or 0.0
+        self._bucket_updated = time.monotonic()
+        self._throttle_lock = threading.Lock()
+
+    # --- Служебное (совместимость с хуками ccxt) ---
+    def milliseconds(self):
+        return int(time.time() * 1000)
+
+    def throttle(self, cost=None):
+        # Клиентский лимит ccxt (enableRateLimit): не чаще одного запроса в rateLimit мс
+        if not self.enableRateLimit:
+            return
+        with self._throttle_lock:
+            elapsed = self.milliseconds() - self.lastRestRequestTimestamp
+            sleep_time = self.rateLimit * (1 if cost is None else cost)
+            if elapsed < sleep_time:
+                time.sleep((sleep_time - elapsed) / 1000.0)
+            self.lastRestRequestTimestamp = self.milliseconds()
+
+    def on_rest_response(self, code, reason, url, method, response_headers, response_body,
+                         request_headers=None, request_body=None):
+        return response_body
+
+    def _take_rate_limit_token(self):
+        # Серверный лимит: корзина токенов на rate_limit_per_sec запросов в секунду
+        now = time.monotonic()
+        self._bucket_tokens = min(self.rate_limit_per_sec,
+                                  self._bucket_tokens + (now - self._bucket_updated) * self.rate_limit_per_sec)
+        self._bucket_updated = now
+        if self._bucket_tokens < 1:
+            return False
+        self._bucket_tokens -= 1
+        return True
+
+    def _request(self, path: str):
+        # Каждый "запрос" проходит клиентский throttle, затем эмуляцию сети и сервера
+        self.throttle(1)
+        with self._sim_lock:
+            self.request_count += 1
+            allowed = self._take_rate_limit_token() if self.rate_limit_per_sec else True
+            delay_ms = self.latency_ms + (self._sim_rng.uniform(-1, 1) * self.jitter_ms if self.jitter_ms else 0.0)
+            failure = self._sim_rng.random() if self.error_rate else 1.0
+            if not allowed:
+                self.rejected_count += 1
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+        if not allowed:
+            self.on_rest_response(429, 'Too Many Requests', path, 'GET', {}, '')
+            raise RateLimitExceeded(f"mexc GET {path} 429 Too Many Requests")
+        if failure < self.error_rate:
+            if failure < self.error_rate / 2:
+                raise RequestTimeout(f"mexc GET {path} request timeout")
+            raise ExchangeNotAvailable(f"mexc GET {path} 503 Service Unavailable")
+        self.on_rest_response(200, 'OK', path, 'GET', {}, '')
+
+    def _price(self, symbol: str):
+        with self._lock:
+            if symbol not in self._prices:
+                raise BadSymbol(f"mexc does not have market symbol {symbol}")
+            price = self._prices[symbol] * math.exp(self._rng.gauss(0, 0.0005))
+            self._prices[symbol] = price
+            return price
+
+    # --- Публичные данные ---
+    def load_markets(self, reload=False):
+        if self.markets is None or reload:
+            self._request('/api/v3/exchangeInfo')
+            self.set_markets([dict(m) for m in self.fixture['markets'].values()])
+        return self.markets
+
+    def fetch_spot_markets(self, params=None):
+        self._request('/api/v3/exchangeInfo')
+        return [dict(m) for m in self.fixture['markets'].values() if m.get('spot', True)]
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = {m['symbol']: m for m in markets}
+        self.symbols = sorted(self.markets)
+        codes = {m[key] for m in markets for key in ('base', 'quote')}
+        self.currencies = dict(currencies) if currencies else {code: {'code': code} for code in codes}
+        return self.markets
+
+    def fetch_tickers(self, symbols=None, params=None):
+        self._request('/api/v3/ticker/24hr')
+        result = {}
+        for symbol in symbols or self._prices.keys():
+            if symbol not in self._prices:
+                continue
+            recorded = self.fixture['tickers'][symbol]
+            price = self._price(symbol)
+            half_spread = abs((recorded.get('ask') or price) - (recorded.get('bid') or price)) / 2
+            result[symbol] = {
+                'symbol': symbol, 'last': price, 'bid': price - half_spread, 'ask': price + half_spread,
+                'quoteVolume': recorded.get('quoteVolume'), 'timestamp': self.milliseconds(),
+                'percentage': (price / recorded['last'] - 1) * 100,
+            }
+        return result
+
+    def fetch_ohlcv(self, symbol, timeframe='5m', since=None, limit=None, params=None):
+        self._request('/api/v3/klines')
+        recorded = (self.fixture.get('ohlcv') or {}).get(symbol, {}).get(timeframe)
+        limit = limit or 500
+        if recorded:
+            candles = [c for c in recorded if since is None or c[0] >= since]
+            return candles[:limit] if since is not None else candles[-limit:]
+
+        step = TIMEFRAME_MS.get(timeframe, 300_000)
+        end = (self.milliseconds() // step) * step
+        start = since if since is not None else end - step * (limit - 1)
+        start = (start // step) * step
+        rng = random.Random(zlib.crc32(f"{symbol}|{timeframe}|{start}".encode()))
+        close = self._prices.get(symbol, 1.0)
+        candles = []
+        ts = start
+        while ts <= end and len(candles) < limit:
+            open_ = close
+            close = open_ * math.exp(rng.gauss(0, 0.002))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, 0.001)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, 0.001)))
+            candles.append([ts, open_, high, low, close, rng.uniform(1, 1000)])
+            ts += step
+        return candles
+
+    def fetch_order_book(self, symbol, limit=None, params=None):
+        self._request('/api/v3/depth')
+        price = self._price(symbol)
+        limit = limit or 50
+        tick = self.fixture['markets'][symbol]['precision']['price'] or price * 1e-4
+        bids = [[price - tick * (i + 1), self._rng.uniform(0.1, 10)] for i in range(limit)]
+        asks = [[price + tick * (i + 1), self._rng.uniform(0.1, 10)] for i in range(limit)]
+        return {'symbol': symbol, 'bids': bids, 'asks': asks, 'nonce': self.milliseconds(),
+                'timestamp': self.milliseconds()}
+
+    def fetch_trades(self, symbol, since=None, limit=None, params=None):
+        self._request('/api/v3/trades')
+        now = self.milliseconds()
+        trades = []
+        for i in range(limit or 100):
+            ts = now - i * 250
+            if since is not None and ts < since:
+                break
+            trades.append({'id': f"{symbol}-{ts}", 'timestamp': ts, 'price': self._price(symbol),
+                           'amount': self._rng.uniform(0.001, 2), 'side': 'buy' if self._rng.random() > 0.5 else 'sell'})
+        trades.reverse()
+        return trades
+
+    # --- Приватные данные ---
+    def _check_credentials(self):
+        if not self.apiKey or not self.secret:
+            raise AuthenticationError("mexc requires \"apiKey\" credential")
+
+    def fetch_balance(self, params=None):
+        self._check_credentials()
+        self._request('/api/v3/account')
+        with self._lock:
+            assets = set(self._free) | set(self._used)
+            free = {a: self._free.get(a, 0.0) for a in assets}
+            used = {a: self._used.get(a, 0.0) for a in assets}
+        result = {'free': free, 'used': used, 'total': {a: free[a] + used[a] for a in assets}}
+        for asset in assets:
+            result[asset] = {'free': free[asset], 'used': used[asset], 'total': free[asset] + used[asset]}
+        return result
+
+    def fetch_orders(self, symbol=None, since=None, limit=None, params=None):
+        self._check_credentials()
+        self._request('/api/v3/allOrders')
+        with self._lock:
+            return [dict(o) for o in self._orders.values()
+                    if (symbol is None or o['symbol'] == symbol) and (since is None or o['timestamp'] >= since)]
+
+    def _new_order(self, symbol, order_type, side, amount, price, status, filled, cost):
+        order = {
+            'id': str(next(self._order_ids)), 'symbol': symbol, 'type': order_type, 'side': side,
+            'amount': amount, 'price': price, 'average': (cost / filled) if filled else None,
+            'filled': filled, 'cost': cost, 'remaining': amount - filled, 'status': status,
+            'timestamp': self.milliseconds(), 'fee': None,
+        }
+        with self._lock:
+            self._orders[order['id']] = order
+            # История ордеров ограничена, чтобы сама биржа не росла в памяти на долгих прогонах
+            while len(self._orders) > self.MAX_STORED_ORDERS:
+                oldest_id = next((i for i, o in self._orders.items() if o['status'] != 'open'), None)
+                if oldest_id is None:
+                    break
+                del self._orders[oldest_id]
+            return dict(order)
+
+    def _settle(self, symbol, side, amount, cost):
+        market = self.fixture['markets'][symbol]
+        base, quote = market['base'], market['quote']
+        sign = 1 if side == 'buy' else -1
+        with self._lock:
+            self._free[base] = self._free.get(base, 0.0) + sign * amount
+            self._free[quote] = self._free.get(quote, 0.0) - sign * cost
+
+    def create_market_buy_order(self, symbol, cost, params=None):
+        self._check_credentials()
+        self._request('/api/v3/order')
+        price = self._price(symbol)
+        amount = cost / price
+        self._settle(symbol, 'buy', amount, cost)
+        return self._new_order(symbol, 'market', 'buy', amount, price, 'closed', amount, cost)
+
+    def create_market_sell_order(self, symbol, amount, params=None):
+        self._check_credentials()
+        self._request('/api/v3/order')
+        price = self._price(symbol)
+        self._settle(symbol, 'sell', amount, amount * price)
+        return self._new_order(symbol, 'market', 'sell', amount, price, 'closed', amount, amount * price)
+
+    def create_limit_order(self, symbol, side, amount, price, params=None):
+        self._check_credentials()
+        self._request('/api/v3/order')
+        return self._new_order(symbol, 'limit', side, amount, price, 'open', 0.0, 0.0)
+
+    def cancel_order(self, id, symbol=None, params=None):
+        self._check_credentials()
+        self._request('/api/v3/order')
+        with self._lock:
+            order = self._orders.get(id)
+            if order is None:
+                raise OrderNotFound(f"Order {id} not found")
+            order['status'] = 'canceled'
+            return dict(order)
+
+
+def make_fake_exchange_factory(fixture: dict, **simulation):
+    """Фабрика для MexcService(exchange_factory=...): каждый новый экземпляр использует одну фикстуру."""
+    return lambda config: FakeExchange(fixture, config, **simulation)
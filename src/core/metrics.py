@@ -0,0 +1,215 @@
+# src/core/metrics.py
+import functools
+import json
+import math
+import threading
+import time
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек с логарифмическими корзинами (шаг x1.25 от 1 мс до ~60 с).
+    Память постоянная, перцентили считаются по накопленным счетчикам корзин.
+    """
+    MIN_MS = 1.0
+    GROWTH = 1.25
+    NUM_BUCKETS = 50
+
+    def __init__(self):
+        self.counts = [0] * (self.NUM_BUCKETS + 1)  # Последняя корзина — всё, что выше верхней границы
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def _bucket_index(self, value_ms: float):
+        if value_ms <= self.MIN_MS:
+            return 0
+        idx = int(math.log(value_ms / self.MIN_MS, self.GROWTH)) + 1
+        return min(idx, self.NUM_BUCKETS)
+
+    def _bucket_upper_ms(self, idx: int):
+        return self.MIN_MS * (self.GROWTH ** idx)
+
+    def add(self, value_ms: float):
+        self.counts[self._bucket_index(value_ms)] += 1
+        self.total += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, pct: float):
+        # Линейная интерполяция внутри корзины, в которую попадает pct-й перцентиль
+        if not self.total:
+            return None
+        rank = max(1, math.ceil(self.total * pct / 100.0))
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                upper = self._bucket_upper_ms(idx)
+                lower = upper / self.GROWTH if idx else 0.0
+                value = lower + (upper - lower) * (rank - seen) / count
+                return min(value, self.max_ms)
+            seen += count
+        return self.max_ms
+
+
+class EndpointMetrics:
+    """Счетчики одного метода сервиса: вызовы, ошибки, задержки, ожидание rate limit, объем ответов."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.rate_limit_wait_ms = 0.0
+        self.http_requests = 0
+        self.payload_bytes = 0
+        self.last_error = None
+        self.last_error_at = None
+
+    def to_dict(self):
+        return {
+            'endpoint': self.name,
+            'calls': self.calls,
+            'errors': self.errors,
+            'error_rate': (self.errors / self.calls) if self.calls else 0.0,
+            'p50_ms': self.latency.percentile(50),
+            'p95_ms': self.latency.percentile(95),
+            'p99_ms': self.latency.percentile(99),
+            'avg_ms': (self.latency.sum_ms / self.latency.total) if self.latency.total else None,
+            'max_ms': self.latency.max_ms if self.latency.total else None,
+            'rate_limit_wait_ms': self.rate_limit_wait_ms,
+            'http_requests': self.http_requests,
+            'payload_bytes': self.payload_bytes,
+            'avg_payload_bytes': (self.payload_bytes / self.calls) if self.calls else 0,
+            'last_error': self.last_error,
+            'last_error_at': self.last_error_at,
+        }
+
+
+class ServiceMetrics:
+    """
+    Метрики вызовов MexcService по методам.
+
+    Задержка и ошибки снимаются декоратором instrumented. Ожидание rate limit
+    и размер ответов собираются хуками на экземпляре ccxt (throttle и
+    on_rest_response) в счетчики текущего потока, поэтому параллельные вызовы
+    из разных QThread не смешиваются.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.endpoints = {}
+        self.started_at = time.time()
+        self.total_calls = 0  # Сумма по всем методам (дешевый счетчик для планировщика обновлений)
+        self.total_rate_limit_wait_ms = 0.0
+
+    def attach_exchange(self, exchange):
+        # Оборачиваем методы конкретного экземпляра ccxt (класс биржи не трогаем)
+        if exchange is None or getattr(exchange, '_metrics_attached', False):
+            return
+        original_throttle = exchange.throttle
+        original_on_rest_response = exchange.on_rest_response
+        local = self._local
+
+        def throttle(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original_throttle(*args, **kwargs)
+            finally:
+                if getattr(local, 'depth', 0):
+                    local.rate_limit_wait_ms += (time.perf_counter() - started) * 1000
+
+        def on_rest_response(code, reason, url, method, response_headers, response_body, *args, **kwargs):
+            if getattr(local, 'depth', 0):
+                local.http_requests += 1
+                local.payload_bytes += len(response_body or '')
+            return original_on_rest_response(code, reason, url, method, response_headers, response_body,
+                                             *args, **kwargs)
+
+        exchange.throttle = throttle
+        exchange.on_rest_response = on_rest_response
+        exchange._metrics_attached = True
+
+    def begin_call(self):
+        local = self._local
+        local.depth = getattr(local, 'depth', 0) + 1
+        if local.depth == 1:
+            local.rate_limit_wait_ms = 0.0
+            local.http_requests = 0
+            local.payload_bytes = 0
+        return local.depth == 1
+
+    def end_call(self, endpoint: str, latency_ms: float, error_msg=None):
+        local = self._local
+        local.depth -= 1
+        if local.depth:
+            return  # Вложенный вызов учитывается во внешнем
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointMetrics(endpoint)
+            stats.calls += 1
+            stats.latency.add(latency_ms)
+            self.total_calls += 1
+            self.total_rate_limit_wait_ms += local.rate_limit_wait_ms
+            stats.rate_limit_wait_ms += local.rate_limit_wait_ms
+            stats.http_requests += local.http_requests
+            stats.payload_bytes += local.payload_bytes
+            if error_msg:
+                stats.errors += 1
+                stats.last_error = str(error_msg)
+                stats.last_error_at = time.time()
+
+    def snapshot(self):
+        """Returns: list словарей метрик по методам (отсортированы по суммарному времени)."""
+        with self._lock:
+            rows = [stats.to_dict() for stats in self.endpoints.values()]
+        rows.sort(key=lambda r: -(r['avg_ms'] or 0) * r['calls'])
+        return rows
+
+    def totals(self):
+        """Returns: tuple (всего вызовов, суммарное ожидание rate limit в мс) с момента создания."""
+        with self._lock:
+            return self.total_calls, self.total_rate_limit_wait_ms
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+            self.started_at = time.time()
+
+    def export_json(self, path: str):
+        data = {'started_at': self.started_at, 'exported_at': time.time(), 'endpoints': self.snapshot()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def instrumented(endpoint: str = None):
+    """
+    Декоратор метода сервиса с контрактом (data, error_msg): пишет задержку, ошибку
+    и сетевые счетчики в self.metrics. Исключения тоже считаются ошибкой.
+    """
+    def decorator(func):
+        name = endpoint or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, 'metrics', None)
+            if metrics is None:
+                return func(self, *args, **kwargs)
+            metrics.begin_call()
+            started = time.perf_counter()
+            error_msg = None
+            try:
+                result = func(self, *args, **kwargs)
+                if isinstance(result, tuple) and len(result) == 2:
+                    error_msg = result[1]
+                return result
+            except Exception as e:
+                error_msg = str(e)
+                raise
+            finally:
+                metrics.end_call(name, (time.perf_counter() - started) * 1000, error_msg)
+        return wrapper
+    return decorator
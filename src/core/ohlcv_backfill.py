@@ -0,0 +1,190 @@
+# src/core/ohlcv_backfill.py
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+TIMEFRAME_UNITS_MS = {
+    'm': 60 * 1000,
+    'h': 60 * 60 * 1000,
+    'd': 24 * 60 * 60 * 1000,
+    'w': 7 * 24 * 60 * 60 * 1000,
+    'M': 30 * 24 * 60 * 60 * 1000,
+}
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    # '5m' -> 300000, '1h' -> 3600000 и т.д.
+    amount, unit = timeframe[:-1], timeframe[-1]
+    if unit not in TIMEFRAME_UNITS_MS or not amount.isdigit():
+        raise ValueError(f"Неизвестный таймфрейм: {timeframe}")
+    return int(amount) * TIMEFRAME_UNITS_MS[unit]
+
+
+class OhlcvBackfillScheduler:
+    """
+    Планировщик догрузки истории свечей "назад во времени".
+
+    Для каждой пары (symbol, timeframe) страницами по page_limit свечей
+    запрашивает более старые данные через MexcService.fetch_ohlcv(since, limit),
+    складывает их в CandleArchive и после каждой страницы сохраняет чекпоинт.
+    Задачи обрабатываются по кругу, чтобы все пары наполнялись равномерно.
+    Между запросами выдерживается min_request_interval, чтобы догрузка
+    расходовала лишь часть лимита запросов и не мешала обновлениям UI.
+
+    Пустое окно не обязательно означает начало торгов: в истории бывают пропуски
+    (пауза торгов, техработы). Такое окно пропускается, и запрашивается
+    предыдущее; задача завершается после MAX_EMPTY_WINDOWS пустых окон подряд
+    или когда окно ушло раньше времени листинга пары (если биржа его отдает).
+    """
+    DEFAULT_PAGE_LIMIT = 500
+    DEFAULT_MIN_REQUEST_INTERVAL = 1.0  # сек. между страницами
+    MAX_CONSECUTIVE_ERRORS = 5
+    MAX_EMPTY_WINDOWS = 3
+
+    def __init__(self, mexc_service, archive, symbols: list, timeframes: list,
+                 max_candles: int = 20000, page_limit: int = DEFAULT_PAGE_LIMIT,
+                 min_request_interval: float = DEFAULT_MIN_REQUEST_INTERVAL):
+        self.mexc_service = mexc_service
+        self.archive = archive
+        self.max_candles = max_candles
+        self.page_limit = page_limit
+        self.min_request_interval = min_request_interval
+        self.tasks = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        self._task_index = 0
+        self._errors = {}
+        self._empty_windows = {}  # (symbol, timeframe) -> пустых окон подряд
+        self._cursors = {}  # (symbol, timeframe) -> конец следующего окна после пустых (в чекпоинт не пишется)
+        self._last_request_at = 0.0
+
+    def pending_tasks(self):
+        pending = []
+        for symbol, timeframe in self.tasks:
+            if self._errors.get((symbol, timeframe), 0) >= self.MAX_CONSECUTIVE_ERRORS:
+                continue
+            if not self.archive.get_backfill_state(symbol, timeframe)['complete']:
+                pending.append((symbol, timeframe))
+        return pending
+
+    def failed_tasks(self):
+        """Задачи, пропущенные после MAX_CONSECUTIVE_ERRORS ошибок подряд."""
+        return [task for task in self.tasks if self._errors.get(task, 0) >= self.MAX_CONSECUTIVE_ERRORS]
+
+    def _listing_time(self, symbol: str):
+        # Время листинга из рынков ccxt (поле created), если биржа его отдает
+        try:
+            market = (self.mexc_service.exchange.markets or {}).get(symbol) or {}
+        except Exception:
+            return None
+        return market.get('created')
+
+    def _next_task(self):
+        pending = self.pending_tasks()
+        if not pending:
+            return None
+        task = pending[self._task_index % len(pending)]
+        self._task_index += 1
+        return task
+
+    def wait_for_rate_budget(self, stop_event: threading.Event = None):
+        # Возвращает False, если ожидание прервано остановкой
+        delay = self._last_request_at + self.min_request_interval - time.monotonic()
+        if delay > 0:
+            if stop_event is not None:
+                if stop_event.wait(delay):
+                    return False
+            else:
+                time.sleep(delay)
+        self._last_request_at = time.monotonic()
+        return True
+
+    def backfill_page(self, symbol: str, timeframe: str):
+        """
+        Загружает одну страницу истории, предшествующую самой старой известной свече.
+        Returns:
+            tuple: (dict прогресса или None, str ошибки или None)
+        """
+        key = (symbol, timeframe)
+        state = self.archive.get_backfill_state(symbol, timeframe)
+        tf_ms = timeframe_to_ms(timeframe)
+        # Первый проход начинается от текущего момента, дальше — от самой старой свечи (или после пустых окон)
+        end_ts = self._cursors.get(key)
+        if end_ts is None:
+            end_ts = state['oldest_ts'] if state['oldest_ts'] is not None else int(time.time() * 1000)
+        since = end_ts - self.page_limit * tf_ms
+
+        ohlcv_data, error_msg = self.mexc_service.fetch_ohlcv(
+            symbol=symbol, timeframe=timeframe, since=since, limit=self.page_limit
+        )
+        if error_msg:
+            self._errors[key] = self._errors.get(key, 0) + 1
+            return None, error_msg
+        self._errors.pop(key, None)
+
+        older_candles = [c for c in (ohlcv_data or []) if c and c[0] < end_ts]
+        added = self.archive.store_candles(symbol, timeframe, older_candles)
+        candles_count = state['candles_count'] + added
+
+        if older_candles:
+            oldest_ts = min(c[0] for c in older_candles)
+            empty_windows = 0
+            self._cursors.pop(key, None)
+            complete = candles_count >= self.max_candles
+        else:
+            # Пропуск в истории или начало торгов: дальше запрашиваем окно перед этим
+            oldest_ts = state['oldest_ts']
+            empty_windows = self._empty_windows.get(key, 0) + 1
+            self._cursors[key] = since
+            listed_at = self._listing_time(symbol)
+            complete = (empty_windows >= self.MAX_EMPTY_WINDOWS or
+                        (listed_at is not None and since <= listed_at))
+        if complete or not empty_windows:
+            self._empty_windows.pop(key, None)
+            if complete:
+                self._cursors.pop(key, None)
+        else:
+            self._empty_windows[key] = empty_windows
+        self.archive.save_backfill_state(symbol, timeframe, oldest_ts, candles_count, complete)
+
+        return {
+            'symbol': symbol, 'timeframe': timeframe, 'added': added, 'empty_windows': empty_windows,
+            'candles_count': candles_count, 'oldest_ts': oldest_ts, 'complete': complete,
+        }, None
+
+    def run(self, stop_event: threading.Event, progress_callback=None):
+        # Крутит задачи до завершения всех или до сигнала остановки.
+        # True — все задачи завершены; задачи, пропущенные из-за ошибок, завершением не считаются
+        while not stop_event.is_set():
+            task = self._next_task()
+            if task is None:
+                return not self.failed_tasks()
+            if not self.wait_for_rate_budget(stop_event):
+                return False
+            progress, error_msg = self.backfill_page(*task)
+            if error_msg and self._errors.get(task, 0) >= self.MAX_CONSECUTIVE_ERRORS:
+                error_msg = f"{error_msg} (задача пропущена после {self.MAX_CONSECUTIVE_ERRORS} ошибок подряд)"
+            if progress_callback:
+                progress_callback(task[0], task[1], progress, error_msg)
+        return False
+
+
+class OhlcvBackfillWorker(QThread):
+    # (symbol, timeframe, progress_dict_or_None, error_or_None)
+    backfill_progress = pyqtSignal(str, str, object, object)
+    backfill_finished = pyqtSignal(bool)
+
+    def __init__(self, scheduler: OhlcvBackfillScheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            completed = self.scheduler.run(self._stop_event, self.backfill_progress.emit)
+            self.backfill_finished.emit(completed)
+        except Exception as e:
+            print(f"OhlcvBackfillWorker: critical error: {e}")
+            self.backfill_finished.emit(False)
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,147 @@
+# src/core/order_book.py
+import time
+from bisect import bisect_left, insort
+
+
+class L2OrderBook:
+    """
+    Инкрементально поддерживаемый стакан (L2: агрегированные уровни цен).
+
+    Уровни хранятся в dict (цена -> объем) плюс отсортированные списки цен,
+    поэтому обновление уровня стоит O(log n) на поиск, а лучшая цена
+    читается за O(1). Книга принимает полный снимок (apply_snapshot) и
+    дифф-сообщения с номерами последовательности (apply_diff). При пропуске
+    номера книга помечается как needs_resync и ждет новый снимок.
+    """
+
+    def __init__(self, symbol: str = None):
+        self.symbol = symbol
+        self.bids = {}
+        self.asks = {}
+        self._bid_prices = []  # по возрастанию, лучший bid — последний
+        self._ask_prices = []  # по возрастанию, лучший ask — первый
+        self.sequence = None
+        self.needs_resync = True
+        self.updated_at = None
+
+    def clear(self, symbol: str = None):
+        if symbol is not None:
+            self.symbol = symbol
+        self.bids.clear()
+        self.asks.clear()
+        self._bid_prices.clear()
+        self._ask_prices.clear()
+        self.sequence = None
+        self.needs_resync = True
+        self.updated_at = None
+
+    @staticmethod
+    def _set_level(levels: dict, prices: list, price: float, amount: float):
+        if amount > 0:
+            if price not in levels:
+                insort(prices, price)
+            levels[price] = amount
+        elif price in levels:
+            del levels[price]
+            idx = bisect_left(prices, price)
+            if idx < len(prices) and prices[idx] == price:
+                del prices[idx]
+
+    def apply_snapshot(self, bids: list, asks: list, sequence=None):
+        # bids/asks в формате ccxt: [[price, amount], ...]
+        self.bids = {float(level[0]): float(level[1]) for level in bids if float(level[1]) > 0}
+        self.asks = {float(level[0]): float(level[1]) for level in asks if float(level[1]) > 0}
+        self._bid_prices = sorted(self.bids)
+        self._ask_prices = sorted(self.asks)
+        self.sequence = sequence
+        self.needs_resync = False
+        self.updated_at = time.time()
+
+    def apply_diff(self, bids: list, asks: list, first_sequence=None, last_sequence=None):
+        """
+        Применяет дифф-сообщение: объем 0 означает удаление уровня.
+        Returns:
+            bool: True если дифф применен (или устарел и пропущен),
+                  False если обнаружен разрыв последовательности и нужен снимок.
+        """
+        if self.needs_resync:
+            return False
+        if last_sequence is not None and self.sequence is not None:
+            if last_sequence <= self.sequence:
+                return True  # Устаревшее сообщение, уже учтено в снимке
+            if first_sequence is not None and first_sequence > self.sequence + 1:
+                self.needs_resync = True
+                return False
+        for price, amount in bids:
+            self._set_level(self.bids, self._bid_prices, float(price), float(amount))
+        for price, amount in asks:
+            self._set_level(self.asks, self._ask_prices, float(price), float(amount))
+        if last_sequence is not None:
+            self.sequence = last_sequence
+        self.updated_at = time.time()
+        return True
+
+    def best_bid(self):
+        return self._bid_prices[-1] if self._bid_prices else None
+
+    def best_ask(self):
+        return self._ask_prices[0] if self._ask_prices else None
+
+    def spread(self):
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def top(self, depth: int = 10):
+        # Возвращает (bids от лучшего к худшему, asks от лучшего к худшему)
+        bid_prices = self._bid_prices[-depth:][::-1] if depth > 0 else []
+        ask_prices = self._ask_prices[:depth]
+        return [(p, self.bids[p]) for p in bid_prices], [(p, self.asks[p]) for p in ask_prices]
+
+    def is_fresh(self, max_age_sec: float = 10.0):
+        return (not self.needs_resync and self.updated_at is not None
+                and time.time() - self.updated_at <= max_age_sec)
+
+    def _walk(self, prices, levels, base_amount: float):
+        remaining = base_amount
+        cost = 0.0
+        worst_price = None
+        for price in prices:
+            take = min(remaining, levels[price])
+            cost += take * price
+            remaining -= take
+            worst_price = price
+            if remaining <= 1e-15:
+                break
+        filled = base_amount - max(remaining, 0.0)
+        return filled, cost, worst_price
+
+    def estimate_market_buy(self, base_amount: float):
+        """
+        Оценивает покупку base_amount по рынку проходом по asks.
+        Returns:
+            dict или None: cost (сумма в QUOTE), avg_price, worst_price,
+            slippage_pct (относительно лучшего ask), fully_covered
+        """
+        if base_amount <= 0 or not self._ask_prices:
+            return None
+        filled, cost, worst_price = self._walk(self._ask_prices, self.asks, base_amount)
+        return self._estimate_result(base_amount, filled, cost, worst_price, self._ask_prices[0])
+
+    def estimate_market_sell(self, base_amount: float):
+        if base_amount <= 0 or not self._bid_prices:
+            return None
+        filled, cost, worst_price = self._walk(reversed(self._bid_prices), self.bids, base_amount)
+        return self._estimate_result(base_amount, filled, cost, worst_price, self._bid_prices[-1])
+
+    @staticmethod
+    def _estimate_result(base_amount, filled, cost, worst_price, best_price):
+        if filled <= 0:
+            return None
+        avg_price = cost / filled
+        return {
+            'cost': cost, 'filled': filled, 'avg_price': avg_price, 'worst_price': worst_price,
+            'slippage_pct': abs(avg_price - best_price) / best_price * 100 if best_price else 0.0,
+            'fully_covered': filled >= base_amount * (1 - 1e-9),
+        }
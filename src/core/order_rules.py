@@ -0,0 +1,280 @@
+# src/core/order_rules.py
+import math
+from decimal import Decimal, ROUND_DOWN, InvalidOperation
+
+
+def _to_decimal(value):
+    # NaN и бесконечность — "нет значения": сравнения Decimal('NaN') бросают InvalidOperation
+    if value is None:
+        return None
+    try:
+        result = Decimal(str(value))
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+    return result if result.is_finite() else None
+
+
+def is_finite_number(value) -> bool:
+    """Конечное число (отсекает nan/inf, которые float() принимает из поля ввода)."""
+    try:
+        return math.isfinite(float(value))
+    except (ValueError, TypeError):
+        return False
+
+
+# Режимы точности ccxt (ccxt.base.decimal_to_precision); продублированы, чтобы не тянуть ccxt в модуль правил
+DECIMAL_PLACES = 2
+SIGNIFICANT_DIGITS = 3
+TICK_SIZE = 4
+
+DEFAULT_DECIMALS = 8
+_precision_memo = {}  # (режим, значение) -> (знаков после запятой, шаг Decimal или None)
+
+
+def parse_precision(value, precision_mode=TICK_SIZE):
+    """
+    Разбирает значение точности ccxt с учетом precisionMode биржи.
+
+    Различных значений точности на бирже десятки, а рынков тысячи, поэтому
+    результат запоминается по паре (режим, значение).
+
+    Returns:
+        tuple: (int знаков после запятой, Decimal шаг или None, если шаг не определен)
+    """
+    key = (precision_mode, value)
+    try:
+        return _precision_memo[key]
+    except KeyError:
+        pass
+    except TypeError:  # Нехешируемое значение — разбираем без кэша
+        return _parse_precision_uncached(value, precision_mode)
+    result = _parse_precision_uncached(value, precision_mode)
+    _precision_memo[key] = result
+    return result
+
+
+def _parse_precision_uncached(value, precision_mode):
+    tick = _to_decimal(value)
+    if tick is None or tick <= 0 or not tick.is_finite():
+        return DEFAULT_DECIMALS, None
+    if precision_mode == DECIMAL_PLACES:
+        # Значение — число знаков после запятой, шаг 10^-n
+        decimals = int(tick)
+        return decimals, Decimal(1).scaleb(-decimals)
+    if precision_mode == SIGNIFICANT_DIGITS:
+        # Шаг зависит от цены, заранее его не посчитать
+        return DEFAULT_DECIMALS, None
+    # TICK_SIZE: значение — сам шаг; знаков столько, сколько у шага после запятой (0.25 -> 2, 10 -> 0)
+    exponent = tick.normalize().as_tuple().exponent
+    return max(0, -exponent), tick
+
+
+def _step_from_precision(raw_value, decimals):
+    # Шаг из сырого значения ccxt (размер тика) или из количества знаков после запятой
+    raw = _to_decimal(raw_value)
+    if raw is not None and raw > 0 and raw != raw.to_integral_value():
+        return raw
+    if decimals is None:
+        decimals = 8
+    return Decimal(1).scaleb(-int(decimals))
+
+
+class OrderRule:
+    """Заранее рассчитанные торговые правила одной пары (шаги и лимиты в Decimal)."""
+    __slots__ = ('symbol', 'base', 'quote', 'amount_step', 'price_tick', 'cost_step',
+                 'min_amount', 'max_amount', 'min_cost', 'max_cost',
+                 'amount_precision', 'cost_precision')
+
+    def __init__(self, market_data: dict):
+        precision = market_data.get('precision', {}) or {}
+        limits = market_data.get('limits', {}) or {}
+        self.symbol = market_data.get('symbol')
+        self.base = market_data.get('base')
+        self.quote = market_data.get('quote')
+        self.amount_precision = precision.get('amount', 8)
+        self.cost_precision = precision.get('cost', 2)
+        # Точные шаги из load_markets_data (amount_tick/price_tick/cost_tick); иначе выводим из сырых значений
+        self.amount_step = precision.get('amount_tick') or \
+            _step_from_precision(precision.get('raw_amount'), self.amount_precision)
+        self.price_tick = precision.get('price_tick') or \
+            _step_from_precision(precision.get('raw_price'), precision.get('price', 8))
+        self.cost_step = precision.get('cost_tick') or \
+            _step_from_precision(precision.get('raw_cost'), self.cost_precision)
+        self.min_amount = _to_decimal((limits.get('amount') or {}).get('min'))
+        self.max_amount = _to_decimal((limits.get('amount') or {}).get('max'))
+        self.min_cost = _to_decimal((limits.get('cost') or {}).get('min'))
+        self.max_cost = _to_decimal((limits.get('cost') or {}).get('max'))
+
+    @staticmethod
+    def _floor_to_step(value: Decimal, step: Decimal):
+        if step is None or step <= 0:
+            return value
+        return (value / step).to_integral_value(rounding=ROUND_DOWN) * step
+
+    def round_amount(self, amount) -> Decimal:
+        return self._floor_to_step(Decimal(str(amount)), self.amount_step)
+
+    def round_cost(self, cost) -> Decimal:
+        return self._floor_to_step(Decimal(str(cost)), self.cost_step)
+
+    def round_price(self, price) -> Decimal:
+        return self._floor_to_step(Decimal(str(price)), self.price_tick)
+
+
+class OrderRulesTable:
+    """Таблица правил по символам; заполняется один раз при загрузке рынков."""
+
+    def __init__(self):
+        self._rules = {}
+
+    def update_from_markets(self, markets: list):
+        for market_data in markets:
+            self._rules[market_data['symbol']] = OrderRule(market_data)
+
+    def remove(self, symbols):
+        for symbol in symbols:
+            self._rules.pop(symbol, None)
+
+    def get(self, symbol: str):
+        return self._rules.get(symbol)
+
+    def get_or_build(self, market_data: dict):
+        rule = self._rules.get(market_data.get('symbol'))
+        if rule is None:
+            rule = OrderRule(market_data)
+            self._rules[rule.symbol] = rule
+        return rule
+
+    def __len__(self):
+        return len(self._rules)
+
+
+def validate_market_order(rule: OrderRule, side: str, amount_base, price, cost_override=None,
+                          free_base=None, free_quote=None):
+    """
+    Синхронная проверка и округление рыночного ордера по заранее рассчитанным правилам.
+
+    Args:
+        amount_base: кол-во BASE, введенное пользователем.
+        price: ожидаемая цена исполнения (для оценки стоимости).
+        cost_override: готовая оценка стоимости покупки (например, по стакану).
+        free_base / free_quote: свободные балансы из кэша (None — не проверять).
+
+    Returns:
+        dict: ok, error (str или None), amount (float, округленное кол-во BASE),
+              cost (float, стоимость в QUOTE), api_amount (аргумент для create_market_order:
+              сумма QUOTE для покупки, кол-во BASE для продажи), max_amount (макс. доступное кол-во BASE)
+    """
+    result = {'ok': False, 'error': None, 'amount': None, 'cost': None, 'api_amount': None, 'max_amount': None}
+    if not is_finite_number(amount_base):
+        result['error'] = "Некорректное количество"
+        return result
+    try:
+        amount = rule.round_amount(amount_base)
+    except (InvalidOperation, ValueError, TypeError):
+        result['error'] = "Некорректное количество"
+        return result
+    price_dec = _to_decimal(price)
+    side = side.lower()
+
+    if price_dec is not None and price_dec > 0:
+        if side == 'buy' and free_quote is not None:
+            result['max_amount'] = float(rule.round_amount(Decimal(str(free_quote)) / price_dec))
+        elif side == 'sell' and free_base is not None:
+            result['max_amount'] = float(rule.round_amount(free_base))
+    elif side == 'sell' and free_base is not None:
+        result['max_amount'] = float(rule.round_amount(free_base))
+
+    result['amount'] = float(amount)
+    if amount <= 0:
+        result['error'] = f"Кол-во меньше шага ({rule.amount_step.normalize()})"
+        return result
+    if rule.min_amount is not None and amount < rule.min_amount:
+        result['error'] = f"Кол-во < min ({rule.min_amount.normalize()})"
+        return result
+    if rule.max_amount is not None and amount > rule.max_amount:
+        result['error'] = f"Кол-во > max ({rule.max_amount.normalize()})"
+        return result
+
+    if price_dec is None or price_dec <= 0:
+        if side == 'buy':
+            result['error'] = "Нет цены для расчета стоимости покупки"
+            return result
+        cost = None
+    else:
+        raw_cost = _to_decimal(cost_override)
+        if raw_cost is None:
+            raw_cost = amount * price_dec
+        cost = rule.round_cost(raw_cost)
+        result['cost'] = float(cost)
+        if rule.min_cost is not None and cost < rule.min_cost:
+            result['error'] = f"Сумма ({cost:.{rule.cost_precision}f}) < min ({rule.min_cost.normalize()})"
+            return result
+        if rule.max_cost is not None and cost > rule.max_cost:
+            result['error'] = f"Сумма > max ({rule.max_cost.normalize()})"
+            return result
+
+    if side == 'buy':
+        if free_quote is not None and cost > Decimal(str(free_quote)):
+            result['error'] = f"Недостаточно {rule.quote}"
+            return result
+        result['api_amount'] = float(cost)
+    elif side == 'sell':
+        if free_base is not None and amount > Decimal(str(free_base)):
+            result['error'] = f"Недостаточно {rule.base}"
+            return result
+        result['api_amount'] = float(amount)
+    else:
+        result['error'] = "Неверная сторона ордера"
+        return result
+
+    result['ok'] = True
+    return result
+
+
+def validate_limit_order(rule: OrderRule, side: str, amount_base, price, free_base=None, free_quote=None):
+    """
+    Проверка лимитного ордера: цена округляется до тика, кол-во — до шага.
+    Returns:
+        dict: ok, error, amount (float), price (float), cost (float)
+    """
+    result = {'ok': False, 'error': None, 'amount': None, 'price': None, 'cost': None}
+    if not (is_finite_number(amount_base) and is_finite_number(price)):
+        result['error'] = "Некорректные кол-во или цена"
+        return result
+    try:
+        amount = rule.round_amount(amount_base)
+        price_dec = rule.round_price(price)
+    except (InvalidOperation, ValueError, TypeError):
+        result['error'] = "Некорректные кол-во или цена"
+        return result
+    result['amount'], result['price'] = float(amount), float(price_dec)
+    if price_dec <= 0:
+        result['error'] = f"Цена меньше тика ({rule.price_tick.normalize()})"
+        return result
+    if amount <= 0:
+        result['error'] = f"Кол-во меньше шага ({rule.amount_step.normalize()})"
+        return result
+    if rule.min_amount is not None and amount < rule.min_amount:
+        result['error'] = f"Кол-во < min ({rule.min_amount.normalize()})"
+        return result
+    if rule.max_amount is not None and amount > rule.max_amount:
+        result['error'] = f"Кол-во > max ({rule.max_amount.normalize()})"
+        return result
+    cost = amount * price_dec
+    result['cost'] = float(cost)
+    if rule.min_cost is not None and cost < rule.min_cost:
+        result['error'] = f"Сумма ({cost:.{rule.cost_precision}f}) < min ({rule.min_cost.normalize()})"
+        return result
+    side = side.lower()
+    if side == 'buy' and free_quote is not None and cost > Decimal(str(free_quote)):
+        result['error'] = f"Недостаточно {rule.quote}"
+        return result
+    if side == 'sell' and free_base is not None and amount > Decimal(str(free_base)):
+        result['error'] = f"Недостаточно {rule.base}"
+        return result
+    if side not in ('buy', 'sell'):
+        result['error'] = "Неверная сторона ордера"
+        return result
+    result['ok'] = True
+    return result
@@ -0,0 +1,152 @@
+# src/core/order_tracker.py
+import threading
+import time
+from collections import deque
+
+ORDER_FINAL_STATUSES = ('closed', 'canceled', 'expired', 'rejected')
+
+
+class OrderTracker:
+    """
+    Таблица открытых и недавних ордеров в памяти.
+
+    Ордера индексируются по id и по символу, открытые дополнительно хранятся
+    в отдельном множестве. Обновления приходят пачкой из одного общего опроса
+    (apply_updates) или из приватного потока, и превращаются в события
+    'partial_fill' / 'fill' / 'canceled'. Прирост исполнения сразу
+    применяется к кэшу балансов, поэтому одно исполнение не учитывается дважды.
+    Если стоимость прироста неизвестна (нет cost и average), дельта не
+    применяется, а кэш помечается устаревшим — его исправит сверка снимком.
+    Дальнейшие приросты такого ордера тоже идут только через сверку: базу
+    стоимости, от которой считать дельту, снимок уже не сохраняет.
+    """
+    MAX_RECENT_ORDERS = 200
+
+    def __init__(self, balance_cache=None):
+        self.balance_cache = balance_cache
+        self._lock = threading.Lock()
+        self.orders = {}
+        self.open_ids = set()
+        self.by_symbol = {}
+        self._recent_closed = deque()
+
+    def clear(self):
+        with self._lock:
+            self.orders.clear()
+            self.open_ids.clear()
+            self.by_symbol.clear()
+            self._recent_closed.clear()
+
+    def has_open_orders(self):
+        return bool(self.open_ids)
+
+    def open_orders_by_symbol(self):
+        # {symbol: самый ранний timestamp открытого ордера} — параметры для общего опроса
+        with self._lock:
+            result = {}
+            for order_id in self.open_ids:
+                record = self.orders[order_id]
+                ts = record.get('timestamp') or int(time.time() * 1000)
+                result[record['symbol']] = min(ts, result.get(record['symbol'], ts))
+            return result
+
+    def track(self, order: dict, base_asset: str, quote_asset: str):
+        """Регистрирует новый ордер (ответ create_order) и возвращает события по уже исполненной части."""
+        if not order or not order.get('id'):
+            return []
+        with self._lock:
+            record = {
+                'id': order['id'], 'symbol': order.get('symbol'), 'side': order.get('side'),
+                'type': order.get('type'), 'status': order.get('status') or 'open',
+                'amount': order.get('amount'), 'filled': 0.0, 'cost': 0.0,
+                'average': order.get('average'), 'price': order.get('price'),
+                'timestamp': order.get('timestamp') or int(time.time() * 1000),
+                'base': base_asset, 'quote': quote_asset, 'updated_at': time.time(),
+                'balance_synced': True,  # все исполнения ордера применены к кэшу дельтами
+            }
+            self.orders[record['id']] = record
+            self.by_symbol.setdefault(record['symbol'], set()).add(record['id'])
+            self.open_ids.add(record['id'])
+            return self._apply_update_locked(record, order)
+
+    def apply_updates(self, orders: list):
+        """Применяет пачку ордеров ccxt (из общего опроса); неизвестные ордера игнорируются."""
+        events = []
+        with self._lock:
+            for order in orders or []:
+                record = self.orders.get(order.get('id'))
+                if record is not None:
+                    events.extend(self._apply_update_locked(record, order))
+        return events
+
+    def _apply_update_locked(self, record: dict, order: dict):
+        events = []
+        previous_filled, previous_cost = record['filled'], record['cost']
+        filled = order.get('filled')
+        if filled is not None:
+            filled = float(filled)
+            cost = order.get('cost')
+            cost_known = cost is not None
+            if cost is None:
+                average = order.get('average') or order.get('price') or record.get('average')
+                cost_known = bool(average)
+                cost = filled * float(average) if average else previous_cost
+            cost = float(cost)
+            if filled > previous_filled:
+                if self.balance_cache is not None:
+                    # Стоимость, посчитанную по средней цене прошлых обновлений, передаем кэшу явно
+                    applied = record['balance_synced'] and cost_known and self.balance_cache.apply_order_update(
+                        dict(order, cost=cost, side=order.get('side') or record['side']),
+                        record['base'], record['quote'], previous_filled, previous_cost
+                    )
+                    if not applied:
+                        # Исполнение учитываем в ордере (события, статус), балансы исправит снимок
+                        record['balance_synced'] = False
+                        self.balance_cache.mark_stale()
+                record['filled'], record['cost'] = filled, cost
+                if filled > 0:
+                    record['average'] = cost / filled
+
+        status = order.get('status') or record['status']
+        amount = order.get('amount') or record.get('amount')
+        if amount and record['filled'] >= float(amount) * (1 - 1e-9):
+            status = 'closed'
+        record['status'] = status
+        if amount:
+            record['amount'] = amount
+        record['updated_at'] = time.time()
+
+        if record['filled'] > previous_filled:
+            event_type = 'fill' if status == 'closed' else 'partial_fill'
+            events.append({
+                'type': event_type, 'order': dict(record),
+                'delta_filled': record['filled'] - previous_filled, 'delta_cost': record['cost'] - previous_cost,
+            })
+        if status in ORDER_FINAL_STATUSES and record['id'] in self.open_ids:
+            self.open_ids.discard(record['id'])
+            self._remember_closed(record['id'])
+            if status != 'closed':
+                events.append({'type': status, 'order': dict(record), 'delta_filled': 0.0, 'delta_cost': 0.0})
+        return events
+
+    def _remember_closed(self, order_id):
+        self._recent_closed.append(order_id)
+        while len(self._recent_closed) > self.MAX_RECENT_ORDERS:
+            old_id = self._recent_closed.popleft()
+            record = self.orders.pop(old_id, None)
+            if record:
+                ids = self.by_symbol.get(record['symbol'])
+                if ids:
+                    ids.discard(old_id)
+                    if not ids:
+                        del self.by_symbol[record['symbol']]
+
+    def get_order(self, order_id):
+        with self._lock:
+            record = self.orders.get(order_id)
+            return dict(record) if record else None
+
+    def get_orders(self, symbol: str = None, open_only: bool = False):
+        with self._lock:
+            ids = self.by_symbol.get(symbol, set()) if symbol else self.orders.keys()
+            return [dict(self.orders[i]) for i in ids if not open_only or i in self.open_ids]
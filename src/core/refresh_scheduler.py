@@ -0,0 +1,194 @@
+# src/core/refresh_scheduler.py
+import time
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+from PyQt5.QtWidgets import QApplication
+
+
+def _is_rate_limit_error(error_message) -> bool:
+    text = str(error_message).lower()
+    return '429' in text or 'rate limit' in text or 'ratelimit' in text or 'too many' in text
+
+
+class RefreshJob:
+    """
+    Периодическое обновление, которым управляет RefreshScheduler.
+
+    Повторяет интерфейс QTimer (start/stop/isActive), поэтому заменяет таймер
+    виджета без изменения вызывающего кода. Результат запроса сообщается через
+    report(error_message) — от него зависит откат при ошибках.
+    """
+
+    def __init__(self, scheduler, name: str, callback, widget=None, symbol=None, align_ms: int = None,
+                 min_interval_ms: int = None, background: bool = False):
+        self.scheduler = scheduler
+        self.name = name
+        self.callback = callback
+        self.widget = widget  # Скрытый виджет (или свернутое окно) — обновление на паузе
+        # Callable -> символ рыночной задачи (None — весь рынок); задачи чужих пар и всего рынка
+        # замедляются, пока открыта активная пара. Без symbol (счет, ордера) — не зависит от фокуса
+        self.symbol = symbol
+        self.align_ms = align_ms  # Дополнительный запуск сразу после закрытия свечи этого таймфрейма
+        self.min_interval_ms = min_interval_ms or scheduler.MIN_INTERVAL_MS
+        self.background = background  # Не замедляется, когда приложение не в фокусе (оповещения)
+        self.interval_ms = 0
+        self.active = False
+        self.next_due = 0.0
+        self.error_streak = 0
+        self.runs = 0
+
+    # --- Интерфейс QTimer ---
+    def start(self, interval_ms: int = None):
+        if interval_ms is not None:
+            self.interval_ms = int(interval_ms)
+        self.active = True
+        self.next_due = time.monotonic() + self.scheduler.effective_interval_ms(self) / 1000
+        if self.align_ms:
+            self.next_due = min(self.next_due, self.scheduler._next_close(self, time.time()))
+        self.scheduler.reschedule()
+
+    def stop(self):
+        self.active = False
+
+    def isActive(self) -> bool:
+        return self.active
+
+    def interval(self) -> int:
+        return self.interval_ms
+
+    # --- Обратная связь ---
+    def report(self, error_message=None):
+        if error_message:
+            self.error_streak += 1
+            if _is_rate_limit_error(error_message):
+                self.scheduler.note_rate_limited()
+        else:
+            self.error_streak = 0
+
+    def is_paused(self) -> bool:
+        if self.widget is None:
+            return False
+        return not self.widget.isVisible() or self.widget.window().isMinimized()
+
+
+class RefreshScheduler(QObject):
+    """
+    Единый планировщик периодических обновлений виджетов.
+
+    Вместо набора QTimer с фиксированными интервалами один таймер запускает
+    задачи (RefreshJob) по их эффективному интервалу:
+      * скрытый в QStackedWidget виджет или свернутое окно — задача на паузе;
+      * приложение не в фокусе — интервал x IDLE_FACTOR (кроме фоновых задач: background=True);
+      * открыта активная пара (focus symbol) — рыночные задачи других пар и всего рынка
+        (скринер, список монет) идут с интервалом x UNFOCUSED_FACTOR, задачи активной пары —
+        со своим базовым интервалом: лимит запросов достается паре на экране;
+      * подряд идущие ошибки — экспоненциальный откат до MAX_ERROR_BACKOFF;
+      * давление rate limit (ожидание в throttle по ServiceMetrics или ответы 429) —
+        общий множитель до MAX_PRESSURE_FACTOR, который постепенно снимается;
+      * align_ms — дополнительный запуск сразу после закрытия свечи.
+    """
+    MIN_INTERVAL_MS = 500
+    MAX_TICK_MS = 1000  # Не реже: вовремя заметить показ виджета или разворачивание окна
+    IDLE_FACTOR = 4.0
+    UNFOCUSED_FACTOR = 2.0
+    MAX_ERROR_BACKOFF = 16
+    MAX_PRESSURE_FACTOR = 4.0
+    PRESSURE_SAMPLE_SEC = 5.0
+    PRESSURE_HIGH_WAIT_MS = 250.0  # Среднее ожидание в throttle на вызов, выше которого замедляемся
+    PRESSURE_LOW_WAIT_MS = 50.0
+    ALIGN_DELAY_MS = 2000  # Биржа отдает закрытую свечу с небольшой задержкой
+
+    def __init__(self, metrics=None, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.jobs = []
+        self.focus_symbol = None
+        self.pressure_factor = 1.0
+        self._pressure_sample = None  # (время, вызовов, ожидание мс)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+
+    def add_job(self, name: str, callback, widget=None, symbol=None, align_ms: int = None,
+                min_interval_ms: int = None, background: bool = False) -> RefreshJob:
+        job = RefreshJob(self, name, callback, widget, symbol, align_ms, min_interval_ms, background)
+        self.jobs.append(job)
+        return job
+
+    def remove_job(self, job: RefreshJob):
+        job.stop()
+        if job in self.jobs:
+            self.jobs.remove(job)
+
+    def set_focus_symbol(self, symbol):
+        self.focus_symbol = symbol
+        self.reschedule()
+
+    def note_rate_limited(self):
+        self.pressure_factor = min(self.MAX_PRESSURE_FACTOR, self.pressure_factor * 2)
+
+    def effective_interval_ms(self, job: RefreshJob) -> float:
+        interval = job.interval_ms * self.pressure_factor
+        if not job.background and QApplication.applicationState() != Qt.ApplicationActive:
+            interval *= self.IDLE_FACTOR
+        if self.focus_symbol and job.symbol is not None and not job.background \
+                and job.symbol() != self.focus_symbol:
+            interval *= self.UNFOCUSED_FACTOR
+        if job.error_streak:
+            interval *= min(self.MAX_ERROR_BACKOFF, 2 ** job.error_streak)
+        return max(job.min_interval_ms, interval)
+
+    def _next_close(self, job: RefreshJob, now_wall: float):
+        # Момент (по time.monotonic) сразу после закрытия текущей свечи таймфрейма job.align_ms
+        align_sec = job.align_ms / 1000
+        close_wall = (int(now_wall / align_sec) + 1) * align_sec + self.ALIGN_DELAY_MS / 1000
+        return time.monotonic() + (close_wall - now_wall)
+
+    def reschedule(self):
+        # Перезапуск таймера под ближайшую задачу (вызывается и после каждого прохода)
+        now = time.monotonic()
+        paused_due = now + self.MAX_TICK_MS / 1000
+        due_times = [max(job.next_due, paused_due) if job.is_paused() else job.next_due
+                     for job in self.jobs if job.active]
+        if not due_times:
+            self._timer.stop()
+            return
+        delay_ms = (min(due_times) - now) * 1000
+        self._timer.start(int(min(self.MAX_TICK_MS, max(0, delay_ms))))
+
+    def _update_pressure(self, now: float):
+        if self.metrics is None:
+            return
+        sample = self._pressure_sample
+        if sample and now - sample[0] < self.PRESSURE_SAMPLE_SEC:
+            return
+        calls, wait_ms = self.metrics.totals()
+        self._pressure_sample = (now, calls, wait_ms)
+        if not sample or calls <= sample[1]:
+            return
+        average_wait_ms = (wait_ms - sample[2]) / (calls - sample[1])
+        if average_wait_ms > self.PRESSURE_HIGH_WAIT_MS:
+            self.note_rate_limited()
+        elif average_wait_ms < self.PRESSURE_LOW_WAIT_MS:
+            self.pressure_factor = max(1.0, self.pressure_factor / 2)
+
+    def _tick(self):
+        now = time.monotonic()
+        self._update_pressure(now)
+        now_wall = time.time()
+        for job in list(self.jobs):
+            if not job.active or now < job.next_due:
+                continue
+            if job.is_paused():
+                # На паузе не копим пропущенные запуски: после показа виджета — одно обновление сразу
+                continue
+            job.next_due = now + self.effective_interval_ms(job) / 1000
+            if job.align_ms:
+                job.next_due = min(job.next_due, self._next_close(job, now_wall))
+            job.runs += 1
+            try:
+                job.callback()
+            except Exception as e:
+                print(f"RefreshScheduler: job '{job.name}' failed: {e}")
+                job.report(e)
+        self.reschedule()
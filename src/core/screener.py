@@ -0,0 +1,191 @@
+# src/core/screener.py
+import math
+import operator
+import time
+from array import array
+from collections import deque
+from itertools import compress, repeat
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .simple_predictor import TREND_SIGNIFICANCE
+from .ohlcv_backfill import timeframe_to_ms
+
+TREND_UNKNOWN = 0
+TREND_UP = 1
+TREND_DOWN = -1
+TREND_FLAT = 2
+
+OPERATORS = {
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq,
+}
+NUMERIC_COLUMNS = ('last', 'change_pct', 'volume', 'spread_pct')
+# Таймфрейм свечей, на которых работает simple_predictor на экране торговли
+TREND_TIMEFRAME = '5m'
+
+
+def _trend_code(first: float, last: float, candles: float) -> int:
+    # То же правило, что в get_simple_price_prediction: среднее изменение за свечу против порога от цены.
+    # candles — прошедшее между снимками время в свечах TREND_TIMEFRAME (обычно доля свечи)
+    if math.isnan(first) or math.isnan(last):
+        return TREND_UNKNOWN
+    avg_change = (last - first) / candles
+    threshold = last * TREND_SIGNIFICANCE
+    if avg_change > threshold:
+        return TREND_UP
+    if avg_change < -threshold:
+        return TREND_DOWN
+    return TREND_FLAT
+
+
+class MarketScreener:
+    """
+    Скринер по всем USDT-парам: колоночный снимок рынка и фильтры по колонкам.
+
+    Строки — рынки из load_markets_data (порядок фиксирован до смены списка
+    рынков), колонки — array('d') цены, изменения за 24ч, объема и спреда и
+    array('b') тренда; отсутствующее значение — NaN, которое не проходит ни
+    одно сравнение. Тикеры пишутся в колонки по индексу строки, фильтр
+    (колонка, оператор, значение) применяется ко всей колонке через
+    map/compress без цикла на Python по строкам, следующий фильтр — только к
+    прошедшим строкам.
+
+    Тренд — правило simple_predictor по последним TREND_LOOKBACK снимкам
+    цены (свечи всех пар не запрашиваются): изменение между первым и последним
+    снимком приводится к скорости за свечу TREND_TIMEFRAME по времени между
+    ними, иначе порог на свечу к снимкам с интервалом в секунды почти никогда
+    не срабатывает. Не потокобезопасен: используется из GUI-потока.
+    """
+    TREND_LOOKBACK = 12  # При обновлении раз в 5 с — около минуты
+
+    def __init__(self):
+        self.symbols = []
+        self.markets = {}  # символ -> рынок из load_markets_data (для перехода на экран торговли)
+        self.row_index = {}  # символ -> номер строки
+        self.columns = {}
+        self._price_history = deque(maxlen=self.TREND_LOOKBACK)  # (time.monotonic(), снимок колонки last)
+        self._reset_columns(0)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _reset_columns(self, size: int):
+        for name in NUMERIC_COLUMNS:
+            self.columns[name] = array('d', [math.nan]) * size
+        self.columns['trend'] = array('b', [TREND_UNKNOWN]) * size
+        self._price_history.clear()
+
+    def set_universe(self, markets: list) -> bool:
+        """Задает список рынков. Returns: bool — изменился ли набор строк."""
+        symbols = [market['symbol'] for market in markets]
+        self.markets = {market['symbol']: market for market in markets}
+        if symbols == self.symbols:
+            return False
+        previous_columns, previous_index = self.columns, self.row_index
+        self.columns = {}
+        self.symbols = symbols
+        self.row_index = {symbol: idx for idx, symbol in enumerate(symbols)}
+        self._reset_columns(len(symbols))
+        # Значения сохранившихся пар переносим, историю тренда набираем заново
+        for symbol, idx in self.row_index.items():
+            old_idx = previous_index.get(symbol)
+            if old_idx is None:
+                continue
+            for name in NUMERIC_COLUMNS:
+                self.columns[name][idx] = previous_columns[name][old_idx]
+        return True
+
+    def update_tickers(self, tickers: dict, now: float = None) -> int:
+        """
+        Записывает тикеры ({символ: {'last_price', 'bid', 'ask', 'volume', 'change_pct'}}) в колонки
+        и пересчитывает тренд. now — время снимка по time.monotonic(). Returns: int — обновлено строк.
+        """
+        last_col, change_col = self.columns['last'], self.columns['change_pct']
+        volume_col, spread_col = self.columns['volume'], self.columns['spread_pct']
+        row_index = self.row_index
+        updated = 0
+        for symbol, ticker in tickers.items():
+            idx = row_index.get(symbol)
+            if idx is None:
+                continue
+            updated += 1
+            last_price = ticker.get('last_price')
+            last_col[idx] = last_price if last_price is not None else math.nan
+            change_pct = ticker.get('change_pct')
+            change_col[idx] = change_pct if change_pct is not None else math.nan
+            volume = ticker.get('volume')
+            volume_col[idx] = volume if volume is not None else math.nan
+            bid, ask = ticker.get('bid'), ticker.get('ask')
+            spread_col[idx] = (ask - bid) / ask * 100 if bid and ask else math.nan
+        if updated:
+            self._price_history.append((time.monotonic() if now is None else now, array('d', last_col)))
+            self._update_trend()
+        return updated
+
+    def _update_trend(self):
+        history = self._price_history
+        if len(history) < 2:
+            return
+        (first_time, first_prices), (last_time, last_prices) = history[0], history[-1]
+        if last_time <= first_time:
+            return
+        candles = (last_time - first_time) * 1000 / timeframe_to_ms(TREND_TIMEFRAME)
+        self.columns['trend'] = array('b', map(_trend_code, first_prices, last_prices, repeat(candles)))
+
+    def evaluate(self, filters: list, sort_by: str = None, descending: bool = True) -> list:
+        """
+        Строки, прошедшие все фильтры.
+        Args:
+            filters (list): [(колонка, оператор из OPERATORS, значение)]
+            sort_by (str): колонка для сортировки результата (NaN — в конце)
+        Returns:
+            list: номера строк
+        """
+        rows = None
+        for column, op_name, value in filters:
+            column_values = self.columns[column]
+            op = OPERATORS[op_name]
+            if rows is None:
+                rows = list(compress(range(len(column_values)), map(op, column_values, repeat(value))))
+            else:
+                rows = list(compress(rows, map(op, map(column_values.__getitem__, rows), repeat(value))))
+            if not rows:
+                return []
+        if rows is None:
+            rows = list(range(len(self.symbols)))
+        if sort_by:
+            column_values = self.columns[sort_by]
+            fallback = -math.inf if descending else math.inf
+            rows.sort(key=lambda idx: fallback if math.isnan(column_values[idx]) else column_values[idx],
+                      reverse=descending)
+        return rows
+
+    def rows(self, indices: list) -> list:
+        """Строки для отображения: [{'symbol', 'last', 'change_pct', 'volume', 'spread_pct', 'trend'}]."""
+        columns = self.columns
+        return [
+            dict({name: columns[name][idx] for name in NUMERIC_COLUMNS},
+                 symbol=self.symbols[idx], trend=columns['trend'][idx])
+            for idx in indices
+        ]
+
+
+class ScreenerFetchWorker(QThread):
+    """Рынки (из кэша сервиса, если свежие) и тикеры всех пар для MarketScreener."""
+    # (list рынков или None, dict тикеров или None, str ошибки или None)
+    fetch_finished = pyqtSignal(object, object, object)
+
+    def __init__(self, mexc_service_instance, parent=None):
+        super().__init__(parent)
+        self.mexc_service = mexc_service_instance
+
+    def run(self):
+        try:
+            markets, error_msg = self.mexc_service.load_markets_data()
+            if error_msg:
+                self.fetch_finished.emit(None, None, error_msg)
+                return
+            tickers, error_msg = self.mexc_service.fetch_tickers()
+            self.fetch_finished.emit(markets, tickers, error_msg)
+        except Exception as e:
+            self.fetch_finished.emit(None, None, f"Ошибка обновления скринера: {e}")
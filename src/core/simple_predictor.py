@@ -7,6 +7,9 @@ PREDICTION_COLOR_SELL = QColor("#e74c3c")
 PREDICTION_COLOR_HOLD = QColor("#f1c40f") # Используем для случаев, когда предсказание близко к текущей цене
 PREDICTION_COLOR_UNCERTAIN = QColor("#95a5a6")
 
+# Порог среднего изменения за свечу (доля текущей цены), выше которого тренд считается ростом/падением
+TREND_SIGNIFICANCE = 0.0005
+
 def get_simple_price_prediction(ohlcv_data: list, lookback_period: int = 2):
     """
     Делает очень простое "предсказание" числового значения цены закрытия
@@ -73,7 +76,7 @@ def get_simple_price_prediction(ohlcv_data: list, lookback_period: int = 2):
     trend_color = PREDICTION_COLOR_UNCERTAIN
 
     # Порог изменения для определения значимого роста/падения (например, 0.1% от текущей цены)
-    significance_threshold = current_price * 0.0005 # 0.05%
+    significance_threshold = current_price * TREND_SIGNIFICANCE # 0.05%
 
     if avg_change > significance_threshold:
         trend_description = f"Ожидается рост до ~{predicted_price_formatted}"
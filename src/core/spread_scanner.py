@@ -0,0 +1,226 @@
+# src/core/spread_scanner.py
+import threading
+import time
+from bisect import bisect_left, insort
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class SpreadScanner:
+    """
+    Сканер спредов: цены одного базового актива на разных площадках и в
+    разных котируемых валютах.
+
+    Котировки приводятся к USD: стейблкоины — 1:1, прочие котируемые валюты
+    (BTC, ETH, ...) — по середине спреда пары {валюта}/стейблкоин той же
+    площадки. Спред актива — (лучший bid − лучший ask) / лучший ask по
+    источникам (площадка, пара), где bid и ask берутся из разных источников;
+    положительный спред — цены разошлись настолько, что купить в одном месте
+    дешевле, чем продать в другом.
+
+    Индекс самых широких спредов — отсортированный список (−спред, актив).
+    После порции тикеров пересчитываются только затронутые активы, их ключи
+    переставляются через bisect, поэтому цикл в тысячи пар не пересортировывает
+    весь индекс. Не потокобезопасен: используется из одного потока
+    (SpreadScannerWorker), наружу отдаются копии (top).
+    """
+    STABLE_QUOTES = frozenset({'USDT', 'USDC', 'FDUSD', 'TUSD', 'DAI', 'USD', 'BUSD', 'USDE'})
+    MAX_QUOTE_AGE_SEC = 60
+
+    def __init__(self):
+        self.quotes = {}  # актив -> {(площадка, символ): (bid в USD, ask в USD, время получения)}
+        self.entries = {}  # актив -> последний результат (см. _evaluate)
+        self._index = []  # [(−спред %, актив)] по возрастанию: самые широкие спреды первыми
+        self._rates = {}  # площадка -> {котируемая валюта: курс к USD}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _update_rates(self, venue_id: str, tickers: dict) -> dict:
+        rates = self._rates.setdefault(venue_id, {})
+        for symbol, ticker in tickers.items():
+            base, quote = self._split_symbol(symbol)
+            if base is None or quote not in self.STABLE_QUOTES or base in self.STABLE_QUOTES:
+                continue
+            bid, ask = ticker.get('bid'), ticker.get('ask')
+            if bid and ask:
+                rates[base] = (bid + ask) / 2
+        return rates
+
+    def _quote_rate(self, venue_id: str, quote: str):
+        if quote in self.STABLE_QUOTES:
+            return 1.0
+        rate = self._rates.get(venue_id, {}).get(quote)
+        if rate is None:
+            # У площадки нет пары к стейблкоину — берем курс с любой другой
+            for venue_rates in self._rates.values():
+                if quote in venue_rates:
+                    return venue_rates[quote]
+        return rate
+
+    @staticmethod
+    def _split_symbol(symbol: str):
+        # Только спот: у деривативов в символе ccxt есть ':' (BTC/USDT:USDT)
+        if '/' not in symbol or ':' in symbol:
+            return None, None
+        base, quote = symbol.split('/', 1)
+        return base, quote
+
+    def update(self, venue_id: str, tickers: dict, now: float = None) -> int:
+        """
+        Добавляет тикеры площадки ({символ: {'bid', 'ask', ...}}) и переиндексирует затронутые активы.
+        Returns:
+            int: количество затронутых активов
+        """
+        now = time.time() if now is None else now
+        self._update_rates(venue_id, tickers)
+        affected = set()
+        for symbol, ticker in tickers.items():
+            base, quote = self._split_symbol(symbol)
+            if base is None or base in self.STABLE_QUOTES:
+                continue
+            bid, ask = ticker.get('bid'), ticker.get('ask')
+            rate = self._quote_rate(venue_id, quote)
+            if not bid or not ask or not rate:
+                continue
+            sources = self.quotes.setdefault(base, {})
+            source = (venue_id, symbol)
+            previous = sources.get(source)
+            bid_usd, ask_usd = bid * rate, ask * rate
+            sources[source] = (bid_usd, ask_usd, now)
+            # Цены не изменились — позиция актива в индексе та же (неликвидные пары между циклами)
+            if previous is None or previous[0] != bid_usd or previous[1] != ask_usd:
+                affected.add(base)
+        for base in affected:
+            self._reindex(base)
+        return len(affected)
+
+    def expire(self, now: float = None) -> int:
+        """Убирает устаревшие котировки (например, площадки, которая перестала отвечать). Returns: int."""
+        now = time.time() if now is None else now
+        stale_bases = []
+        for base, sources in list(self.quotes.items()):
+            stale_sources = [source for source, quote in sources.items() if now - quote[2] > self.MAX_QUOTE_AGE_SEC]
+            if not stale_sources:
+                continue
+            for source in stale_sources:
+                del sources[source]
+            if not sources:
+                del self.quotes[base]
+            stale_bases.append(base)
+        for base in stale_bases:
+            self._reindex(base)
+        return len(stale_bases)
+
+    def _reindex(self, base: str):
+        previous = self.entries.pop(base, None)
+        if previous is not None:
+            key = (-previous['spread_pct'], base)
+            idx = bisect_left(self._index, key)
+            if idx < len(self._index) and self._index[idx] == key:
+                del self._index[idx]
+        sources = self.quotes.get(base)
+        entry = self._evaluate(base, sources) if sources else None
+        if entry is not None:
+            self.entries[base] = entry
+            insort(self._index, (-entry['spread_pct'], base))
+
+    @staticmethod
+    def _evaluate(base: str, sources: dict):
+        if len(sources) < 2:
+            return None
+        # Два лучших bid и два лучших ask за один проход: если лучшие цены из одного источника, берем следующую
+        bid1 = bid2 = ask1 = ask2 = None  # (цена, источник)
+        for source, (bid_usd, ask_usd, _) in sources.items():
+            if bid1 is None or bid_usd > bid1[0]:
+                bid1, bid2 = (bid_usd, source), bid1
+            elif bid2 is None or bid_usd > bid2[0]:
+                bid2 = (bid_usd, source)
+            if ask1 is None or ask_usd < ask1[0]:
+                ask1, ask2 = (ask_usd, source), ask1
+            elif ask2 is None or ask_usd < ask2[0]:
+                ask2 = (ask_usd, source)
+        if bid1[1] != ask1[1]:
+            bid, ask = bid1, ask1
+        elif bid1[0] - ask2[0] >= bid2[0] - ask1[0]:
+            bid, ask = bid1, ask2
+        else:
+            bid, ask = bid2, ask1
+        (bid_usd, bid_source), (ask_usd, ask_source) = bid, ask
+        spread = bid_usd - ask_usd
+        return {
+            'base': base, 'spread_pct': spread / ask_usd * 100,
+            'bid_venue': bid_source[0], 'bid_symbol': bid_source[1], 'bid_usd': bid_usd,
+            'ask_venue': ask_source[0], 'ask_symbol': ask_source[1], 'ask_usd': ask_usd,
+            'sources': len(sources),
+        }
+
+    def top(self, limit: int = 50) -> list:
+        """Копии записей с самыми широкими спредами (по убыванию)."""
+        return [dict(self.entries[base]) for _, base in self._index[:limit]]
+
+
+class SpreadScannerWorker(QThread):
+    """
+    Циклический опрос тикеров всех площадок VenueHub и обновление SpreadScanner.
+    Каждая площадка опрашивается в своем пуле; индекс обновляется по мере прихода
+    ответов, после каждой площадки в UI уходит свежий топ.
+    """
+    # (топ спредов list, статистика цикла dict)
+    scan_updated = pyqtSignal(object, object)
+    SCAN_INTERVAL_SEC = 10
+    TOP_LIMIT = 100
+    STOP_POLL_SEC = 0.2  # Шаг ожидания ответов площадок: stop() замечается не позже чем через него
+
+    def __init__(self, venue_hub, scanner: SpreadScanner = None, parent=None):
+        super().__init__(parent)
+        self.venue_hub = venue_hub
+        self.scanner = scanner or SpreadScanner()
+        self._stop_event = threading.Event()
+        self._pending = {}  # площадка -> Future незавершенного запроса (не копим очередь к медленной площадке)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            cycle_started = time.monotonic()
+            for venue_id in self.venue_hub.services:
+                if venue_id not in self._pending or self._pending[venue_id].done():
+                    self._pending[venue_id] = self.venue_hub.submit(venue_id, 'fetch_tickers')
+            futures = {future: venue_id for venue_id, future in self._pending.items()}
+            stats = {'venues': len(futures), 'tickers': 0, 'assets': 0, 'errors': {}, 'update_ms': 0.0}
+            deadline = cycle_started + self.venue_hub.FETCH_TIMEOUT_SEC
+            not_done = set(futures)
+            while not_done:
+                if self._stop_event.is_set():
+                    return
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:  # Таймаут части площадок: остальное уже учтено
+                    stats['errors']['timeout'] = "не все площадки ответили"
+                    break
+                done, not_done = wait(not_done, timeout=min(self.STOP_POLL_SEC, timeout),
+                                      return_when=FIRST_COMPLETED)
+                for future in done:
+                    venue_id = futures[future]
+                    try:
+                        tickers, error_msg = future.result()
+                    except Exception as e:
+                        tickers, error_msg = None, str(e)
+                    if error_msg:
+                        stats['errors'][venue_id] = error_msg
+                    if tickers:
+                        update_started = time.perf_counter()
+                        self.scanner.update(venue_id, tickers)
+                        stats['update_ms'] += (time.perf_counter() - update_started) * 1000
+                        stats['tickers'] += len(tickers)
+                    stats['assets'] = len(self.scanner)
+                    self.scan_updated.emit(self.scanner.top(self.TOP_LIMIT), dict(stats))
+            if self._stop_event.is_set():
+                return
+            self.scanner.expire()
+            stats['assets'] = len(self.scanner)
+            stats['cycle_ms'] = (time.monotonic() - cycle_started) * 1000
+            self.scan_updated.emit(self.scanner.top(self.TOP_LIMIT), stats)
+            self._stop_event.wait(max(0.0, self.SCAN_INTERVAL_SEC - (time.monotonic() - cycle_started)))
+
+    def stop(self):
+        self._stop_event.set()
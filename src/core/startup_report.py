@@ -0,0 +1,141 @@
+# src/core/startup_report.py
+import json
+import sys
+import threading
+import time
+
+from ..config import STARTUP_REPORT_ENABLED
+
+
+class _TimedLoader:
+    """Обертка загрузчика модуля: замеряет exec_module, остальное передает как есть."""
+
+    def __init__(self, loader, report):
+        self._loader = loader
+        self._report = report
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._report._begin_import(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._report._end_import(module.__name__)
+
+
+class _ImportTimingFinder:
+    """Finder в начале sys.meta_path: находит модуль остальными finder'ами и оборачивает загрузчик."""
+
+    def __init__(self, report):
+        self._report = report
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, 'busy', False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self._report)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+
+
+class StartupReport:
+    """
+    Отчет о холодном старте (включается переменной CRYPTO_STARTUP_REPORT=1).
+
+    Время импорта каждого модуля меряется через обертку загрузчиков в
+    sys.meta_path — так отчет работает и в сборке PyInstaller, где
+    -X importtime недоступен. Собственное время модуля — без вложенных
+    импортов. Этапы запуска отмечаются mark() относительно install().
+    """
+    TOP_IMPORTS = 15
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = time.time()  # Абсолютное время старта: по нему бенчмарк сборки считает время до main
+        self.marks = []  # (название этапа, мс от старта)
+        self.imports = {}  # модуль -> [всего мс, собственное мс]
+        self._stack = []  # [модуль, начало, время вложенных импортов]
+        self._main_thread_id = threading.get_ident()
+        self._finder = _ImportTimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def _begin_import(self, name):
+        if threading.get_ident() != self._main_thread_id:
+            return
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _end_import(self, name):
+        if threading.get_ident() != self._main_thread_id or not self._stack or self._stack[-1][0] != name:
+            return
+        _, begun, children_ms = self._stack.pop()
+        total_ms = (time.perf_counter() - begun) * 1000
+        self.imports[name] = [total_ms, total_ms - children_ms]
+        if self._stack:
+            self._stack[-1][2] += total_ms
+
+    def mark(self, name: str):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        self.marks.append((name, elapsed_ms))
+        return elapsed_ms
+
+    def stop_import_timing(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def to_dict(self) -> dict:
+        return {
+            'started_at': self.started_at,
+            'marks': [{'name': name, 'ms': elapsed_ms} for name, elapsed_ms in self.marks],
+            'imports': {name: {'total_ms': total_ms, 'self_ms': self_ms}
+                        for name, (total_ms, self_ms) in self.imports.items()},
+        }
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def format(self) -> str:
+        lines = ["Отчет о запуске (мс от старта):"]
+        lines += [f"  {elapsed_ms:9.1f}  {name}" for name, elapsed_ms in self.marks]
+        top_level = {}
+        for name, (total_ms, _) in self.imports.items():
+            if '.' not in name:
+                top_level[name] = total_ms
+        lines.append(f"Импорты верхнего уровня (всего {sum(top_level.values()):.1f} мс):")
+        for name, total_ms in sorted(top_level.items(), key=lambda x: -x[1])[:self.TOP_IMPORTS]:
+            lines.append(f"  {total_ms:9.1f}  {name}")
+        lines.append("Самые долгие модули (собственное время):")
+        for name, (_, self_ms) in sorted(self.imports.items(), key=lambda x: -x[1][1])[:self.TOP_IMPORTS]:
+            lines.append(f"  {self_ms:9.1f}  {name}")
+        return "\n".join(lines)
+
+
+_report = None
+
+
+def install_startup_report():
+    """Начинает замер импортов и этапов запуска, если включен CRYPTO_STARTUP_REPORT."""
+    global _report
+    if _report is None and STARTUP_REPORT_ENABLED:
+        _report = StartupReport()
+    return _report
+
+
+def get_startup_report():
+    """Возвращает отчет о запуске или None, если он выключен."""
+    return _report
@@ -0,0 +1,117 @@
+# src/core/ticker_cache.py
+import threading
+import time
+
+
+class TickerCache:
+    """
+    Последние тикеры по символу, общие для всех экранов.
+
+    MEXC на запрос нескольких символов отдает тикеры всех пар сразу, поэтому
+    MexcService.fetch_tickers кладет сюда весь ответ. Цены для строк, которые
+    стали видны после поиска или сортировки, берутся из кэша без нового запроса.
+    Пишется из потоков воркеров, читается из GUI-потока. Подписчики (add_listener)
+    получают каждую порцию тикеров в потоке, который ее записал.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tickers = {}  # символ -> {'symbol', 'last_price', 'timestamp', 'bid', 'ask', 'volume', 'change_pct'}
+        self.updated_at = {}  # символ -> time.time() получения
+        self.version = 0
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """callback(tickers: dict) после каждого update."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def clear(self):
+        with self._lock:
+            self.tickers = {}
+            self.updated_at = {}
+            self.version += 1
+
+    def update(self, tickers: dict):
+        now = time.time()
+        with self._lock:
+            self.tickers.update(tickers)
+            for symbol in tickers:
+                self.updated_at[symbol] = now
+            self.version += 1
+        for callback in list(self._listeners):
+            try:
+                callback(tickers)
+            except Exception as e:
+                print(f"TickerCache: listener failed: {e}")
+
+    def get(self, symbol: str, max_age_sec: float = None):
+        """Тикер символа или None, если его нет или он старше max_age_sec."""
+        with self._lock:
+            ticker = self.tickers.get(symbol)
+            if ticker is None:
+                return None
+            if max_age_sec is not None and time.time() - self.updated_at[symbol] > max_age_sec:
+                return None
+            return ticker
+
+    def missing(self, symbols: list, max_age_sec: float) -> list:
+        """Символы, для которых в кэше нет тикера моложе max_age_sec."""
+        now = time.time()
+        with self._lock:
+            return [symbol for symbol in symbols
+                    if symbol not in self.tickers or now - self.updated_at[symbol] > max_age_sec]
+
+
+class ConsolidatedTickerTable:
+    """
+    Сводные котировки по нескольким площадкам: лучший bid и лучший ask символа.
+
+    Каждая площадка обновляет свои котировки (update), лучшие цены считаются
+    при чтении (best) только по котировкам моложе max_age_sec — отставшая или
+    упавшая площадка не "держит" устаревшую лучшую цену.
+    """
+    MAX_QUOTE_AGE_SEC = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.quotes = {}  # символ -> {площадка: (bid, ask, last, time.time() получения)}
+
+    def update(self, venue_id: str, tickers: dict):
+        now = time.time()
+        with self._lock:
+            for symbol, ticker in tickers.items():
+                self.quotes.setdefault(symbol, {})[venue_id] = (
+                    ticker.get('bid'), ticker.get('ask'), ticker.get('last_price'), now
+                )
+
+    def remove_venue(self, venue_id: str):
+        with self._lock:
+            for venue_quotes in self.quotes.values():
+                venue_quotes.pop(venue_id, None)
+
+    def best(self, symbol: str, max_age_sec: float = None):
+        """
+        Returns:
+            dict | None: {'best_bid', 'best_bid_venue', 'best_ask', 'best_ask_venue', 'venues'}
+        """
+        max_age_sec = self.MAX_QUOTE_AGE_SEC if max_age_sec is None else max_age_sec
+        now = time.time()
+        best_bid = best_ask = best_bid_venue = best_ask_venue = None
+        venues = 0
+        with self._lock:
+            for venue_id, (bid, ask, _, received_at) in self.quotes.get(symbol, {}).items():
+                if now - received_at > max_age_sec:
+                    continue
+                venues += 1
+                if bid and (best_bid is None or bid > best_bid):
+                    best_bid, best_bid_venue = bid, venue_id
+                if ask and (best_ask is None or ask < best_ask):
+                    best_ask, best_ask_venue = ask, venue_id
+        if not venues:
+            return None
+        return {'best_bid': best_bid, 'best_bid_venue': best_bid_venue,
+                'best_ask': best_ask, 'best_ask_venue': best_ask_venue, 'venues': venues}
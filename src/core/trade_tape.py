@@ -0,0 +1,196 @@
+# src/core/trade_tape.py
+from array import array
+from collections import Counter
+
+
+class TradeRingBuffer:
+    """
+    Кольцевой буфер сделок фиксированного размера.
+
+    Записи хранятся в колонках array (timestamp, цена, объем, сторона), поэтому
+    память выделяется один раз и не растет при всплесках активности:
+    новые сделки просто перезаписывают самые старые.
+    """
+
+    def __init__(self, capacity: int = 2000):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.prices = array('d', bytes(8 * capacity))
+        self.amounts = array('d', bytes(8 * capacity))
+        self.sides = array('b', bytes(capacity))  # 1 — покупка, -1 — продажа
+        self._head = 0  # индекс следующей записи
+        self.count = 0
+
+    def clear(self):
+        self._head = 0
+        self.count = 0
+
+    def append(self, timestamp: float, price: float, amount: float, is_buy: bool):
+        i = self._head
+        self.timestamps[i] = timestamp
+        self.prices[i] = price
+        self.amounts[i] = amount
+        self.sides[i] = 1 if is_buy else -1
+        self._head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def latest(self, n: int):
+        # Последние n сделок от новых к старым: [(timestamp, price, amount, is_buy), ...]
+        n = min(n, self.count)
+        result = []
+        i = self._head
+        for _ in range(n):
+            i = (i - 1) % self.capacity
+            result.append((self.timestamps[i], self.prices[i], self.amounts[i], self.sides[i] > 0))
+        return result
+
+    def __len__(self):
+        return self.count
+
+
+class VolumeBuckets:
+    """
+    Скользящее окно объемов по корзинам фиксированной длины (например, 60 x 1с).
+
+    Корзины образуют кольцо; при переходе к новой корзине устаревшие
+    обнуляются, а суммы по окну поддерживаются инкрементально,
+    так что объем и дисбаланс покупок/продаж читаются за O(1).
+    """
+
+    def __init__(self, bucket_ms: int, num_buckets: int):
+        self.bucket_ms = bucket_ms
+        self.num_buckets = num_buckets
+        self.buy_volume = array('d', bytes(8 * num_buckets))
+        self.sell_volume = array('d', bytes(8 * num_buckets))
+        self.current_bucket = None  # номер текущей корзины (timestamp // bucket_ms)
+        self.total_buy = 0.0
+        self.total_sell = 0.0
+
+    def clear(self):
+        for i in range(self.num_buckets):
+            self.buy_volume[i] = 0.0
+            self.sell_volume[i] = 0.0
+        self.current_bucket = None
+        self.total_buy = 0.0
+        self.total_sell = 0.0
+
+    def _evict(self, slot: int):
+        self.total_buy -= self.buy_volume[slot]
+        self.total_sell -= self.sell_volume[slot]
+        self.buy_volume[slot] = 0.0
+        self.sell_volume[slot] = 0.0
+
+    def advance_to(self, timestamp: float):
+        bucket = int(timestamp // self.bucket_ms)
+        if self.current_bucket is None:
+            self.current_bucket = bucket
+            return
+        if bucket <= self.current_bucket:
+            return
+        steps = bucket - self.current_bucket
+        if steps >= self.num_buckets:
+            self.clear()
+        else:
+            for b in range(self.current_bucket + 1, bucket + 1):
+                self._evict(b % self.num_buckets)
+        self.current_bucket = bucket
+
+    def add(self, timestamp: float, quote_volume: float, is_buy: bool):
+        self.advance_to(timestamp)
+        bucket = int(timestamp // self.bucket_ms)
+        if bucket <= self.current_bucket - self.num_buckets:
+            return  # Сделка старше окна
+        slot = bucket % self.num_buckets
+        if is_buy:
+            self.buy_volume[slot] += quote_volume
+            self.total_buy += quote_volume
+        else:
+            self.sell_volume[slot] += quote_volume
+            self.total_sell += quote_volume
+
+    def current_volume(self):
+        # Объем текущей (последней) корзины
+        if self.current_bucket is None:
+            return 0.0
+        slot = self.current_bucket % self.num_buckets
+        return self.buy_volume[slot] + self.sell_volume[slot]
+
+    def window_volume(self):
+        return self.total_buy + self.total_sell
+
+    def imbalance(self):
+        # От -1 (только продажи) до 1 (только покупки)
+        total = self.total_buy + self.total_sell
+        if total <= 0:
+            return 0.0
+        return (self.total_buy - self.total_sell) / total
+
+
+class TradeTape:
+    """Лента сделок одной пары: кольцевой буфер + агрегаты 1с/1м."""
+
+    def __init__(self, symbol: str = None, capacity: int = 2000):
+        self.symbol = symbol
+        self.buffer = TradeRingBuffer(capacity)
+        self.buckets_1s = VolumeBuckets(1000, 60)  # последняя минута по секундам
+        self.buckets_1m = VolumeBuckets(60 * 1000, 60)  # последний час по минутам
+        self.last_timestamp = None
+        self._seen_at_last_timestamp = Counter()  # ключ сделки (_dedup_key) -> сколько уже учтено
+
+    def reset(self, symbol: str = None):
+        self.symbol = symbol
+        self.buffer.clear()
+        self.buckets_1s.clear()
+        self.buckets_1m.clear()
+        self.last_timestamp = None
+        self._seen_at_last_timestamp = Counter()
+
+    @staticmethod
+    def _dedup_key(trade_id, price, amount, is_buy):
+        # Публичные сделки MEXC приходят из ccxt без id: одинаковые сделки одной миллисекунды различаем счетчиком
+        return trade_id if trade_id is not None else (price, amount, is_buy)
+
+    def add_trades(self, trades: list):
+        """
+        Добавляет сделки (от старых к новым), пропуская уже учтенные.
+        trades: [(trade_id, timestamp, price, amount, is_buy), ...]
+        Returns:
+            int: количество новых сделок
+        """
+        added = 0
+        batch_counts = Counter()  # ключ -> сколько раз встретился в этом ответе на последней метке времени
+        for trade_id, timestamp, price, amount, is_buy in trades:
+            if self.last_timestamp is not None and timestamp < self.last_timestamp:
+                continue
+            if timestamp != self.last_timestamp:
+                self.last_timestamp = timestamp
+                self._seen_at_last_timestamp = Counter()
+                batch_counts = Counter()
+            key = self._dedup_key(trade_id, price, amount, is_buy)
+            batch_counts[key] += 1
+            # Ответы перекрываются: первые seen повторов ключа уже учтены прошлым ответом
+            if batch_counts[key] <= self._seen_at_last_timestamp[key]:
+                continue
+            self._seen_at_last_timestamp[key] += 1
+
+            self.buffer.append(timestamp, price, amount, is_buy)
+            quote_volume = price * amount
+            self.buckets_1s.add(timestamp, quote_volume, is_buy)
+            self.buckets_1m.add(timestamp, quote_volume, is_buy)
+            added += 1
+        return added
+
+    def stats(self, now_ms: float = None):
+        # now_ms сдвигает окна вперед, чтобы в тихом рынке старые объемы не "зависали"
+        if now_ms is not None:
+            self.buckets_1s.advance_to(now_ms)
+            self.buckets_1m.advance_to(now_ms)
+        return {
+            'volume_1s': self.buckets_1s.current_volume(),
+            'volume_1m': self.buckets_1m.current_volume(),
+            'volume_60s': self.buckets_1s.window_volume(),
+            'volume_60m': self.buckets_1m.window_volume(),
+            'imbalance_60s': self.buckets_1s.imbalance(),
+            'imbalance_60m': self.buckets_1m.imbalance(),
+        }
@@ -0,0 +1,177 @@
+# src/core/ui_profiler.py
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QEvent, QTimer
+
+from ..config import UI_PROFILE_ENABLED, UI_PROFILE_STALL_MS, DATA_DIR
+
+# Имена типов событий для журнала (43 -> 'MetaCall')
+_EVENT_TYPE_NAMES = {
+    int(value): attr for attr, value in vars(QEvent).items() if isinstance(value, QEvent.Type)
+}
+
+
+class UiProfiler:
+    """
+    Профайлер главного потока Qt (включается переменной CRYPTO_UI_PROFILE=1).
+
+    Собирает время выполнения слотов (profiled_slot), обработки событий и
+    отрисовки по виджетам (ProfilingApplication.notify), а также задержку
+    цикла событий по "пульсу" QTimer. Всё, что дольше порога (16 мс — один
+    кадр при 60 Гц), попадает в скользящий журнал и в файл ui_profile.log;
+    для зависания цикла событий указывается самый долгий слот/событие с
+    предыдущего пульса.
+    """
+    HEARTBEAT_INTERVAL_MS = 50
+    MAX_LOG_ENTRIES = 500
+
+    def __init__(self, stall_threshold_ms: float = UI_PROFILE_STALL_MS, log_path: str = None):
+        self.stall_threshold_ms = stall_threshold_ms
+        self.log_path = log_path
+        self.stalls = deque(maxlen=self.MAX_LOG_ENTRIES)
+        self.stats = {}  # (kind, name) -> [count, total_ms, max_ms]
+        self.loop_lag_ms = 0.0
+        self.max_loop_lag_ms = 0.0
+        self._worst_since_tick = None  # (ms, kind, name) — кандидат в виновники зависания
+        self._heartbeat_timer = None
+        self._last_tick = None
+        self._log_file = None
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, elapsed_ms: float):
+        if threading.current_thread() is not threading.main_thread():
+            return  # Профилируем только главный поток
+        with self._lock:
+            stat = self.stats.get((kind, name))
+            if stat is None:
+                stat = self.stats[(kind, name)] = [0, 0.0, 0.0]
+            stat[0] += 1
+            stat[1] += elapsed_ms
+            stat[2] = max(stat[2], elapsed_ms)
+        if self._worst_since_tick is None or elapsed_ms > self._worst_since_tick[0]:
+            self._worst_since_tick = (elapsed_ms, kind, name)
+        if elapsed_ms >= self.stall_threshold_ms:
+            self._log_stall(kind, name, elapsed_ms)
+
+    def _log_stall(self, kind: str, name: str, elapsed_ms: float, culprit: str = None):
+        entry = {'ts': time.time(), 'kind': kind, 'name': name, 'ms': elapsed_ms, 'culprit': culprit}
+        self.stalls.append(entry)
+        if self.log_path:
+            try:
+                if self._log_file is None:
+                    os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                    self._log_file = open(self.log_path, 'a', encoding='utf-8')
+                line = f"{time.strftime('%H:%M:%S')} {kind:<5} {elapsed_ms:8.1f} ms  {name}"
+                if culprit:
+                    line += f"  <- {culprit}"
+                self._log_file.write(line + "\n")
+                self._log_file.flush()
+            except OSError as e:
+                print(f"UiProfiler: cannot write log {self.log_path}: {e}")
+                self.log_path = None
+
+    def start_heartbeat(self, parent=None):
+        if self._heartbeat_timer is not None:
+            return
+        self._heartbeat_timer = QTimer(parent)
+        self._heartbeat_timer.timeout.connect(self._on_heartbeat)
+        self._last_tick = time.perf_counter()
+        self._heartbeat_timer.start(self.HEARTBEAT_INTERVAL_MS)
+
+    def _on_heartbeat(self):
+        # Задержка цикла событий: насколько позже ожидаемого сработал таймер
+        now = time.perf_counter()
+        lag_ms = max((now - self._last_tick) * 1000 - self.HEARTBEAT_INTERVAL_MS, 0.0)
+        self._last_tick = now
+        self.loop_lag_ms = lag_ms
+        self.max_loop_lag_ms = max(self.max_loop_lag_ms, lag_ms)
+        if lag_ms >= self.stall_threshold_ms:
+            culprit = None
+            if self._worst_since_tick:
+                worst_ms, kind, name = self._worst_since_tick
+                culprit = f"{kind} {name} ({worst_ms:.1f} ms)"
+            self._log_stall('loop', "event loop lag", lag_ms, culprit)
+        self._worst_since_tick = None
+
+    def top(self, n: int = 10):
+        """Returns: list (kind, name, count, total_ms, max_ms) по убыванию суммарного времени."""
+        with self._lock:
+            rows = [(kind, name, s[0], s[1], s[2]) for (kind, name), s in self.stats.items()]
+        rows.sort(key=lambda r: -r[3])
+        return rows[:n]
+
+    def close(self):
+        if self._heartbeat_timer is not None:
+            self._heartbeat_timer.stop()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+
+_profiler = None
+
+
+def get_profiler():
+    """Возвращает общий профайлер или None, если профилирование выключено."""
+    global _profiler
+    if _profiler is None and UI_PROFILE_ENABLED:
+        _profiler = UiProfiler(log_path=os.path.join(DATA_DIR, 'ui_profile.log'))
+    return _profiler
+
+
+def profiled_slot(name: str = None):
+    """
+    Декоратор слота главного потока: замеряет время выполнения.
+    При выключенном профилировании возвращает функцию без обертки.
+    """
+    def decorator(func):
+        if not UI_PROFILE_ENABLED:
+            return func
+        slot_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler = get_profiler()
+                if profiler:
+                    profiler.record('slot', slot_name, (time.perf_counter() - started) * 1000)
+        return wrapper
+    return decorator
+
+
+class ProfilingApplication(QApplication):
+    """QApplication, замеряющий каждое событие верхнего уровня и отрисовку каждого виджета."""
+
+    def __init__(self, argv):
+        super().__init__(argv)
+        self._depth = 0
+        self._main_thread_id = threading.get_ident()
+
+    def notify(self, receiver, event):
+        profiler = get_profiler()
+        if profiler is None or threading.get_ident() != self._main_thread_id:
+            return super().notify(receiver, event)
+        event_type = event.type()
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            return super().notify(receiver, event)
+        finally:
+            self._depth -= 1
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if event_type == QEvent.Paint:
+                name = f"{type(receiver).__name__}#{receiver.objectName() or '-'}"
+                profiler.record('paint', name, elapsed_ms)
+            elif self._depth == 0 and elapsed_ms >= profiler.stall_threshold_ms:
+                # Долгие события верхнего уровня (таймеры, сигналы из потоков, ввод)
+                event_name = _EVENT_TYPE_NAMES.get(int(event_type), str(int(event_type)))
+                profiler.record('event', f"{type(receiver).__name__}#{receiver.objectName() or '-'}:{event_name}",
+                                elapsed_ms)
@@ -0,0 +1,90 @@
+# src/core/venues.py
+from concurrent.futures import ThreadPoolExecutor
+
+from .exchange_service import ExchangeService
+from .mexc_service import MexcService
+from .ticker_cache import ConsolidatedTickerTable
+
+# Площадки со своим подклассом сервиса; остальные работают через ExchangeService с exchange_id
+VENUE_SERVICES = {
+    'mexc': MexcService,
+}
+# Дополнительные options ccxt: без них binance/bybit/okx при загрузке рынков тянут и деривативы
+VENUE_OPTIONS = {
+    'binance': {'fetchMarkets': ['spot']},
+    'bybit': {'fetchMarkets': ['spot']},
+    'okx': {'fetchMarkets': ['spot']},
+}
+SUPPORTED_VENUES = ('mexc', 'binance', 'bybit', 'okx')
+
+
+def create_venue_service(venue_id: str, exchange_factory=None, **kwargs) -> ExchangeService:
+    """Сервис площадки по ее id (id биржи в ccxt)."""
+    service_class = VENUE_SERVICES.get(venue_id)
+    if service_class is not None:
+        return service_class(exchange_factory=exchange_factory, **kwargs)
+    return ExchangeService(exchange_factory=exchange_factory, exchange_id=venue_id,
+                           exchange_options=VENUE_OPTIONS.get(venue_id), **kwargs)
+
+
+class VenueHub:
+    """
+    Рыночные данные сразу с нескольких площадок.
+
+    Основная площадка — сервис, через который идет торговля; остальные дают
+    только котировки. У каждой площадки свой сервис (свой экземпляр ccxt и
+    rate limit) и свой пул потоков, поэтому медленная или ограниченная
+    площадка не задерживает запросы к другим. Тикеры всех площадок
+    сводятся в consolidated (лучший bid/ask по символу).
+    """
+    POOL_WORKERS_PER_VENUE = 2
+    FETCH_TIMEOUT_SEC = 15
+
+    def __init__(self, primary_service: ExchangeService, venue_ids=(), exchange_factory=None):
+        self.primary_venue = primary_service.exchange_id
+        self.services = {self.primary_venue: primary_service}
+        for venue_id in venue_ids:
+            if venue_id not in self.services:
+                self.services[venue_id] = create_venue_service(venue_id, exchange_factory)
+        self.pools = {
+            venue_id: ThreadPoolExecutor(max_workers=self.POOL_WORKERS_PER_VENUE,
+                                         thread_name_prefix=f"venue-{venue_id}")
+            for venue_id in self.services
+        }
+        self.consolidated = ConsolidatedTickerTable()
+        self.venue_errors = {}  # площадка -> последняя ошибка (None после успешного ответа)
+
+    def is_multi_venue(self) -> bool:
+        return len(self.services) > 1
+
+    def submit(self, venue_id: str, method_name: str, *args, **kwargs):
+        """Вызов метода сервиса площадки в ее пуле. Returns: concurrent.futures.Future."""
+        return self.pools[venue_id].submit(getattr(self.services[venue_id], method_name), *args, **kwargs)
+
+    def fetch_tickers(self, symbols: list = None):
+        """
+        Тикеры со всех площадок параллельно; ошибка дополнительной площадки не мешает основной.
+        Returns:
+            tuple: (dict тикеров основной площадки с полями best_* по всем площадкам, str ошибки или None)
+        """
+        futures = {venue_id: self.submit(venue_id, 'fetch_tickers', symbols) for venue_id in self.services}
+        primary_tickers, primary_error = None, None
+        for venue_id, future in futures.items():
+            try:
+                tickers, error_msg = future.result(timeout=self.FETCH_TIMEOUT_SEC)
+            except Exception as e:
+                tickers, error_msg = None, f"{venue_id}: {e}"
+            self.venue_errors[venue_id] = error_msg
+            if tickers:
+                self.consolidated.update(venue_id, tickers)
+            if venue_id == self.primary_venue:
+                primary_tickers, primary_error = tickers, error_msg
+        if primary_tickers:
+            # Копии: словари основной площадки лежат и в ее ticker_cache
+            primary_tickers = {symbol: dict(ticker, **(self.consolidated.best(symbol) or {}))
+                               for symbol, ticker in primary_tickers.items()}
+        return primary_tickers, primary_error
+
+    def shutdown(self):
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,12 @@
 # src/main_app.py
 import sys
 import os
+
+# Замер импортов включаем до загрузки Qt и остальных модулей (CRYPTO_STARTUP_REPORT=1)
+from src.config import CLIENT_APP_VERSION, BACKEND_BASE_URL, UI_PROFILE_ENABLED  # Импортируем версию клиента
+from src.core.startup_report import install_startup_report
+startup_report = install_startup_report()
+
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtGui import QFont
 
@@ -12,7 +18,7 @@ from PyQt5.QtGui import QFont
 #         sys.path.insert(0, project_root)
 
 from src.main_window import MainWindow
-from src.config import CLIENT_APP_VERSION, BACKEND_BASE_URL  # Импортируем версию клиента
+from src.core.ui_profiler import ProfilingApplication
 from src.core.auth_service import AuthService  # Импортируем сервис
 
 
@@ -36,7 +42,9 @@ def run_version_check():
 
 
 def main():
-    app = QApplication(sys.argv)
+    # В режиме профилирования QApplication замеряет обработку каждого события и отрисовку виджетов
+    app = ProfilingApplication(sys.argv) if UI_PROFILE_ENABLED else QApplication(sys.argv)
+    if startup_report: startup_report.mark("импорты и QApplication")
 
     # Сначала выполняем проверку версии
     if not run_version_check():
@@ -45,11 +53,13 @@ def main():
 
     # Если проверка прошла, продолжаем запуск приложения
     print("Client version OK. Starting main application...")
+    if startup_report: startup_report.mark("проверка версии")
 
     # default_font = QFont("Segoe UI", 10)
     # app.setFont(default_font)
 
     main_window = MainWindow()
+    if startup_report: startup_report.mark("MainWindow создан")
     main_window.show()
 
     sys.exit(app.exec_())
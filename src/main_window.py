@@ -1,18 +1,64 @@
 # src/main_window.py
-from PyQt5.QtWidgets import QMainWindow, QStackedWidget, QMessageBox, QWidget
-from PyQt5.QtCore import pyqtSlot
-from src.config import BACKEND_BASE_URL
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QStackedWidget, QMessageBox, QWidget, QShortcut, QSystemTrayIcon, QStyle
+)
+from PyQt5.QtCore import pyqtSlot, pyqtSignal, QTimer, QThread
+from PyQt5.QtGui import QKeySequence
+import os
+import time
+from src.config import BACKEND_BASE_URL, DATA_DIR, BACKFILL_SYMBOLS, BACKFILL_TIMEFRAMES, BACKFILL_MAX_CANDLES
+from src.config import STARTUP_REPORT_EXIT, MARKET_DATA_VENUES
+from src.config import (
+    FAKE_EXCHANGE, FAKE_EXCHANGE_LATENCY_MS, FAKE_EXCHANGE_JITTER_MS, FAKE_EXCHANGE_ERROR_RATE,
+    FAKE_EXCHANGE_RATE_LIMIT
+)
 from .core.auth_service import AuthService
 from .core.mexc_service import MexcService
+from .core.venues import VenueHub
+from .core.spread_scanner import SpreadScannerWorker
+from .core.screener import MarketScreener, ScreenerFetchWorker
+from .core.alerts import AlertEngine, AlertMonitor, AlertTickersWorker
+from .core.candle_archive import CandleArchive
+from .core.ohlcv_backfill import OhlcvBackfillScheduler, OhlcvBackfillWorker
+from .core.refresh_scheduler import RefreshScheduler
 from .widgets.login_widget import LoginWidget
 from .widgets.register_widget import RegisterWidget
 from .widgets.coin_list_widget import CoinListWidget
 from .widgets.trade_widget import TradeWidget
+from .ui.diagnostics_ui import DiagnosticsDialog
+from .ui.spread_scanner_ui import SpreadScannerDialog
+from .ui.screener_ui import ScreenerDialog
+from .ui.alerts_ui import AlertsDialog, describe_alert
+from .ui.profiler_overlay_ui import ProfilerOverlay
+from .core.ui_profiler import get_profiler
+from .core.startup_report import get_startup_report
 
 # --- Цветовая палитра (для фона MainWindow) ---
 DARK_BG_COLOR = "#282c34" 
 
+class ExchangeWarmUpWorker(QThread):
+    """Создает экземпляр биржи (импорт ccxt) в фоне, пока пользователь видит экран логина."""
+    warm_up_finished = pyqtSignal(bool)
+
+    def __init__(self, mexc_service, parent=None):
+        super().__init__(parent)
+        self.mexc_service = mexc_service
+
+    def run(self):
+        try:
+            self.warm_up_finished.emit(self.mexc_service.warm_up())
+        except Exception as e:
+            print(f"ExchangeWarmUpWorker: {e}")
+            self.warm_up_finished.emit(False)
+
+
 class MainWindow(QMainWindow):
+    DIAGNOSTICS_REFRESH_INTERVAL_MS = 1000
+    PROFILER_OVERLAY_INTERVAL_MS = 500
+    SCREENER_REFRESH_INTERVAL_MS = 5000
+    ALERTS_REFRESH_INTERVAL_MS = 10000
+    ALERT_MESSAGE_MS = 10000
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Крипто-Терминал")
@@ -21,7 +67,11 @@ class MainWindow(QMainWindow):
 
         # Сервисы
         self.auth_service = AuthService(BACKEND_BASE_URL)
-        self.mexc_service = MexcService() # Инициализируем без ключей для публичных данных
+        # Инициализируем без ключей для публичных данных; CRYPTO_FAKE_EXCHANGE подставляет офлайн-биржу
+        exchange_factory = self._fake_exchange_factory()
+        self.mexc_service = MexcService(exchange_factory=exchange_factory)
+        # Котировки с дополнительных площадок (CRYPTO_MARKET_DATA_VENUES) для сводного bid/ask
+        self.venue_hub = VenueHub(self.mexc_service, MARKET_DATA_VENUES, exchange_factory=exchange_factory)
 
         # Данные текущего пользователя (после логина)
         self.current_user_login = None
@@ -32,11 +82,15 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget(self)
         self.setCentralWidget(self.stacked_widget)
 
+        # Общий планировщик опросов биржи для всех экранов
+        self.refresh_scheduler = RefreshScheduler(self.mexc_service.metrics, self)
+
         # Создаем виджеты для каждого экрана
         self.login_widget = LoginWidget(self.auth_service, self)
         self.register_widget = RegisterWidget(self.auth_service, self)
-        self.coin_list_widget = CoinListWidget(self.mexc_service, self) # Передаем MexcService
-        self.trade_widget = TradeWidget(self.mexc_service, self)       # Передаем MexcService
+        self.coin_list_widget = CoinListWidget(self.mexc_service, self, scheduler=self.refresh_scheduler,
+                                               venue_hub=self.venue_hub)
+        self.trade_widget = TradeWidget(self.mexc_service, self, scheduler=self.refresh_scheduler)
 
         # Добавляем виджеты в QStackedWidget
         self.stacked_widget.addWidget(self.login_widget)    # index 0
@@ -46,9 +100,117 @@ class MainWindow(QMainWindow):
 
         self._connect_widget_signals()
 
+        # Архив свечей и фоновая догрузка истории (публичные данные, ключи не нужны).
+        # Догрузка стартует после прогрева биржи, чтобы не отнимать время у первого показа окна
+        self.candle_archive = CandleArchive(os.path.join(DATA_DIR, 'candles.sqlite3'))
+        self.backfill_worker = None
+        self.warm_up_worker = None
+        self._warm_up_started = False
+
+        # Панель диагностики запросов к бирже (F12)
+        self.diagnostics_dialog = None
+        self.diagnostics_refresh_timer = QTimer(self)
+        self.diagnostics_refresh_timer.timeout.connect(self._refresh_diagnostics)
+        self.diagnostics_shortcut = QShortcut(QKeySequence("F12"), self)
+        self.diagnostics_shortcut.activated.connect(self.show_diagnostics)
+
+        # Сканер спредов между площадками и котируемыми валютами (F9); опрос идет, пока окно сканера открыто
+        self.spread_scanner_dialog = None
+        self.spread_scanner_worker = None
+        self.stopping_spread_scanner_workers = []  # Остановленные, но еще не завершившиеся воркеры
+        self.spread_scanner_shortcut = QShortcut(QKeySequence("F9"), self)
+        self.spread_scanner_shortcut.activated.connect(self.show_spread_scanner)
+
+        # Скринер по всем USDT-парам (F10); тикеры обновляются, пока окно скринера видно
+        self.screener = MarketScreener()
+        self.screener_dialog = None
+        self.screener_fetch_worker = None
+        self.screener_error = None
+        self.screener_job = self.refresh_scheduler.add_job(
+            'screener.tickers', self._request_screener_update, symbol=lambda: None  # Весь рынок
+        )
+        self.screener_shortcut = QShortcut(QKeySequence("F10"), self)
+        self.screener_shortcut.activated.connect(self.show_screener)
+
+        # Оповещения о цене (F8): проверяются на каждом ответе fetch_tickers через подписку на ticker_cache;
+        # пары с активными оповещениями опрашиваются и в фоне (опрос стартует после прогрева биржи)
+        self.alert_engine = AlertEngine(os.path.join(DATA_DIR, 'alerts.json'))
+        _, alerts_error = self.alert_engine.load()
+        if alerts_error:
+            print(f"MainWindow: {alerts_error}")
+        self.alert_monitor = AlertMonitor(self.alert_engine, self)
+        self.alert_monitor.alerts_triggered.connect(self._handle_alerts_triggered)
+        self.mexc_service.ticker_cache.add_listener(self.alert_monitor.handle_tickers)
+        self.alerts_dialog = None
+        self.alert_tickers_worker = None
+        self.alert_tray_icon = None
+        self.alerts_job = self.refresh_scheduler.add_job('alerts.tickers', self._request_alert_prices, background=True)
+        self.alerts_shortcut = QShortcut(QKeySequence("F8"), self)
+        self.alerts_shortcut.activated.connect(self.show_alerts)
+
+        # Профилирование UI (только при CRYPTO_UI_PROFILE=1)
+        self.ui_profiler = get_profiler()
+        self.profiler_overlay = None
+        if self.ui_profiler:
+            self.ui_profiler.start_heartbeat(self)
+            self.profiler_overlay = ProfilerOverlay(self)
+            self.profiler_overlay_timer = QTimer(self)
+            self.profiler_overlay_timer.timeout.connect(self._refresh_profiler_overlay)
+            self.profiler_overlay_timer.start(self.PROFILER_OVERLAY_INTERVAL_MS)
+
         # По умолчанию показываем экран логина
         self.show_login_screen()
 
+    @staticmethod
+    def _fake_exchange_factory():
+        # CRYPTO_FAKE_EXCHANGE: офлайн-биржа для нагрузочных прогонов и работы без сети
+        if not FAKE_EXCHANGE:
+            return None
+        from .core.fake_exchange import generate_fixture, load_fixture, make_fake_exchange_factory
+        fixture = generate_fixture() if FAKE_EXCHANGE == 'synthetic' else load_fixture(FAKE_EXCHANGE)
+        print(f"MainWindow: using fake exchange ({FAKE_EXCHANGE}, {len(fixture['markets'])} markets)")
+        return make_fake_exchange_factory(
+            fixture, latency_ms=FAKE_EXCHANGE_LATENCY_MS, jitter_ms=FAKE_EXCHANGE_JITTER_MS,
+            error_rate=FAKE_EXCHANGE_ERROR_RATE, rate_limit_per_sec=FAKE_EXCHANGE_RATE_LIMIT
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._warm_up_started:
+            self._warm_up_started = True
+            # Окно уже на экране: биржу создаем в фоне после первой отрисовки
+            QTimer.singleShot(0, self.start_exchange_warm_up)
+
+    def start_exchange_warm_up(self):
+        report = get_startup_report()
+        if report:
+            report.mark("окно показано")
+        self.warm_up_worker = ExchangeWarmUpWorker(self.mexc_service, self)
+        self.warm_up_worker.warm_up_finished.connect(self._handle_exchange_warmed_up)
+        self.warm_up_worker.finished.connect(self._on_warm_up_worker_finished)
+        self.warm_up_worker.start()
+
+    @pyqtSlot(bool)
+    def _handle_exchange_warmed_up(self, ready):
+        report = get_startup_report()
+        if report:
+            report.mark("биржа готова" if ready else "биржа не создана")
+            report.stop_import_timing()
+            print(report.format())
+            # Файл нужен и в оконной сборке без консоли
+            os.makedirs(DATA_DIR, exist_ok=True)
+            report.save(os.path.join(DATA_DIR, 'startup_report.json'))
+            if STARTUP_REPORT_EXIT:
+                QTimer.singleShot(0, self.close)
+                return
+        self.start_ohlcv_backfill()
+        self._update_alerts_job()
+
+    def _on_warm_up_worker_finished(self):
+        if self.warm_up_worker:
+            self.warm_up_worker.deleteLater()
+            self.warm_up_worker = None
+
     def _connect_widget_signals(self):
         # Сигналы от LoginWidget
         self.login_widget.login_successful.connect(self.handle_login_success)
@@ -66,6 +228,261 @@ class MainWindow(QMainWindow):
         self.trade_widget.navigate_back.connect(self.show_coin_list_screen)
 
 
+    def start_ohlcv_backfill(self):
+        if self.backfill_worker and self.backfill_worker.isRunning(): return
+        if not BACKFILL_SYMBOLS or not BACKFILL_TIMEFRAMES: return
+        scheduler = OhlcvBackfillScheduler(
+            self.mexc_service, self.candle_archive,
+            BACKFILL_SYMBOLS, BACKFILL_TIMEFRAMES, max_candles=BACKFILL_MAX_CANDLES
+        )
+        self.backfill_worker = OhlcvBackfillWorker(scheduler, self)
+        self.backfill_worker.backfill_progress.connect(self._handle_backfill_progress)
+        self.backfill_worker.backfill_finished.connect(self._handle_backfill_finished)
+        self.backfill_worker.finished.connect(self._on_backfill_worker_finished)
+        self.backfill_worker.start()
+
+    @pyqtSlot(str, str, object, object)
+    def _handle_backfill_progress(self, symbol, timeframe, progress, error_message):
+        if error_message:
+            print(f"Backfill {symbol} {timeframe}: error: {error_message}")
+        elif progress and progress.get('complete'):
+            print(f"Backfill {symbol} {timeframe}: complete, {progress.get('candles_count')} candles")
+
+    @pyqtSlot(bool)
+    def _handle_backfill_finished(self, completed: bool):
+        print(f"Backfill worker finished (all tasks complete: {completed})")
+
+    def _on_backfill_worker_finished(self):
+        if self.backfill_worker and not self.backfill_worker.isRunning():
+            self.backfill_worker.deleteLater()
+            self.backfill_worker = None
+
+    def stop_ohlcv_backfill(self) -> bool:
+        """Returns: bool — воркер догрузки завершился (архив свечей больше не используется)."""
+        if self.backfill_worker and self.backfill_worker.isRunning():
+            self.backfill_worker.stop()
+            return self.backfill_worker.wait(2000)
+        return True
+
+    def show_diagnostics(self):
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+            self.diagnostics_dialog.export_requested.connect(self._export_diagnostics)
+            self.diagnostics_dialog.reset_requested.connect(self._reset_diagnostics)
+            self.diagnostics_dialog.finished.connect(lambda _: self.diagnostics_refresh_timer.stop())
+        self._refresh_diagnostics()
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+        self.diagnostics_refresh_timer.start(self.DIAGNOSTICS_REFRESH_INTERVAL_MS)
+
+    def show_spread_scanner(self):
+        if self.spread_scanner_dialog is None:
+            self.spread_scanner_dialog = SpreadScannerDialog(self)
+            self.spread_scanner_dialog.finished.connect(lambda _: self.stop_spread_scanner())
+        self.spread_scanner_dialog.show()
+        self.spread_scanner_dialog.raise_()
+        if self.spread_scanner_worker is None:
+            self.spread_scanner_worker = SpreadScannerWorker(self.venue_hub, parent=self)
+            self.spread_scanner_worker.scan_updated.connect(self._handle_spread_scan_updated)
+            worker = self.spread_scanner_worker
+            worker.finished.connect(lambda: self._on_spread_scanner_worker_finished(worker))
+            worker.start()
+
+    @pyqtSlot(object, object)
+    def _handle_spread_scan_updated(self, entries, stats):
+        if self.spread_scanner_dialog is None or not self.spread_scanner_dialog.isVisible():
+            return
+        self.spread_scanner_dialog.set_spreads(entries)
+        status = (f"Площадок: {stats['venues']}, тикеров: {stats['tickers']}, активов: {stats['assets']}, "
+                  f"пересчет индекса: {stats['update_ms']:.0f} мс")
+        if 'cycle_ms' in stats:
+            status += f", цикл: {stats['cycle_ms']:.0f} мс"
+        if stats['errors']:
+            status += "\nОшибки: " + "; ".join(f"{venue}: {error}" for venue, error in stats['errors'].items())
+        self.spread_scanner_dialog.set_status(status)
+
+    def stop_spread_scanner(self):
+        # Воркер может еще дождаться ответа площадки; повторный F9 сразу запускает новый
+        worker = self.spread_scanner_worker
+        if worker is None:
+            return
+        self.spread_scanner_worker = None
+        worker.scan_updated.disconnect(self._handle_spread_scan_updated)
+        worker.stop()
+        self.stopping_spread_scanner_workers.append(worker)
+
+    def _on_spread_scanner_worker_finished(self, worker):
+        if worker is self.spread_scanner_worker:
+            self.spread_scanner_worker = None
+        if worker in self.stopping_spread_scanner_workers:
+            self.stopping_spread_scanner_workers.remove(worker)
+        worker.deleteLater()
+
+    def show_screener(self):
+        if self.screener_dialog is None:
+            self.screener_dialog = ScreenerDialog(self)
+            self.screener_dialog.filters_changed.connect(self._refresh_screener_results)
+            self.screener_dialog.symbol_activated.connect(self._handle_screener_symbol_activated)
+            self.screener_dialog.finished.connect(lambda _: self.screener_job.stop())
+            self.screener_job.widget = self.screener_dialog
+        self.screener_dialog.show()
+        self.screener_dialog.raise_()
+        self._refresh_screener_results()
+        self._request_screener_update()
+        self.screener_job.start(self.SCREENER_REFRESH_INTERVAL_MS)
+
+    def _request_screener_update(self):
+        if self.screener_fetch_worker and self.screener_fetch_worker.isRunning():
+            return
+        self.screener_fetch_worker = ScreenerFetchWorker(self.mexc_service, self)
+        self.screener_fetch_worker.fetch_finished.connect(self._handle_screener_data)
+        self.screener_fetch_worker.finished.connect(self._on_screener_fetch_worker_finished)
+        self.screener_fetch_worker.start()
+
+    @pyqtSlot(object, object, object)
+    def _handle_screener_data(self, markets, tickers, error_msg):
+        self.screener_job.report(error_msg)
+        self.screener_error = error_msg
+        if markets:
+            self.screener.set_universe(markets)
+        if tickers:
+            self.screener.update_tickers(tickers)
+        self._refresh_screener_results()
+
+    def _on_screener_fetch_worker_finished(self):
+        if self.screener_fetch_worker and not self.screener_fetch_worker.isRunning():
+            self.screener_fetch_worker.deleteLater()
+            self.screener_fetch_worker = None
+
+    def _refresh_screener_results(self):
+        if self.screener_dialog is None or not self.screener_dialog.isVisible():
+            return
+        started = time.perf_counter()
+        indices = self.screener.evaluate(self.screener_dialog.filters(), sort_by='volume')
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.screener_dialog.set_results(self.screener.rows(indices[:ScreenerDialog.MAX_VISIBLE_ROWS]))
+        status = f"Пар: {len(self.screener)}, подходят: {len(indices)}, отбор: {elapsed_ms:.1f} мс"
+        if self.screener_error:
+            status += f"\nОшибка: {self.screener_error}"
+        self.screener_dialog.set_status(status)
+
+    @pyqtSlot(str)
+    def _handle_screener_symbol_activated(self, symbol: str):
+        market = self.screener.markets.get(symbol)
+        # Переход к торговле — только после входа (со списка монет или экрана торговли)
+        if market and self.stacked_widget.currentWidget() in (self.coin_list_widget, self.trade_widget):
+            self.show_trade_screen(market)
+
+    def show_alerts(self):
+        if self.alerts_dialog is None:
+            self.alerts_dialog = AlertsDialog(self)
+            self.alerts_dialog.add_requested.connect(self._handle_alert_add_requested)
+            self.alerts_dialog.remove_requested.connect(self._handle_alert_remove_requested)
+        if self.trade_widget.current_market_data:
+            self.alerts_dialog.set_symbol(self.trade_widget.current_market_data.get('symbol'))
+        self._refresh_alerts_dialog()
+        self.alerts_dialog.show()
+        self.alerts_dialog.raise_()
+
+    def _refresh_alerts_dialog(self):
+        if self.alerts_dialog is not None:
+            self.alerts_dialog.set_rules(self.alert_engine.list_rules())
+
+    @pyqtSlot(str, str, str, float)
+    def _handle_alert_add_requested(self, symbol, metric, direction, threshold):
+        rule, error_msg = self.alert_engine.add_rule(symbol, metric, direction, threshold)
+        if rule is None:
+            self.alerts_dialog.set_status(error_msg)
+            return
+        self.alerts_dialog.set_status(error_msg or f"Добавлено: {describe_alert(rule)}")
+        self._refresh_alerts_dialog()
+        self._update_alerts_job()
+        self._request_alert_prices()  # Условие может уже выполняться — проверяем сразу
+
+    @pyqtSlot(str)
+    def _handle_alert_remove_requested(self, rule_id):
+        removed, error_msg = self.alert_engine.remove_rule(rule_id)
+        if error_msg:
+            self.alerts_dialog.set_status(error_msg)
+        if removed:
+            self._refresh_alerts_dialog()
+            self._update_alerts_job()
+
+    def _update_alerts_job(self):
+        if not self.alert_engine.active_symbols():
+            self.alerts_job.stop()
+        elif not self.alerts_job.isActive():
+            self.alerts_job.start(self.ALERTS_REFRESH_INTERVAL_MS)
+
+    def _request_alert_prices(self):
+        if self.alert_tickers_worker and self.alert_tickers_worker.isRunning():
+            return
+        symbols = self.alert_engine.active_symbols()
+        if not symbols:
+            self.alerts_job.stop()
+            return
+        self.alert_tickers_worker = AlertTickersWorker(self.mexc_service, symbols, self)
+        self.alert_tickers_worker.fetch_finished.connect(self.alerts_job.report)
+        self.alert_tickers_worker.finished.connect(self._on_alert_tickers_worker_finished)
+        self.alert_tickers_worker.start()
+
+    def _on_alert_tickers_worker_finished(self):
+        if self.alert_tickers_worker and not self.alert_tickers_worker.isRunning():
+            self.alert_tickers_worker.deleteLater()
+            self.alert_tickers_worker = None
+
+    @pyqtSlot(object)
+    def _handle_alerts_triggered(self, rules):
+        lines = [f"{describe_alert(rule)} (сейчас {rule['triggered_value']:g})" for rule in rules]
+        message = "\n".join(lines)
+        print(f"Alerts triggered:\n{message}")
+        self._show_desktop_notification("Оповещение о цене", message)
+        if self.alerts_dialog is not None:
+            self.alerts_dialog.set_status(f"Сработало: {len(rules)}")
+        self._refresh_alerts_dialog()
+        self._update_alerts_job()
+
+    def _show_desktop_notification(self, title: str, message: str):
+        # Системное уведомление через значок в трее; без трея — только мигание окна на панели задач
+        if self.alert_tray_icon is None and QSystemTrayIcon.isSystemTrayAvailable():
+            self.alert_tray_icon = QSystemTrayIcon(self.style().standardIcon(QStyle.SP_MessageBoxInformation), self)
+            self.alert_tray_icon.setToolTip("Крипто-Терминал")
+            self.alert_tray_icon.activated.connect(lambda _: self.show_alerts())
+            self.alert_tray_icon.show()
+        if self.alert_tray_icon is not None:
+            self.alert_tray_icon.showMessage(title, message, QSystemTrayIcon.Information, self.ALERT_MESSAGE_MS)
+        QApplication.alert(self)
+
+    def _refresh_diagnostics(self):
+        if self.diagnostics_dialog is None:
+            return
+        self.diagnostics_dialog.set_metrics(self.mexc_service.metrics.snapshot())
+
+    def _export_diagnostics(self):
+        path = os.path.join(DATA_DIR, time.strftime("metrics_%Y%m%d_%H%M%S.json"))
+        try:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            self.mexc_service.metrics.export_json(path)
+            self.diagnostics_dialog.set_status(f"Сохранено: {path}")
+        except OSError as e:
+            self.diagnostics_dialog.set_status(f"Ошибка экспорта: {e}")
+
+    def _reset_diagnostics(self):
+        self.mexc_service.metrics.reset()
+        self._refresh_diagnostics()
+        self.diagnostics_dialog.set_status("Счетчики сброшены")
+
+    def _refresh_profiler_overlay(self):
+        profiler = self.ui_profiler
+        last_stall = profiler.stalls[-1] if profiler.stalls else None
+        self.profiler_overlay.set_stats(profiler.loop_lag_ms, profiler.max_loop_lag_ms, profiler.top(5),
+                                        last_stall, profiler.stall_threshold_ms)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.profiler_overlay:
+            self.profiler_overlay.reposition()
+
     def show_login_screen(self):
         print("Navigating to Login Screen")
         self.login_widget.ui.clear_input_fields() # Очищаем поля при переходе
@@ -110,8 +527,9 @@ class MainWindow(QMainWindow):
 
     def show_coin_list_screen(self):
         print("Navigating to Coin List Screen")
-        # Перед показом списка монет, мы можем захотеть обновить его данные
-        self.coin_list_widget.load_initial_markets_and_prices() # Загружаем/обновляем список и цены
+        # Экран торговли сохраняет данные пары; список показывается сразу и обновляет только устаревшее
+        self.trade_widget.suspend()
+        self.coin_list_widget.resume()
         self.stacked_widget.setCurrentWidget(self.coin_list_widget)
         self.setWindowTitle(f"Терминал - {self.current_user_login or 'Список монет'}")
 
@@ -119,6 +537,7 @@ class MainWindow(QMainWindow):
     def show_trade_screen(self, market_data: dict):
         pair_symbol = market_data.get('symbol', "N/A")
         print(f"Navigating to Trade Screen for: {pair_symbol}")
+        self.coin_list_widget.suspend()
         self.trade_widget.set_market_data(market_data) # Передаем данные о паре в TradeWidget
         self.stacked_widget.setCurrentWidget(self.trade_widget)
         self.setWindowTitle(f"Торговля: {pair_symbol} - {self.current_user_login or ''}")
@@ -131,6 +550,34 @@ class MainWindow(QMainWindow):
         # Останавливаем таймеры в дочерних виджетах перед закрытием
         self.coin_list_widget.stop_updates()
         self.trade_widget.stop_all_updates()
+        self.trade_widget.stop_order_workers()
+        self.trade_widget.stop_execution_scheduler()
+        backfill_stopped = self.stop_ohlcv_backfill()
+        self.stop_spread_scanner()
+        for worker in list(self.stopping_spread_scanner_workers):
+            worker.wait()  # Stop замечается за SpreadScannerWorker.STOP_POLL_SEC
+        self.screener_job.stop()
+        self.alerts_job.stop()
+        self.mexc_service.ticker_cache.remove_listener(self.alert_monitor.handle_tickers)
+        if self.alert_tickers_worker and self.alert_tickers_worker.isRunning():
+            self.alert_tickers_worker.wait(2000)
+        if self.alert_tray_icon is not None:
+            self.alert_tray_icon.hide()
+        if self.screener_fetch_worker and self.screener_fetch_worker.isRunning():
+            self.screener_fetch_worker.wait(2000)
+        self.venue_hub.shutdown()
+        if self.warm_up_worker and self.warm_up_worker.isRunning():
+            self.warm_up_worker.wait(2000)
+        self.diagnostics_refresh_timer.stop()
+        if self.ui_profiler:
+            self.profiler_overlay_timer.stop()
+            self.ui_profiler.close()
+        if backfill_stopped:
+            self.candle_archive.close()
+        else:
+            # Страница догрузки еще ждет ответа биржи и будет писать в архив:
+            # соединение SQLite закроется при выходе процесса
+            print("MainWindow: backfill still running, candle archive left open")
         print("MainWindow closing, timers in child widgets stopped.")
         super().closeEvent(event)
 
@@ -0,0 +1,156 @@
+# src/ui/alerts_ui.py
+import time
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QDoubleSpinBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+
+# Цветовая палитра
+DARK_BG_COLOR = "#282c34"
+PRIMARY_TEXT_COLOR = "#e8e8f0"
+SECONDARY_TEXT_COLOR = "#b0b0d0"
+ACCENT_COLOR = "#9b88c7"
+ACCENT_HOVER_COLOR = "#a995d1"
+PANEL_BG_COLOR = "rgba(45, 48, 56, 0.9)"
+INPUT_BG_COLOR = "rgba(30, 32, 40, 0.95)"
+BUY_COLOR = "#2ecc71"
+
+# (метрика AlertEngine, подпись)
+METRIC_CHOICES = (('price', "Цена"), ('change_pct', "Изм. 24ч, %"), ('spread_pct', "Спред, %"))
+DIRECTION_CHOICES = (('above', "выше или равно"), ('below', "ниже или равно"))
+ALERT_COLUMNS = ("Пара", "Условие", "Порог", "Статус")
+
+
+def describe_alert(rule: dict) -> str:
+    """Текст оповещения для уведомления и таблицы: 'BTC/USDT: Цена выше или равно 65000'."""
+    metric = dict(METRIC_CHOICES).get(rule['metric'], rule['metric'])
+    direction = dict(DIRECTION_CHOICES).get(rule['direction'], rule['direction'])
+    return f"{rule['symbol']}: {metric} {direction} {rule['threshold']:g}"
+
+
+class AlertsDialog(QDialog):
+    # (пара, метрика, направление, порог)
+    add_requested = pyqtSignal(str, str, str, float)
+    remove_requested = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("AlertsDialog")
+        self.setWindowTitle("Оповещения о цене")
+        self.setMinimumSize(640, 400)
+        self._rule_ids = []  # id правил по строкам таблицы
+        self._setup_ui()
+        self._apply_styles()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        form_layout = QHBoxLayout()
+        form_layout.setSpacing(8)
+        self.symbol_input = QLineEdit()
+        self.symbol_input.setPlaceholderText("BTC/USDT")
+        self.metric_combo = QComboBox()
+        for _, title in METRIC_CHOICES:
+            self.metric_combo.addItem(title)
+        self.direction_combo = QComboBox()
+        for _, title in DIRECTION_CHOICES:
+            self.direction_combo.addItem(title)
+        self.threshold_input = QDoubleSpinBox()
+        self.threshold_input.setRange(-1e12, 1e12)
+        self.threshold_input.setDecimals(8)
+        self.add_button = QPushButton("Добавить")
+        self.add_button.setObjectName("dialogButton")
+        self.add_button.setCursor(Qt.PointingHandCursor)
+        self.add_button.clicked.connect(self._handle_add_clicked)
+        for widget in (self.symbol_input, self.metric_combo, self.direction_combo, self.threshold_input):
+            form_layout.addWidget(widget)
+        form_layout.addWidget(self.add_button)
+        layout.addLayout(form_layout)
+
+        self.alerts_table = QTableWidget(0, len(ALERT_COLUMNS))
+        self.alerts_table.setObjectName("alertsTable")
+        self.alerts_table.setHorizontalHeaderLabels(ALERT_COLUMNS)
+        self.alerts_table.verticalHeader().setVisible(False)
+        self.alerts_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.alerts_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.alerts_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.alerts_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.alerts_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        layout.addWidget(self.alerts_table, stretch=1)
+
+        buttons_layout = QHBoxLayout()
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("statusLabel")
+        self.status_label.setWordWrap(True)
+        buttons_layout.addWidget(self.status_label, stretch=1)
+        self.remove_button = QPushButton("Удалить выбранные")
+        self.remove_button.setObjectName("dialogButton")
+        self.remove_button.setCursor(Qt.PointingHandCursor)
+        self.remove_button.clicked.connect(self._handle_remove_clicked)
+        buttons_layout.addWidget(self.remove_button)
+        layout.addLayout(buttons_layout)
+
+    def _apply_styles(self):
+        self.setStyleSheet(f"""
+            QDialog#AlertsDialog {{ background-color: {DARK_BG_COLOR}; }}
+            QLineEdit, QComboBox, QDoubleSpinBox {{
+                background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR};
+                border: 1px solid {PANEL_BG_COLOR}; border-radius: 4px; padding: 3px 5px; font-size: 12px;
+            }}
+            QTableWidget#alertsTable {{
+                background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR};
+                border: none; font-size: 12px;
+            }}
+            QHeaderView::section {{
+                background-color: {PANEL_BG_COLOR}; color: {SECONDARY_TEXT_COLOR}; border: none; font-size: 11px;
+            }}
+            QLabel#statusLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 11px; }}
+            QPushButton#dialogButton {{
+                background-color: {ACCENT_COLOR}; color: white; border: none;
+                border-radius: 6px; padding: 6px 14px; font-size: 13px;
+            }}
+            QPushButton#dialogButton:hover {{ background-color: {ACCENT_HOVER_COLOR}; }}
+        """)
+
+    def set_symbol(self, symbol: str):
+        if symbol and not self.symbol_input.text().strip():
+            self.symbol_input.setText(symbol)
+
+    def _handle_add_clicked(self):
+        self.add_requested.emit(
+            self.symbol_input.text(), METRIC_CHOICES[self.metric_combo.currentIndex()][0],
+            DIRECTION_CHOICES[self.direction_combo.currentIndex()][0], self.threshold_input.value()
+        )
+
+    def _handle_remove_clicked(self):
+        rows = sorted({index.row() for index in self.alerts_table.selectionModel().selectedRows()})
+        for row_idx in rows:
+            self.remove_requested.emit(self._rule_ids[row_idx])
+
+    def set_rules(self, rules: list):
+        self._rule_ids = [rule['id'] for rule in rules]
+        self.alerts_table.setRowCount(len(rules))
+        for row_idx, rule in enumerate(rules):
+            metric = dict(METRIC_CHOICES).get(rule['metric'], rule['metric'])
+            direction = dict(DIRECTION_CHOICES).get(rule['direction'], rule['direction'])
+            if rule['active']:
+                status = "ожидает"
+            else:
+                triggered_at = time.strftime('%d.%m %H:%M:%S', time.localtime(rule['triggered_at']))
+                status = f"сработало {triggered_at} при {rule['triggered_value']:g}"
+            values = (rule['symbol'], f"{metric} {direction}", f"{rule['threshold']:g}", status)
+            for col_idx, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col_idx == 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if col_idx == 3 and not rule['active']:
+                    item.setForeground(QColor(BUY_COLOR))
+                self.alerts_table.setItem(row_idx, col_idx, item)
+
+    def set_status(self, message: str):
+        self.status_label.setText(message)
@@ -0,0 +1,82 @@
+# src/ui/basket_order_ui.py
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QPlainTextEdit, QPushButton
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QFont
+
+# Цветовая палитра
+DARK_BG_COLOR = "#282c34"
+PRIMARY_TEXT_COLOR = "#e8e8f0"
+SECONDARY_TEXT_COLOR = "#b0b0d0"
+ACCENT_COLOR = "#9b88c7"
+ACCENT_HOVER_COLOR = "#a995d1"
+INPUT_BG_COLOR = "rgba(30, 32, 40, 0.95)"
+BUY_COLOR = "#2ecc71"
+SELL_COLOR = "#e74c3c"
+
+
+class BasketOrderDialog(QDialog):
+    submit_requested = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("BasketOrderDialog")
+        self.setWindowTitle("Корзина ордеров")
+        self.setMinimumSize(420, 360)
+        self._setup_ui()
+        self._apply_styles()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        hint_label = QLabel("По одной ноге на строку: ПАРА СТОРОНА КОЛ-ВО\nНапример: BTC/USDT buy 0.001")
+        hint_label.setObjectName("hintLabel")
+        layout.addWidget(hint_label)
+
+        self.legs_edit = QPlainTextEdit()
+        self.legs_edit.setObjectName("legsEdit")
+        mono_font = QFont("Monospace")
+        mono_font.setStyleHint(QFont.TypeWriter)
+        self.legs_edit.setFont(mono_font)
+        layout.addWidget(self.legs_edit, stretch=1)
+
+        self.submit_button = QPushButton("Отправить корзину")
+        self.submit_button.setObjectName("submitButton")
+        self.submit_button.setMinimumHeight(40)
+        self.submit_button.setCursor(Qt.PointingHandCursor)
+        self.submit_button.clicked.connect(lambda: self.submit_requested.emit(self.legs_edit.toPlainText()))
+        layout.addWidget(self.submit_button)
+
+        self.result_label = QLabel("")
+        self.result_label.setObjectName("resultLabel")
+        self.result_label.setWordWrap(True)
+        self.result_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.result_label)
+
+    def _apply_styles(self):
+        self.setStyleSheet(f"""
+            QDialog#BasketOrderDialog {{ background-color: {DARK_BG_COLOR}; }}
+            QLabel#hintLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 12px; }}
+            QPlainTextEdit#legsEdit {{
+                background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR};
+                border: 1px solid {ACCENT_COLOR}; border-radius: 6px; padding: 6px;
+            }}
+            QPushButton#submitButton {{
+                background-color: {ACCENT_COLOR}; color: white; border: none;
+                border-radius: 8px; font-size: 14px; font-weight: bold;
+            }}
+            QPushButton#submitButton:hover {{ background-color: {ACCENT_HOVER_COLOR}; }}
+            QPushButton#submitButton:disabled {{ background-color: {SECONDARY_TEXT_COLOR}; }}
+            QLabel#resultLabel {{ font-size: 12px; }}
+        """)
+
+    def set_busy(self, busy: bool):
+        self.submit_button.setEnabled(not busy)
+        if busy:
+            self.show_result("Отправка корзины...", True)
+
+    def show_result(self, message: str, is_success: bool):
+        color_hex = BUY_COLOR if is_success else SELL_COLOR
+        self.result_label.setStyleSheet(f"color: {color_hex}; font-size: 12px;")
+        self.result_label.setText(message)
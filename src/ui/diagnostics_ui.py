@@ -0,0 +1,127 @@
+# src/ui/diagnostics_ui.py
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+
+# Цветовая палитра
+DARK_BG_COLOR = "#282c34"
+PRIMARY_TEXT_COLOR = "#e8e8f0"
+SECONDARY_TEXT_COLOR = "#b0b0d0"
+ACCENT_COLOR = "#9b88c7"
+ACCENT_HOVER_COLOR = "#a995d1"
+PANEL_BG_COLOR = "rgba(45, 48, 56, 0.9)"
+INPUT_BG_COLOR = "rgba(30, 32, 40, 0.95)"
+SELL_COLOR = "#e74c3c"
+
+# (ключ метрики, заголовок колонки)
+DIAGNOSTICS_COLUMNS = (
+    ('endpoint', "Метод"),
+    ('calls', "Вызовы"),
+    ('error_rate', "Ошибки"),
+    ('p50_ms', "p50, мс"),
+    ('p95_ms', "p95, мс"),
+    ('p99_ms', "p99, мс"),
+    ('rate_limit_wait_ms', "Ожидание RL, мс"),
+    ('avg_payload_bytes', "Ответ, КБ"),
+)
+
+
+class DiagnosticsDialog(QDialog):
+    export_requested = pyqtSignal()
+    reset_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("DiagnosticsDialog")
+        self.setWindowTitle("Диагностика запросов к бирже")
+        self.setMinimumSize(760, 360)
+        self._setup_ui()
+        self._apply_styles()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        self.metrics_table = QTableWidget(0, len(DIAGNOSTICS_COLUMNS))
+        self.metrics_table.setObjectName("metricsTable")
+        self.metrics_table.setHorizontalHeaderLabels([title for _, title in DIAGNOSTICS_COLUMNS])
+        self.metrics_table.verticalHeader().setVisible(False)
+        self.metrics_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.metrics_table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.metrics_table, stretch=1)
+
+        self.last_error_label = QLabel("")
+        self.last_error_label.setObjectName("lastErrorLabel")
+        self.last_error_label.setWordWrap(True)
+        self.last_error_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.last_error_label)
+
+        buttons_layout = QHBoxLayout()
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("statusLabel")
+        buttons_layout.addWidget(self.status_label, stretch=1)
+
+        self.reset_button = QPushButton("Сбросить")
+        self.reset_button.setObjectName("dialogButton")
+        self.reset_button.setCursor(Qt.PointingHandCursor)
+        self.reset_button.clicked.connect(self.reset_requested.emit)
+        buttons_layout.addWidget(self.reset_button)
+
+        self.export_button = QPushButton("Экспорт JSON")
+        self.export_button.setObjectName("dialogButton")
+        self.export_button.setCursor(Qt.PointingHandCursor)
+        self.export_button.clicked.connect(self.export_requested.emit)
+        buttons_layout.addWidget(self.export_button)
+        layout.addLayout(buttons_layout)
+
+    def _apply_styles(self):
+        self.setStyleSheet(f"""
+            QDialog#DiagnosticsDialog {{ background-color: {DARK_BG_COLOR}; }}
+            QTableWidget#metricsTable {{
+                background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR};
+                border: none; font-size: 12px;
+            }}
+            QHeaderView::section {{
+                background-color: {PANEL_BG_COLOR}; color: {SECONDARY_TEXT_COLOR}; border: none; font-size: 11px;
+            }}
+            QLabel#lastErrorLabel {{ color: {SELL_COLOR}; font-size: 11px; }}
+            QLabel#statusLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 11px; }}
+            QPushButton#dialogButton {{
+                background-color: {ACCENT_COLOR}; color: white; border: none;
+                border-radius: 6px; padding: 6px 14px; font-size: 13px;
+            }}
+            QPushButton#dialogButton:hover {{ background-color: {ACCENT_HOVER_COLOR}; }}
+        """)
+
+    @staticmethod
+    def _format_value(key: str, value):
+        if value is None:
+            return "—"
+        if key == 'error_rate':
+            return f"{value * 100:.1f}%"
+        if key == 'avg_payload_bytes':
+            return f"{value / 1024:.1f}"
+        if key.endswith('_ms'):
+            return f"{value:.0f}" if value >= 10 else f"{value:.1f}"
+        return str(value)
+
+    def set_metrics(self, rows: list):
+        self.metrics_table.setRowCount(len(rows))
+        errors = []
+        for row_idx, row in enumerate(rows):
+            for col_idx, (key, _) in enumerate(DIAGNOSTICS_COLUMNS):
+                item = QTableWidgetItem(self._format_value(key, row.get(key)))
+                if col_idx:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.metrics_table.setItem(row_idx, col_idx, item)
+            if row.get('last_error'):
+                errors.append(f"{row['endpoint']}: {row['last_error']}")
+        self.last_error_label.setText("Последние ошибки:\n" + "\n".join(errors) if errors else "")
+
+    def set_status(self, message: str):
+        self.status_label.setText(message)
@@ -0,0 +1,49 @@
+# src/ui/profiler_overlay_ui.py
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+
+OVERLAY_BG_COLOR = "rgba(20, 22, 28, 0.85)"
+OVERLAY_TEXT_COLOR = "#b0b0d0"
+OVERLAY_WARN_COLOR = "#f1c40f"
+OVERLAY_MARGIN = 8
+
+
+class ProfilerOverlay(QLabel):
+    """Полупрозрачная плашка в правом верхнем углу окна с данными профайлера UI."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setObjectName("profilerOverlay")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        mono_font = QFont("Monospace")
+        mono_font.setStyleHint(QFont.TypeWriter)
+        mono_font.setPointSize(8)
+        self.setFont(mono_font)
+        self.set_stats(0.0, 0.0, [], None)
+        self.raise_()
+
+    def set_stats(self, loop_lag_ms: float, max_loop_lag_ms: float, top_rows: list, last_stall: dict,
+                  stall_threshold_ms: float = 16.0):
+        lines = [f"loop lag {loop_lag_ms:5.1f} ms  (max {max_loop_lag_ms:.1f})"]
+        for kind, name, count, total_ms, max_ms in top_rows:
+            lines.append(f"{kind:<5} {total_ms / count:6.1f} avg {max_ms:6.1f} max  {name[-40:]}")
+        if last_stall:
+            stall_text = f"stall {last_stall['ms']:.1f} ms: {last_stall['name']}"
+            if last_stall.get('culprit'):
+                stall_text += f" <- {last_stall['culprit']}"
+            lines.append(stall_text)
+        is_lagging = loop_lag_ms >= stall_threshold_ms
+        self.setStyleSheet(
+            f"QLabel#profilerOverlay {{ background-color: {OVERLAY_BG_COLOR}; "
+            f"color: {OVERLAY_WARN_COLOR if is_lagging else OVERLAY_TEXT_COLOR}; padding: 4px; border-radius: 4px; }}"
+        )
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.reposition()
+
+    def reposition(self):
+        parent = self.parentWidget()
+        if parent:
+            self.move(parent.width() - self.width() - OVERLAY_MARGIN, OVERLAY_MARGIN)
+            self.raise_()
@@ -0,0 +1,160 @@
+# src/ui/screener_ui.py
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QDoubleSpinBox, QComboBox, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+
+from ..core.screener import TREND_UP, TREND_DOWN, TREND_FLAT, TREND_TIMEFRAME
+
+# Цветовая палитра
+DARK_BG_COLOR = "#282c34"
+PRIMARY_TEXT_COLOR = "#e8e8f0"
+SECONDARY_TEXT_COLOR = "#b0b0d0"
+PANEL_BG_COLOR = "rgba(45, 48, 56, 0.9)"
+INPUT_BG_COLOR = "rgba(30, 32, 40, 0.95)"
+BUY_COLOR = "#2ecc71"
+SELL_COLOR = "#e74c3c"
+
+SCREENER_COLUMNS = ("Пара", "Цена", "Изм. 24ч, %", "Объем 24ч, USDT", "Спред, %", f"Тренд ({TREND_TIMEFRAME})")
+# (подпись, код тренда или None — фильтр выключен)
+TREND_CHOICES = (("Любой", None), ("Рост", TREND_UP), ("Падение", TREND_DOWN), ("Боковик", TREND_FLAT))
+TREND_TEXT = {TREND_UP: "рост", TREND_DOWN: "падение", TREND_FLAT: "боковик"}
+
+
+class ScreenerDialog(QDialog):
+    filters_changed = pyqtSignal()
+    symbol_activated = pyqtSignal(str)
+    MAX_VISIBLE_ROWS = 300
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("ScreenerDialog")
+        self.setWindowTitle("Скринер рынка (USDT-пары)")
+        self.setMinimumSize(760, 480)
+        self._setup_ui()
+        self._apply_styles()
+
+    @staticmethod
+    def _make_spin_box(minimum: float, maximum: float, decimals: int, off_text: str) -> QDoubleSpinBox:
+        # Значение на минимуме показывается как off_text и означает "фильтр выключен"
+        spin_box = QDoubleSpinBox()
+        spin_box.setRange(minimum, maximum)
+        spin_box.setDecimals(decimals)
+        spin_box.setSpecialValueText(off_text)
+        spin_box.setValue(minimum)
+        return spin_box
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        filters_layout = QHBoxLayout()
+        filters_layout.setSpacing(8)
+        self.min_change_input = self._make_spin_box(-100.0, 10000.0, 1, "любое")
+        self.min_change_input.setSingleStep(1.0)
+        self.min_volume_input = self._make_spin_box(0.0, 1e12, 0, "любой")
+        self.min_volume_input.setSingleStep(100000.0)
+        self.max_spread_input = self._make_spin_box(0.0, 100.0, 2, "любой")
+        self.max_spread_input.setSingleStep(0.05)
+        self.trend_combo = QComboBox()
+        for title, _ in TREND_CHOICES:
+            self.trend_combo.addItem(title)
+        for title, widget in (("Изм. 24ч, % >", self.min_change_input), ("Объем >", self.min_volume_input),
+                              ("Спред, % <", self.max_spread_input), (f"Тренд ({TREND_TIMEFRAME})", self.trend_combo)):
+            label = QLabel(title)
+            label.setObjectName("filterLabel")
+            filters_layout.addWidget(label)
+            filters_layout.addWidget(widget)
+        filters_layout.addStretch(1)
+        layout.addLayout(filters_layout)
+
+        for spin_box in (self.min_change_input, self.min_volume_input, self.max_spread_input):
+            spin_box.valueChanged.connect(lambda _: self.filters_changed.emit())
+        self.trend_combo.currentIndexChanged.connect(lambda _: self.filters_changed.emit())
+
+        self.results_table = QTableWidget(0, len(SCREENER_COLUMNS))
+        self.results_table.setObjectName("screenerTable")
+        self.results_table.setHorizontalHeaderLabels(SCREENER_COLUMNS)
+        self.results_table.verticalHeader().setVisible(False)
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.results_table.cellDoubleClicked.connect(self._handle_cell_double_clicked)
+        layout.addWidget(self.results_table, stretch=1)
+
+        self.status_label = QLabel("Загрузка рынков...")
+        self.status_label.setObjectName("statusLabel")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+    def _apply_styles(self):
+        self.setStyleSheet(f"""
+            QDialog#ScreenerDialog {{ background-color: {DARK_BG_COLOR}; }}
+            QLabel#filterLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 11px; }}
+            QDoubleSpinBox, QComboBox {{
+                background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR};
+                border: 1px solid {PANEL_BG_COLOR}; border-radius: 4px; padding: 3px 5px; font-size: 12px;
+            }}
+            QTableWidget#screenerTable {{
+                background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR};
+                border: none; font-size: 12px;
+            }}
+            QHeaderView::section {{
+                background-color: {PANEL_BG_COLOR}; color: {SECONDARY_TEXT_COLOR}; border: none; font-size: 11px;
+            }}
+            QLabel#statusLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 11px; }}
+        """)
+
+    def filters(self) -> list:
+        """Фильтры для MarketScreener.evaluate: [(колонка, оператор, значение)]."""
+        filters = []
+        if self.min_change_input.value() > self.min_change_input.minimum():
+            filters.append(('change_pct', '>', self.min_change_input.value()))
+        if self.min_volume_input.value() > self.min_volume_input.minimum():
+            filters.append(('volume', '>', self.min_volume_input.value()))
+        if self.max_spread_input.value() > self.max_spread_input.minimum():
+            filters.append(('spread_pct', '<', self.max_spread_input.value()))
+        trend = TREND_CHOICES[self.trend_combo.currentIndex()][1]
+        if trend is not None:
+            filters.append(('trend', '==', trend))
+        return filters
+
+    @staticmethod
+    def _format_number(value: float, pattern: str) -> str:
+        return "—" if value != value else format(value, pattern)  # NaN — нет данных
+
+    def set_results(self, rows: list):
+        visible_rows = rows[:self.MAX_VISIBLE_ROWS]
+        self.results_table.setRowCount(len(visible_rows))
+        for row_idx, row in enumerate(visible_rows):
+            last = row['last']
+            values = (
+                row['symbol'],
+                self._format_number(last, ".2f" if last >= 1 else ".6g"),
+                self._format_number(row['change_pct'], "+.2f"),
+                self._format_number(row['volume'], ",.0f"),
+                self._format_number(row['spread_pct'], ".3f"),
+                TREND_TEXT.get(row['trend'], "—"),
+            )
+            for col_idx, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if 0 < col_idx < 5:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if col_idx == 2 and row['change_pct'] == row['change_pct']:
+                    item.setForeground(QColor(BUY_COLOR if row['change_pct'] >= 0 else SELL_COLOR))
+                if col_idx == 5 and row['trend'] in (TREND_UP, TREND_DOWN):
+                    item.setForeground(QColor(BUY_COLOR if row['trend'] == TREND_UP else SELL_COLOR))
+                self.results_table.setItem(row_idx, col_idx, item)
+
+    def _handle_cell_double_clicked(self, row_idx: int, _col_idx: int):
+        item = self.results_table.item(row_idx, 0)
+        if item:
+            self.symbol_activated.emit(item.text())
+
+    def set_status(self, message: str):
+        self.status_label.setText(message)
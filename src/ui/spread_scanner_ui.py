@@ -0,0 +1,84 @@
+# src/ui/spread_scanner_ui.py
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+
+# Цветовая палитра
+DARK_BG_COLOR = "#282c34"
+PRIMARY_TEXT_COLOR = "#e8e8f0"
+SECONDARY_TEXT_COLOR = "#b0b0d0"
+PANEL_BG_COLOR = "rgba(45, 48, 56, 0.9)"
+INPUT_BG_COLOR = "rgba(30, 32, 40, 0.95)"
+BUY_COLOR = "#2ecc71"
+
+SPREAD_COLUMNS = ("Актив", "Спред, %", "Купить (ask)", "Цена, $", "Продать (bid)", "Цена, $", "Источников")
+
+
+class SpreadScannerDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("SpreadScannerDialog")
+        self.setWindowTitle("Сканер спредов между площадками")
+        self.setMinimumSize(820, 420)
+        self._setup_ui()
+        self._apply_styles()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        self.spreads_table = QTableWidget(0, len(SPREAD_COLUMNS))
+        self.spreads_table.setObjectName("spreadsTable")
+        self.spreads_table.setHorizontalHeaderLabels(SPREAD_COLUMNS)
+        self.spreads_table.verticalHeader().setVisible(False)
+        self.spreads_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.spreads_table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.spreads_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.spreads_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.spreads_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        layout.addWidget(self.spreads_table, stretch=1)
+
+        self.status_label = QLabel("Ожидание первых котировок...")
+        self.status_label.setObjectName("statusLabel")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+    def _apply_styles(self):
+        self.setStyleSheet(f"""
+            QDialog#SpreadScannerDialog {{ background-color: {DARK_BG_COLOR}; }}
+            QTableWidget#spreadsTable {{
+                background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR};
+                border: none; font-size: 12px;
+            }}
+            QHeaderView::section {{
+                background-color: {PANEL_BG_COLOR}; color: {SECONDARY_TEXT_COLOR}; border: none; font-size: 11px;
+            }}
+            QLabel#statusLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 11px; }}
+        """)
+
+    @staticmethod
+    def _format_usd(value: float) -> str:
+        return f"{value:.2f}" if value >= 1 else f"{value:.6g}"
+
+    def set_spreads(self, entries: list):
+        self.spreads_table.setRowCount(len(entries))
+        for row_idx, entry in enumerate(entries):
+            values = (
+                entry['base'], f"{entry['spread_pct']:.2f}",
+                f"{entry['ask_venue']} {entry['ask_symbol']}", self._format_usd(entry['ask_usd']),
+                f"{entry['bid_venue']} {entry['bid_symbol']}", self._format_usd(entry['bid_usd']),
+                str(entry['sources']),
+            )
+            for col_idx, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col_idx in (1, 3, 5, 6):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if col_idx == 1:
+                    item.setForeground(QColor(BUY_COLOR if entry['spread_pct'] > 0 else SECONDARY_TEXT_COLOR))
+                self.spreads_table.setItem(row_idx, col_idx, item)
+
+    def set_status(self, message: str):
+        self.status_label.setText(message)
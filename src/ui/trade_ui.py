@@ -2,11 +2,14 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
     QFrame, QSizePolicy, QGraphicsView, QGraphicsScene, QSpacerItem,
-    QGraphicsLineItem, QGraphicsEllipseItem, QGraphicsTextItem
+    QGraphicsLineItem, QGraphicsEllipseItem, QGraphicsTextItem,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QComboBox
 )
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QRectF, QPointF
+from PyQt5.QtCore import Qt, QSize, pyqtSignal, QRectF, QPointF, QDateTime
 from PyQt5.QtGui import QFont, QPainter, QColor, QPen, QPalette, QBrush
 
+from ..core.ui_profiler import profiled_slot
+
 # Цветовая палитра
 DARK_BG_COLOR = "#282c34"
 PRIMARY_TEXT_COLOR = "#e8e8f0"
@@ -25,12 +28,24 @@ SELL_HOVER_COLOR = "#c0392b"
 PREDICTION_TEXT_COLOR_HEX = "#f1c40f"
 CHART_LINE_COLOR = QColor(ACCENT_COLOR)
 CHART_PREDICTION_MARKER_COLOR = QColor(PREDICTION_TEXT_COLOR_HEX)
+ORDER_BOOK_DEPTH = 10  # Кол-во уровней стакана с каждой стороны
+TRADE_TAPE_ROWS = 12  # Кол-во последних сделок в ленте
+# Типы ордеров: (ключ, подпись); стоп-лимит, TWAP и айсберг исполняются локальным планировщиком
+ORDER_TYPES = (
+    ('market', "Рынок"),
+    ('limit', "Лимит"),
+    ('stop_limit', "Стоп-лимит"),
+    ('twap', "TWAP"),
+    ('iceberg', "Айсберг"),
+)
 
 
 class TradeUi(QWidget):
     back_button_clicked = pyqtSignal()
     buy_button_clicked = pyqtSignal()
     sell_button_clicked = pyqtSignal()
+    amount_text_changed = pyqtSignal(str)
+    basket_button_clicked = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -44,13 +59,25 @@ class TradeUi(QWidget):
         self.chart_scene = None
         self.prediction_label_container = None
         self.prediction_label = None
+        self.order_book_panel = None
+        self.order_book_table = None
+        self.trade_tape_table = None
+        self.trade_tape_stats_label = None
         self.right_panel_widget = None
         self.balance_base_label = None
         self.balance_quote_label = None
+        self.order_type_combo = None
         self.amount_input = None
+        self.price_input = None
+        self.stop_price_input = None
+        self.duration_input = None
+        self.slices_input = None
+        self.order_hint_label = None
         self.buy_button = None
         self.sell_button = None
+        self.basket_button = None
         self.order_status_label = None
+        self.execution_status_label = None
 
         self._padding = 15
         self._min_price_range_points = 50
@@ -120,6 +147,8 @@ class TradeUi(QWidget):
         prediction_layout.addWidget(self.prediction_label)
         left_panel_layout.addWidget(self.prediction_label_container, stretch=1)
 
+        self._setup_order_book_panel()
+
         self.right_panel_widget = QWidget()
         self.right_panel_widget.setObjectName("orderPanel")
         self.right_panel_widget.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Preferred)
@@ -142,12 +171,37 @@ class TradeUi(QWidget):
         right_panel_layout.addWidget(self.balance_quote_label)
         right_panel_layout.addSpacing(20)
 
+        self.order_type_combo = QComboBox()
+        self.order_type_combo.setObjectName("orderTypeCombo")
+        self.order_type_combo.setMinimumHeight(35)
+        for order_type, title in ORDER_TYPES:
+            self.order_type_combo.addItem(title, order_type)
+        self.order_type_combo.currentIndexChanged.connect(self._update_order_type_inputs)
+        right_panel_layout.addWidget(self.order_type_combo)
+
         self.amount_input = QLineEdit()
         self.amount_input.setPlaceholderText("Кол-во")
         self.amount_input.setObjectName("styledLineEdit")
         self.amount_input.setMinimumHeight(40)
+        self.amount_input.textChanged.connect(self.amount_text_changed.emit)
         right_panel_layout.addWidget(self.amount_input)
 
+        self.stop_price_input = self._create_order_input("Стоп-цена")
+        right_panel_layout.addWidget(self.stop_price_input)
+        self.price_input = self._create_order_input("Лимитная цена")
+        right_panel_layout.addWidget(self.price_input)
+        self.duration_input = self._create_order_input("Длительность, мин")
+        right_panel_layout.addWidget(self.duration_input)
+        self.slices_input = self._create_order_input("Кол-во частей")
+        right_panel_layout.addWidget(self.slices_input)
+        self._update_order_type_inputs()
+
+        self.order_hint_label = QLabel("")
+        self.order_hint_label.setObjectName("orderHintLabel")
+        self.order_hint_label.setWordWrap(True)
+        self.order_hint_label.hide()
+        right_panel_layout.addWidget(self.order_hint_label)
+
         self.buy_button = QPushButton("Купить")
         self.buy_button.setObjectName("buyButton")
         self.buy_button.setMinimumHeight(45)
@@ -162,6 +216,13 @@ class TradeUi(QWidget):
         self.sell_button.clicked.connect(self.sell_button_clicked.emit)
         right_panel_layout.addWidget(self.sell_button)
 
+        self.basket_button = QPushButton("Корзина ордеров")
+        self.basket_button.setObjectName("basketButton")
+        self.basket_button.setMinimumHeight(35)
+        self.basket_button.setCursor(Qt.PointingHandCursor)
+        self.basket_button.clicked.connect(self.basket_button_clicked.emit)
+        right_panel_layout.addWidget(self.basket_button)
+
         self.order_status_label = QLabel("")
         self.order_status_label.setObjectName("orderStatusLabel")
         self.order_status_label.setAlignment(Qt.AlignCenter)
@@ -169,13 +230,101 @@ class TradeUi(QWidget):
         self.order_status_label.setMinimumHeight(30)
         self.order_status_label.hide()
         right_panel_layout.addWidget(self.order_status_label)
+
+        self.execution_status_label = QLabel("")
+        self.execution_status_label.setObjectName("executionStatusLabel")
+        self.execution_status_label.setWordWrap(True)
+        self.execution_status_label.hide()
+        right_panel_layout.addWidget(self.execution_status_label)
         right_panel_layout.addStretch(1)
 
         self.content_layout.addWidget(left_panel_widget, stretch=3)
+        self.content_layout.addWidget(self.order_book_panel, stretch=0)
         self.content_layout.addWidget(self.right_panel_widget, stretch=0)
         self.main_layout.addLayout(self.content_layout, stretch=1)
         self.setLayout(self.main_layout)
 
+    @staticmethod
+    def _create_order_input(placeholder: str) -> QLineEdit:
+        line_edit = QLineEdit()
+        line_edit.setPlaceholderText(placeholder)
+        line_edit.setObjectName("styledLineEdit")
+        line_edit.setMinimumHeight(35)
+        return line_edit
+
+    def _update_order_type_inputs(self):
+        order_type = self.get_order_type()
+        self.price_input.setVisible(order_type in ('limit', 'stop_limit'))
+        self.stop_price_input.setVisible(order_type == 'stop_limit')
+        self.duration_input.setVisible(order_type in ('twap', 'iceberg'))
+        self.slices_input.setVisible(order_type in ('twap', 'iceberg'))
+
+    def _setup_order_book_panel(self):
+        self.order_book_panel = QWidget()
+        self.order_book_panel.setObjectName("orderBookPanel")
+        self.order_book_panel.setFixedWidth(230)
+        order_book_layout = QVBoxLayout(self.order_book_panel)
+        order_book_layout.setContentsMargins(8, 8, 8, 8)
+        order_book_layout.setSpacing(5)
+
+        title_label = QLabel("Стакан")
+        title_label.setObjectName("panelTitleLabel")
+        title_label.setAlignment(Qt.AlignCenter)
+        order_book_layout.addWidget(title_label)
+
+        # Строки: ORDER_BOOK_DEPTH asks (лучший снизу), строка спреда, ORDER_BOOK_DEPTH bids (лучший сверху)
+        self.order_book_table = QTableWidget(2 * ORDER_BOOK_DEPTH + 1, 2)
+        self.order_book_table.setObjectName("orderBookTable")
+        self.order_book_table.setHorizontalHeaderLabels(["Цена", "Кол-во"])
+        self._configure_compact_table(self.order_book_table)
+        # Ячейки создаются один раз и дальше только меняют текст
+        for row in range(self.order_book_table.rowCount()):
+            if row < ORDER_BOOK_DEPTH:
+                color = QColor(SELL_COLOR)
+            elif row == ORDER_BOOK_DEPTH:
+                color = QColor(SECONDARY_TEXT_COLOR)
+            else:
+                color = QColor(BUY_COLOR)
+            for col in range(2):
+                item = QTableWidgetItem("")
+                item.setForeground(QBrush(color))
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.order_book_table.setItem(row, col, item)
+        order_book_layout.addWidget(self.order_book_table, stretch=1)
+
+        tape_title_label = QLabel("Лента сделок")
+        tape_title_label.setObjectName("panelTitleLabel")
+        tape_title_label.setAlignment(Qt.AlignCenter)
+        order_book_layout.addWidget(tape_title_label)
+
+        self.trade_tape_table = QTableWidget(TRADE_TAPE_ROWS, 3)
+        self.trade_tape_table.setObjectName("orderBookTable")
+        self.trade_tape_table.setHorizontalHeaderLabels(["Цена", "Кол-во", "Время"])
+        self._configure_compact_table(self.trade_tape_table)
+        for row in range(TRADE_TAPE_ROWS):
+            for col in range(3):
+                item = QTableWidgetItem("")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.trade_tape_table.setItem(row, col, item)
+        order_book_layout.addWidget(self.trade_tape_table, stretch=1)
+
+        self.trade_tape_stats_label = QLabel("")
+        self.trade_tape_stats_label.setObjectName("tapeStatsLabel")
+        self.trade_tape_stats_label.setWordWrap(True)
+        order_book_layout.addWidget(self.trade_tape_stats_label)
+
+    @staticmethod
+    def _configure_compact_table(table: QTableWidget):
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.verticalHeader().setDefaultSectionSize(18)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.NoSelection)
+        table.setFocusPolicy(Qt.NoFocus)
+        table.setShowGrid(False)
+        table.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+
     def _apply_styles(self):
         self.setStyleSheet(f"""
             QWidget#TradeUi {{ background-color: {DARK_BG_COLOR}; }}
@@ -199,6 +348,18 @@ class TradeUi(QWidget):
                 background-color: {PANEL_BG_COLOR}; border-radius: 12px; 
                 border: 1px solid {PANEL_BORDER_COLOR}; 
             }}
+            QWidget#orderBookPanel {{ 
+                background-color: {PANEL_BG_COLOR}; border-radius: 12px; 
+                border: 1px solid {PANEL_BORDER_COLOR}; 
+            }}
+            QLabel#panelTitleLabel {{ color: {PRIMARY_TEXT_COLOR}; font-size: 13px; font-weight: bold; }}
+            QTableWidget#orderBookTable {{ 
+                background-color: {INPUT_BG_COLOR}; border: none; font-size: 11px; 
+            }}
+            QHeaderView::section {{ 
+                background-color: {PANEL_BG_COLOR}; color: {SECONDARY_TEXT_COLOR}; border: none; font-size: 11px; 
+            }}
+            QLabel#tapeStatsLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 11px; }}
             QLabel#balanceLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 14px; }}
             QLineEdit#styledLineEdit {{ 
                 background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR}; 
@@ -216,13 +377,24 @@ class TradeUi(QWidget):
                 border-radius: 8px; padding: 10px; font-size: 16px; font-weight: bold; 
             }}
             QPushButton#sellButton:hover {{ background-color: {SELL_HOVER_COLOR}; }}
+            QPushButton#basketButton {{ 
+                background-color: transparent; color: {ACCENT_COLOR}; border: 1px solid {ACCENT_COLOR}; 
+                border-radius: 8px; padding: 6px; font-size: 13px; 
+            }}
+            QPushButton#basketButton:hover {{ color: {ACCENT_HOVER_COLOR}; border-color: {ACCENT_HOVER_COLOR}; }}
             QLabel#orderStatusLabel {{ font-size: 12px; }}
+            QLabel#executionStatusLabel {{ color: {SECONDARY_TEXT_COLOR}; font-size: 11px; }}
+            QComboBox#orderTypeCombo {{ 
+                background-color: {INPUT_BG_COLOR}; color: {PRIMARY_TEXT_COLOR}; 
+                border: 1px solid {INPUT_BORDER_COLOR}; border-radius: 6px; padding: 4px 10px; font-size: 13px; 
+            }}
         """)
 
     def clear_chart(self):
         if self.chart_scene:
             self.chart_scene.clear()
 
+    @profiled_slot()
     def draw_price_chart(self, ohlcv_data: list, predicted_price_data: tuple = None, price_precision: int = None):
         if not self.chart_scene:
             return
@@ -348,6 +520,72 @@ class TradeUi(QWidget):
             except Exception:
                 pass
 
+    def set_order_book(self, bids: list, asks: list, price_precision: int = 2, amount_precision: int = 4):
+        # bids/asks: [(price, amount), ...] от лучшего уровня к худшему
+        if not self.order_book_table:
+            return
+        self.order_book_table.setUpdatesEnabled(False)
+        try:
+            for i in range(ORDER_BOOK_DEPTH):
+                # asks выводятся сверху вниз от худшего к лучшему
+                ask_row = ORDER_BOOK_DEPTH - 1 - i
+                bid_row = ORDER_BOOK_DEPTH + 1 + i
+                self._set_order_book_row(ask_row, asks[i] if i < len(asks) else None, price_precision, amount_precision)
+                self._set_order_book_row(bid_row, bids[i] if i < len(bids) else None, price_precision, amount_precision)
+            spread_text = ""
+            if bids and asks:
+                spread_text = f"{asks[0][0] - bids[0][0]:.{price_precision}f}"
+            self.order_book_table.item(ORDER_BOOK_DEPTH, 0).setText(spread_text)
+            self.order_book_table.item(ORDER_BOOK_DEPTH, 1).setText("спред" if spread_text else "")
+        finally:
+            self.order_book_table.setUpdatesEnabled(True)
+
+    def _set_order_book_row(self, row: int, level, price_precision: int, amount_precision: int):
+        if level is None:
+            self.order_book_table.item(row, 0).setText("")
+            self.order_book_table.item(row, 1).setText("")
+            return
+        self.order_book_table.item(row, 0).setText(f"{level[0]:.{price_precision}f}")
+        self.order_book_table.item(row, 1).setText(f"{level[1]:.{amount_precision}f}")
+
+    def clear_order_book(self):
+        self.set_order_book([], [])
+
+    def set_trade_tape(self, trades: list, stats: dict = None, price_precision: int = 2, amount_precision: int = 4):
+        # trades: [(timestamp_ms, price, amount, is_buy), ...] от новых к старым
+        if not self.trade_tape_table:
+            return
+        buy_brush, sell_brush = QBrush(QColor(BUY_COLOR)), QBrush(QColor(SELL_COLOR))
+        self.trade_tape_table.setUpdatesEnabled(False)
+        try:
+            for row in range(TRADE_TAPE_ROWS):
+                price_item = self.trade_tape_table.item(row, 0)
+                amount_item = self.trade_tape_table.item(row, 1)
+                time_item = self.trade_tape_table.item(row, 2)
+                if row >= len(trades):
+                    price_item.setText(""); amount_item.setText(""); time_item.setText("")
+                    continue
+                timestamp, price, amount, is_buy = trades[row]
+                price_item.setText(f"{price:.{price_precision}f}")
+                price_item.setForeground(buy_brush if is_buy else sell_brush)
+                amount_item.setText(f"{amount:.{amount_precision}f}")
+                time_item.setText(QDateTime.fromMSecsSinceEpoch(int(timestamp)).toString("HH:mm:ss"))
+        finally:
+            self.trade_tape_table.setUpdatesEnabled(True)
+        self.set_trade_tape_stats(stats)
+
+    def set_trade_tape_stats(self, stats: dict = None):
+        if self.trade_tape_stats_label and stats is not None:
+            self.trade_tape_stats_label.setText(
+                f"Объем 1м: {stats.get('volume_60s', 0.0):.0f} | 1ч: {stats.get('volume_60m', 0.0):.0f}\n"
+                f"Покупки/продажи 1м: {stats.get('imbalance_60s', 0.0) * 100:+.0f}%"
+            )
+
+    def clear_trade_tape(self):
+        self.set_trade_tape([], None)
+        if self.trade_tape_stats_label:
+            self.trade_tape_stats_label.setText("")
+
     def set_coin_pair_price(self, pair: str, price: str):
         if self.coin_pair_price_label:
             self.coin_pair_price_label.setText(f"{pair} : {price}")
@@ -368,12 +606,42 @@ class TradeUi(QWidget):
         self.prediction_label.setPalette(palette)
 
     def get_amount(self) -> str:
-        return self.amount_input.text().strip() if self.amount_input else ""
+        # Десятичная запятая допускается, как в подсказке по ордеру
+        return self.amount_input.text().strip().replace(',', '.') if self.amount_input else ""
 
     def clear_amount(self):
         if self.amount_input:
             self.amount_input.clear()
 
+    def get_order_type(self) -> str:
+        return self.order_type_combo.currentData() if self.order_type_combo else 'market'
+
+    def get_order_params(self) -> dict:
+        # Сырые строки дополнительных полей ордера (разбираются в TradeWidget)
+        return {
+            'price': self.price_input.text().strip(),
+            'stop_price': self.stop_price_input.text().strip(),
+            'duration_min': self.duration_input.text().strip(),
+            'slices': self.slices_input.text().strip(),
+        }
+
+    def set_execution_status(self, message: str):
+        if not self.execution_status_label:
+            return
+        self.execution_status_label.setText(message)
+        self.execution_status_label.setVisible(bool(message))
+
+    def set_order_hint(self, message: str, is_error: bool):
+        if not self.order_hint_label:
+            return
+        if not message:
+            self.order_hint_label.hide()
+            return
+        self.order_hint_label.setText(message)
+        color_hex = SELL_COLOR if is_error else SECONDARY_TEXT_COLOR
+        self.order_hint_label.setStyleSheet(f"color: {color_hex}; font-size: 11px;")
+        self.order_hint_label.show()
+
     def show_order_status(self, message: str, is_success: bool):
         if not self.order_status_label:
             return
@@ -1,19 +1,25 @@
 # src/widgets/coin_list_widget.py
+import time
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QMessageBox, QApplication, QListWidgetItem
 from PyQt5.QtCore import pyqtSignal, QThread, pyqtSlot, QTimer, Qt, QUrl
 from PyQt5.QtGui import QDesktopServices
 
 try:
     from ..ui.coin_list_ui import CoinListUi
-    from ..core.mexc_service import MexcService
+    from ..core.exchange_service import ExchangeService
+    from ..core.ui_profiler import profiled_slot
+    from ..core.refresh_scheduler import RefreshScheduler
 except ImportError:
     CoinListUi = None
-    MexcService = None
+    ExchangeService = None
+    RefreshScheduler = None
+    profiled_slot = lambda name=None: (lambda func: func)
 
 MAX_COINS_TO_DISPLAY = 50
 
 
 class LoadMarketsWorker(QThread):
+    markets_chunk_loaded = pyqtSignal(object)  # Порция разобранных рынков (по символу по возрастанию)
     load_finished = pyqtSignal(object, object)
 
     def __init__(self, mexc_service_instance, parent=None):
@@ -22,7 +28,9 @@ class LoadMarketsWorker(QThread):
 
     def run(self):
         try:
-            market_data_list, error_msg = self.mexc_service.load_markets_data()
+            market_data_list, error_msg = self.mexc_service.load_markets_data(
+                on_chunk=self.markets_chunk_loaded.emit
+            )
             self.load_finished.emit(market_data_list, error_msg)
         except Exception as e:
             self.load_finished.emit(None, f"Ошибка загрузки рынков: {e}")
@@ -31,10 +39,12 @@ class LoadMarketsWorker(QThread):
 class FetchTickersWorker(QThread):
     fetch_finished = pyqtSignal(object, object)
 
-    def __init__(self, mexc_service_instance, symbols_list, parent=None):
+    def __init__(self, mexc_service_instance, symbols_list, generation: int = 0, venue_hub=None, parent=None):
         super().__init__(parent)
         self.mexc_service = mexc_service_instance
         self.symbols = symbols_list
+        self.venue_hub = venue_hub  # Несколько площадок: цены основной плюс сводный bid/ask
+        self.generation = generation  # Поколение запроса списка, для которого запрошены цены
         self._is_running = True
 
     def run(self):
@@ -42,7 +52,10 @@ class FetchTickersWorker(QThread):
             self.fetch_finished.emit({}, None)
             return
         try:
-            tickers_data, error_msg = self.mexc_service.fetch_tickers(symbols=self.symbols)
+            if self.venue_hub is not None and self.venue_hub.is_multi_venue():
+                tickers_data, error_msg = self.venue_hub.fetch_tickers(self.symbols)
+            else:
+                tickers_data, error_msg = self.mexc_service.fetch_tickers(symbols=self.symbols)
             if self._is_running:
                 self.fetch_finished.emit(tickers_data, error_msg)
         except Exception as e:
@@ -56,13 +69,15 @@ class FetchTickersWorker(QThread):
 class CoinListWidget(QWidget):
     coin_trade_requested = pyqtSignal(dict)
     GITHUB_URL = "https://github.com/N01Ta/crypto_terminal"  # ВАШ URL
+    SEARCH_DEBOUNCE_MS = 250  # Фильтр применяется, когда пользователь перестал печатать
 
-    def __init__(self, mexc_service: MexcService, parent=None):
+    def __init__(self, mexc_service: ExchangeService, parent=None, scheduler=None, venue_hub=None):
         super().__init__(parent)
         if CoinListUi is None and not (parent and parent.objectName() == "TestMainWindow"):
             raise ImportError("CoinListUi not imported for CoinListWidget.")
 
         self.mexc_service = mexc_service
+        self.venue_hub = venue_hub
         self.ui = CoinListUi(self)
         layout = QVBoxLayout(self)
         layout.addWidget(self.ui)
@@ -72,16 +87,30 @@ class CoinListWidget(QWidget):
         self.load_markets_worker = None
         self.fetch_tickers_worker = None
         self.all_markets_data_full = []
+        self._streamed_markets = []  # Рынки, пришедшие порциями во время первой загрузки
         self.currently_displayed_items_info = []
+        self._prices_updated_at = 0.0
+        self._markets_checked_at = 0.0
+        # Каждое применение поиска/сортировки — новое поколение; цены старых поколений не отрисовываются
+        self._query_generation = 0
+        self._prices_request_pending = False  # Цены понадобились, пока шел запрос для прежнего списка
+
+        self._search_debounce_timer = QTimer(self)
+        self._search_debounce_timer.setSingleShot(True)
+        self._search_debounce_timer.timeout.connect(self.handle_sort_or_search_changed)
 
         self._connect_signals()
-        self.price_update_timer = QTimer(self)
-        self.price_update_timer.timeout.connect(self.request_price_updates_for_displayed_items)
+        # Цены обновляются только пока список на экране (пауза в RefreshScheduler)
+        self.refresh_scheduler = scheduler or RefreshScheduler(mexc_service.metrics, self)
+        self.price_update_timer = self.refresh_scheduler.add_job(
+            'coin_list.prices', self.request_price_updates_for_displayed_items, widget=self,
+            symbol=lambda: None  # Весь рынок: реже, пока открыта пара
+        )
         self.PRICE_UPDATE_INTERVAL_MS = 7000
 
     def _connect_signals(self):
         self.ui.sort_option_changed.connect(self.handle_sort_or_search_changed)
-        self.ui.search_text_changed.connect(self.handle_sort_or_search_changed)
+        self.ui.search_text_changed.connect(self._schedule_search)
         self.ui.coin_selected.connect(self._handle_coin_item_selected_from_ui_signal)
 
         if hasattr(self.ui, 'n_button') and hasattr(self.ui.n_button, 'clicked'):
@@ -98,31 +127,56 @@ class CoinListWidget(QWidget):
 
     def load_initial_markets_and_prices(self):
         if self.load_markets_worker and self.load_markets_worker.isRunning(): return
-        self.ui.set_status_message("Загрузка рынков...", False)
-        self._set_controls_enabled(False)
-        self.ui.clear_list_widget()
-        self.currently_displayed_items_info.clear()
-        self.price_update_timer.stop()
+        if self.all_markets_data_full:
+            # Список уже есть: показываем его сразу, рынки сверяются в фоне и список перестраивается при изменениях
+            self.request_price_updates_for_displayed_items()
+        else:
+            self.ui.set_status_message("Загрузка рынков...", False)
+            self._set_controls_enabled(False)
+            self.ui.clear_list_widget()
+            self.currently_displayed_items_info.clear()
+            self.price_update_timer.stop()
+        self._streamed_markets = []
 
         self.load_markets_worker = LoadMarketsWorker(self.mexc_service, self)
+        self.load_markets_worker.markets_chunk_loaded.connect(self._handle_markets_chunk_loaded)
         self.load_markets_worker.load_finished.connect(self._handle_markets_loaded)
         self.load_markets_worker.finished.connect(lambda: self._on_worker_finished("load_markets_worker"))
         self.load_markets_worker.start()
 
+    @pyqtSlot(object)
+    def _handle_markets_chunk_loaded(self, markets_chunk):
+        # Первая загрузка: показываем первый экран, не дожидаясь разбора всех рынков
+        if self.all_markets_data_full and not self._streamed_markets: return  # Фоновая сверка уже показанного списка
+        self._streamed_markets.extend(markets_chunk)
+        if len(self.currently_displayed_items_info) < MAX_COINS_TO_DISPLAY:
+            self.all_markets_data_full = list(self._streamed_markets)
+            self.handle_sort_or_search_changed()
+
     @pyqtSlot(object, object)
     def _handle_markets_loaded(self, market_data_list, error_message):
         self._set_controls_enabled(True)
+        self._streamed_markets = []
+        if not error_message:
+            self._markets_checked_at = time.monotonic()
         if error_message:
             self.ui.set_status_message(f"Ошибка рынков: {error_message}", True);
             return
         if market_data_list:
+            # Неизменившиеся рынки приходят теми же объектами, поэтому сравнение списков дешевое
+            if market_data_list == self.all_markets_data_full: return
             self.all_markets_data_full = market_data_list
             self.handle_sort_or_search_changed()
         else:
             self.ui.set_status_message("Рынки не загружены.", True)
 
     def request_price_updates_for_displayed_items(self):
-        if self.fetch_tickers_worker and self.fetch_tickers_worker.isRunning(): return
+        if self.fetch_tickers_worker and self.fetch_tickers_worker.isRunning():
+            if self.fetch_tickers_worker.generation != self._query_generation:
+                # Идущий запрос — для прежнего списка: его результат не нужен, повторим после завершения
+                self.fetch_tickers_worker.stop()
+                self._prices_request_pending = True
+            return
         symbols_to_fetch = [info['symbol'] for info in self.currently_displayed_items_info]
         if not symbols_to_fetch:
             if not self.price_update_timer.isActive() and self.all_markets_data_full:
@@ -130,32 +184,85 @@ class CoinListWidget(QWidget):
             return
 
         self.ui.set_status_message(f"Обновление цен ({len(symbols_to_fetch)})...", False)
-        self.fetch_tickers_worker = FetchTickersWorker(self.mexc_service, symbols_to_fetch, self)
+        self.fetch_tickers_worker = FetchTickersWorker(
+            self.mexc_service, symbols_to_fetch, self._query_generation, self.venue_hub, self
+        )
         self.fetch_tickers_worker.fetch_finished.connect(self._handle_tickers_fetched)
-        self.fetch_tickers_worker.finished.connect(lambda: self._on_worker_finished("fetch_tickers_worker"))
+        self.fetch_tickers_worker.finished.connect(self._on_fetch_tickers_worker_finished)
         self.fetch_tickers_worker.start()
 
+    def _on_fetch_tickers_worker_finished(self):
+        self._on_worker_finished("fetch_tickers_worker")
+        if self._prices_request_pending:
+            self._prices_request_pending = False
+            # Ответ отмененного запроса уже в общем кэше тикеров — сеть нужна только если его не хватило
+            self._request_prices_for_new_rows()
+
+    def _request_prices_for_new_rows(self):
+        # Цены новых строк из общего кэша тикеров; в сеть — только если для части строк их нет или они устарели
+        self._fill_prices_from_cache()
+        symbols = [info['symbol'] for info in self.currently_displayed_items_info]
+        if self.mexc_service.ticker_cache.missing(symbols, self.PRICE_UPDATE_INTERVAL_MS / 1000):
+            self.request_price_updates_for_displayed_items()
+        elif not self.price_update_timer.isActive() and self.all_markets_data_full:
+            self.price_update_timer.start(self.PRICE_UPDATE_INTERVAL_MS)
+
+    def _fill_prices_from_cache(self):
+        ticker_cache = self.mexc_service.ticker_cache
+        for item_info in self.currently_displayed_items_info:
+            ticker = ticker_cache.get(item_info['symbol'])
+            if ticker is not None:
+                self._set_item_price(item_info, ticker.get('last_price'))
+            if self.venue_hub is not None and self.venue_hub.is_multi_venue():
+                self._set_item_best_quotes(item_info, self.venue_hub.consolidated.best(item_info['symbol']))
+
+    @staticmethod
+    def _format_price(market_data: dict, price):
+        price_precision = market_data.get('precision', {}).get('price', 8)
+        try:
+            return f"{float(price):.{price_precision}f}", True
+        except (ValueError, TypeError):
+            return str(price), False
+
+    def _set_item_price(self, item_info: dict, price) -> bool:
+        list_widget_item = item_info['q_list_item']
+        market_data_for_item = list_widget_item.data(Qt.UserRole)
+        if price is None or not market_data_for_item:
+            return False
+        price_str, formatted = self._format_price(market_data_for_item, price)
+        list_widget_item.setText(f"{item_info['symbol']}\t{price_str}")
+        return formatted
+
+    def _set_item_best_quotes(self, item_info: dict, best: dict):
+        # Сводный bid/ask по площадкам — в подсказке строки, формат строки (символ\tцена) не меняется
+        if not best:
+            return
+        market_data_for_item = item_info['q_list_item'].data(Qt.UserRole) or {}
+        bid_str = self._format_price(market_data_for_item, best['best_bid'])[0] if best['best_bid'] else "---"
+        ask_str = self._format_price(market_data_for_item, best['best_ask'])[0] if best['best_ask'] else "---"
+        item_info['q_list_item'].setToolTip(
+            f"Лучший bid: {bid_str} ({best['best_bid_venue'] or '-'})\n"
+            f"Лучший ask: {ask_str} ({best['best_ask_venue'] or '-'})\n"
+            f"Площадок: {best['venues']}"
+        )
+
     @pyqtSlot(object, object)
+    @profiled_slot()
     def _handle_tickers_fetched(self, tickers_data_dict, error_message):
+        worker = self.sender()
+        if isinstance(worker, FetchTickersWorker) and worker.generation != self._query_generation:
+            return  # Цены для списка, который уже сменился; новые строки получат их из кэша тикеров
+        self.price_update_timer.report(error_message)
         if error_message: self.ui.set_status_message(f"Ошибка цен: {error_message}", True)
         updated_count = 0
         if isinstance(tickers_data_dict, dict) and tickers_data_dict:
             for item_info in self.currently_displayed_items_info:
-                symbol = item_info['symbol']
-                list_widget_item = item_info['q_list_item']
-                if symbol in tickers_data_dict:
-                    ticker_info = tickers_data_dict[symbol]
-                    if isinstance(ticker_info, dict):
-                        price = ticker_info.get('last_price')
-                        market_data_for_item = list_widget_item.data(Qt.UserRole)
-                        if price is not None and market_data_for_item:
-                            price_precision = market_data_for_item.get('precision', {}).get('price', 8)
-                            try:
-                                price_str = f"{float(price):.{price_precision}f}"
-                                list_widget_item.setText(f"{symbol}\t{price_str}")
-                                updated_count += 1
-                            except (ValueError, TypeError):
-                                list_widget_item.setText(f"{symbol}\t{str(price)}")
+                ticker_info = tickers_data_dict.get(item_info['symbol'])
+                if isinstance(ticker_info, dict) and self._set_item_price(item_info, ticker_info.get('last_price')):
+                    updated_count += 1
+                if isinstance(ticker_info, dict) and 'venues' in ticker_info:
+                    self._set_item_best_quotes(item_info, ticker_info)
+            self._prices_updated_at = time.monotonic()
             self.ui.set_status_message(
                 f"Цены обновлены ({updated_count}). Отображено: {len(self.currently_displayed_items_info)}", False
             )
@@ -166,7 +273,13 @@ class CoinListWidget(QWidget):
         if not self.price_update_timer.isActive():
             self.price_update_timer.start(self.PRICE_UPDATE_INTERVAL_MS)
 
+    def _schedule_search(self, _text: str = None):
+        # Каждое нажатие перезапускает ожидание: фильтр и цены — один раз на последний запрос
+        self._search_debounce_timer.start(self.SEARCH_DEBOUNCE_MS)
+
     def handle_sort_or_search_changed(self):
+        self._search_debounce_timer.stop()
+        self._query_generation += 1
         search_text = self.ui.search_line_edit.text().lower().strip()
         sort_option_text = self.ui.sort_combo_box.currentText()
         filtered_markets = list(self.all_markets_data_full)
@@ -176,10 +289,7 @@ class CoinListWidget(QWidget):
         if "Имя" in sort_option_text or "Цена" in sort_option_text:  # Цена пока тоже по имени
             filtered_markets.sort(key=lambda x: x['symbol'], reverse=reverse_sort)
         self._populate_qlistwidget_with_data(filtered_markets[:MAX_COINS_TO_DISPLAY])
-        if self.currently_displayed_items_info:
-            self.request_price_updates_for_displayed_items()
-        elif not self.price_update_timer.isActive() and self.all_markets_data_full:
-            self.price_update_timer.start(self.PRICE_UPDATE_INTERVAL_MS)
+        self._request_prices_for_new_rows()
 
     def _populate_qlistwidget_with_data(self, markets_to_display):
         self.ui.clear_list_widget()
@@ -216,8 +326,26 @@ class CoinListWidget(QWidget):
         worker = getattr(self, worker_attribute_name, None)
         if worker: worker.deleteLater(); setattr(self, worker_attribute_name, None)
 
+    def suspend(self):
+        """Уход с экрана: опрос цен останавливается, список и последние цены остаются."""
+        self.price_update_timer.stop()
+
+    def resume(self):
+        """Возврат на экран: список уже отрисован, цены и рынки обновляются, только если устарели."""
+        if not self.all_markets_data_full:
+            self.load_initial_markets_and_prices()
+            return
+        markets_age_sec = time.monotonic() - self._markets_checked_at
+        if markets_age_sec > self.mexc_service.MARKETS_MAX_AGE_SEC:
+            self.load_initial_markets_and_prices()  # Сверка рынков в фоне, внутри же запрос цен
+        elif (time.monotonic() - self._prices_updated_at) * 1000 >= self.PRICE_UPDATE_INTERVAL_MS:
+            self.request_price_updates_for_displayed_items()
+        if not self.price_update_timer.isActive():
+            self.price_update_timer.start(self.PRICE_UPDATE_INTERVAL_MS)
+
     def stop_updates(self):
         self.price_update_timer.stop()
+        self._search_debounce_timer.stop()
         for worker_attr in ["load_markets_worker", "fetch_tickers_worker"]:
             worker = getattr(self, worker_attr, None)
             if worker and worker.isRunning():
@@ -1,37 +1,67 @@
 # src/widgets/trade_widget.py
+import time
+from collections import OrderedDict
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QMessageBox
 from PyQt5.QtCore import pyqtSignal, QThread, pyqtSlot, QTimer, Qt, QUrl
 from PyQt5.QtGui import QColor, QPalette, QDesktopServices
 
 try:
-    from ..ui.trade_ui import TradeUi
-    from ..core.mexc_service import MexcService
+    from ..ui.trade_ui import TradeUi, ORDER_BOOK_DEPTH, TRADE_TAPE_ROWS
+    from ..core.exchange_service import ExchangeService
     from ..core.simple_predictor import get_simple_price_prediction
+    from ..core.order_book import L2OrderBook
+    from ..core.trade_tape import TradeTape
+    from ..core.order_rules import validate_market_order, validate_limit_order, is_finite_number
+    from ..core.execution_scheduler import (
+        ExecutionScheduler, ExecutionSchedulerWorker, StopLimitTask, SlicedOrderTask
+    )
+    from ..core.basket_executor import BasketOrderExecutor, parse_basket_text
+    from ..ui.basket_order_ui import BasketOrderDialog
+    from ..core.refresh_scheduler import RefreshScheduler
+    from ..core.ohlcv_backfill import timeframe_to_ms
 except ImportError:
     TradeUi = None
-    MexcService = None
+    ORDER_BOOK_DEPTH = 10
+    TRADE_TAPE_ROWS = 12
+    ExchangeService = None
     get_simple_price_prediction = None
+    L2OrderBook = None
+    TradeTape = None
+    validate_market_order = None
+    validate_limit_order = None
+    is_finite_number = None
+    ExecutionScheduler = None
+    ExecutionSchedulerWorker = None
+    StopLimitTask = None
+    SlicedOrderTask = None
+    BasketOrderExecutor = None
+    parse_basket_text = None
+    BasketOrderDialog = None
+    RefreshScheduler = None
+    timeframe_to_ms = None
 
 
 class FetchOhlcvWorker(QThread):
     fetch_finished = pyqtSignal(str, list, object)
 
-    def __init__(self, mexc_service_instance: MexcService, symbol: str, timeframe: str, limit: int, parent=None):
+    def __init__(self, mexc_service_instance: ExchangeService, symbol: str, timeframe: str, limit: int,
+                 since: int = None, parent=None):
         super().__init__(parent)
         self.mexc_service = mexc_service_instance
         self.symbol = symbol
         self.timeframe = timeframe
         self.limit = limit
+        self.since = since  # Догрузка свечей начиная с последней известной (None — последние limit)
         self._is_running = True
 
     def run(self):
         if not self.mexc_service:
             if self._is_running:
-                self.fetch_finished.emit(self.symbol, [], "MexcService не инициализирован")
+                self.fetch_finished.emit(self.symbol, [], "ExchangeService не инициализирован")
             return
         try:
             ohlcv_data, error_msg = self.mexc_service.fetch_ohlcv(
-                symbol=self.symbol, timeframe=self.timeframe, limit=self.limit
+                symbol=self.symbol, timeframe=self.timeframe, since=self.since, limit=self.limit
             )
             if self._is_running:
                 self.fetch_finished.emit(self.symbol, ohlcv_data or [], error_msg)
@@ -43,10 +73,56 @@ class FetchOhlcvWorker(QThread):
         self._is_running = False
 
 
+class FetchOrderBookWorker(QThread):
+    fetch_finished = pyqtSignal(str, object, object)
+
+    def __init__(self, mexc_service_instance: ExchangeService, symbol: str, limit: int, parent=None):
+        super().__init__(parent)
+        self.mexc_service = mexc_service_instance
+        self.symbol = symbol
+        self.limit = limit
+        self._is_running = True
+
+    def run(self):
+        try:
+            order_book, error_msg = self.mexc_service.fetch_order_book(symbol=self.symbol, limit=self.limit)
+            if self._is_running:
+                self.fetch_finished.emit(self.symbol, order_book, error_msg)
+        except Exception as e:
+            if self._is_running:
+                self.fetch_finished.emit(self.symbol, None, f"Ошибка в FetchOrderBookWorker: {e}")
+
+    def stop(self):
+        self._is_running = False
+
+
+class FetchTradesWorker(QThread):
+    fetch_finished = pyqtSignal(str, object, object)
+
+    def __init__(self, mexc_service_instance: ExchangeService, symbol: str, limit: int, parent=None):
+        super().__init__(parent)
+        self.mexc_service = mexc_service_instance
+        self.symbol = symbol
+        self.limit = limit
+        self._is_running = True
+
+    def run(self):
+        try:
+            trades, error_msg = self.mexc_service.fetch_trades(symbol=self.symbol, limit=self.limit)
+            if self._is_running:
+                self.fetch_finished.emit(self.symbol, trades, error_msg)
+        except Exception as e:
+            if self._is_running:
+                self.fetch_finished.emit(self.symbol, None, f"Ошибка в FetchTradesWorker: {e}")
+
+    def stop(self):
+        self._is_running = False
+
+
 class FetchBalancesWorker(QThread):
     fetch_finished = pyqtSignal(object, object)
 
-    def __init__(self, mexc_service_instance: MexcService, parent=None):
+    def __init__(self, mexc_service_instance: ExchangeService, parent=None):
         super().__init__(parent)
         self.mexc_service = mexc_service_instance
         self._is_running = True
@@ -54,7 +130,7 @@ class FetchBalancesWorker(QThread):
     def run(self):
         if not self.mexc_service:
             if self._is_running:
-                self.fetch_finished.emit(None, "MexcService не инициализирован")
+                self.fetch_finished.emit(None, "ExchangeService не инициализирован")
             return
         try:
             balances_data, error_msg = self.mexc_service.fetch_balances()
@@ -68,67 +144,98 @@ class FetchBalancesWorker(QThread):
         self._is_running = False
 
 
-class CreateOrderWorker(QThread):
-    order_finished = pyqtSignal(object, object, str)
+class PollOrdersWorker(QThread):
+    # (list событий OrderTracker, str ошибки или None)
+    poll_finished = pyqtSignal(object, object)
 
-    def __init__(self, mexc_service_instance: MexcService, symbol: str, side: str,
-                 amount_from_user: float, current_price: float,
-                 market_data: dict, parent=None):
+    def __init__(self, mexc_service_instance: ExchangeService, parent=None):
         super().__init__(parent)
         self.mexc_service = mexc_service_instance
-        self.symbol = symbol
-        self.side = side
-        self.amount_from_user = amount_from_user
-        self.current_price = current_price
-        self.market_data = market_data
         self._is_running = True
 
     def run(self):
-        if not self.mexc_service or not self.mexc_service.exchange:
-            if self._is_running: self.order_finished.emit(None, "MexcService или exchange не инициализирован",
-                                                          self.side); return
+        try:
+            tracker = self.mexc_service.order_tracker
+            symbols_since = tracker.open_orders_by_symbol()
+            if not symbols_since:
+                if self._is_running: self.poll_finished.emit([], None)
+                return
+            orders, error_msg = self.mexc_service.fetch_orders_for_symbols(symbols_since)
+            events = tracker.apply_updates(orders or [])
+            if self._is_running:
+                self.poll_finished.emit(events, error_msg)
+        except Exception as e:
+            if self._is_running:
+                self.poll_finished.emit([], f"Ошибка в PollOrdersWorker: {e}")
+
+    def stop(self):
+        self._is_running = False
 
-        actual_side = self.side.lower()
-        api_amount_arg = self.amount_from_user
 
-        precision_amount = self.market_data.get('precision', {}).get('amount', 8)
-        precision_cost = self.market_data.get('precision', {}).get('cost', 2)
-        limits_amount_min = self.market_data.get('limits', {}).get('amount', {}).get('min')
-        limits_cost_min = self.market_data.get('limits', {}).get('cost', {}).get('min')
+class BasketOrderWorker(QThread):
+    # (dict результата BasketOrderExecutor.execute или None, list ошибок)
+    basket_finished = pyqtSignal(object, object)
 
+    def __init__(self, mexc_service_instance: ExchangeService, basket_text: str, prices: dict = None, parent=None):
+        super().__init__(parent)
+        self.mexc_service = mexc_service_instance
+        self.basket_text = basket_text
+        self.prices = prices or {}
+        self._is_running = True
+
+    def run(self):
         try:
-            amount_base_adjusted = float(
-                self.mexc_service.exchange.amount_to_precision(self.symbol, self.amount_from_user))
-        except Exception as e_prec_amount:
-            if self._is_running: self.order_finished.emit(None, f"Ошибка округления кол-ва: {e_prec_amount}",
-                                                          actual_side); return
-            amount_base_adjusted = self.amount_from_user
-
-        if actual_side == 'buy':
-            if self.current_price is None or self.current_price <= 0:
-                if self._is_running: self.order_finished.emit(None, "Нет цены для расчета стоимости покупки.",
-                                                              actual_side); return
-            cost_calculated = amount_base_adjusted * self.current_price
-            try:
-                api_amount_arg = float(self.mexc_service.exchange.cost_to_precision(self.symbol, cost_calculated))
-            except Exception as e_prec_cost:
-                if self._is_running: self.order_finished.emit(None, f"Ошибка округления стоимости: {e_prec_cost}",
-                                                              actual_side); return
-                api_amount_arg = cost_calculated
-            if limits_cost_min is not None and api_amount_arg < limits_cost_min:
-                msg = f"Сумма ({api_amount_arg:.{precision_cost}f}) < min ({limits_cost_min})."
-                if self._is_running: self.order_finished.emit(None, msg, actual_side); return
-
-        elif actual_side == 'sell':
-            api_amount_arg = amount_base_adjusted
-            if limits_amount_min is not None and api_amount_arg < limits_amount_min:
-                msg = f"Кол-во ({api_amount_arg:.{precision_amount}f}) < min ({limits_amount_min})."
-                if self._is_running: self.order_finished.emit(None, msg, actual_side); return
+            legs, errors = parse_basket_text(self.basket_text)
+            if not errors and not legs:
+                errors = ["Корзина пуста"]
+            if errors:
+                if self._is_running: self.basket_finished.emit(None, errors)
+                return
+            executor = BasketOrderExecutor(self.mexc_service)
+            prepared, errors = executor.prepare(legs, self.prices)
+            if errors:
+                if self._is_running: self.basket_finished.emit(None, errors)
+                return
+            result = executor.execute(prepared)
+            if self._is_running:
+                self.basket_finished.emit(result, [])
+        except Exception as e:
+            if self._is_running:
+                self.basket_finished.emit(None, [f"Критическая ошибка корзины: {e}"])
+
+    def stop(self):
+        self._is_running = False
 
+
+class CreateOrderWorker(QThread):
+    order_finished = pyqtSignal(object, object, str)
+
+    def __init__(self, mexc_service_instance: ExchangeService, symbol: str, side: str,
+                 api_amount: float, order_type: str = 'market', price: float = None, parent=None):
+        super().__init__(parent)
+        self.mexc_service = mexc_service_instance
+        self.symbol = symbol
+        self.side = side
+        # Уже проверенный и округленный по OrderRule аргумент: для рыночной покупки — сумма QUOTE,
+        # для рыночной продажи и лимитных ордеров — кол-во BASE
+        self.api_amount = api_amount
+        self.order_type = order_type
+        self.price = price
+        self._is_running = True
+
+    def run(self):
+        if not self.mexc_service or not self.mexc_service.private_exchange:
+            if self._is_running: self.order_finished.emit(None, "ExchangeService или exchange не инициализирован",
+                                                          self.side); return
         try:
-            order_response, error_msg = self.mexc_service.create_market_order(
-                symbol=self.symbol, side=actual_side, amount=api_amount_arg
-            )
+            if self.order_type == 'limit':
+                order_response, error_msg = self.mexc_service.create_limit_order(
+                    symbol=self.symbol, side=self.side.lower(), amount=self.api_amount, price=self.price
+                )
+            else:
+                order_response, error_msg = self.mexc_service.create_market_order(
+                    symbol=self.symbol, side=self.side.lower(), amount=self.api_amount
+                )
             if self._is_running:
                 self.order_finished.emit(order_response, error_msg, self.side)
         except Exception as e:
@@ -145,11 +252,19 @@ class TradeWidget(QWidget):
     OHLCV_LIMIT = 100
     OHLCV_UPDATE_INTERVAL_MS = 30 * 1000
     PREDICTION_LOOKBACK = 5
-    BALANCES_UPDATE_INTERVAL_MS = 60 * 1000
-
-    def __init__(self, mexc_service: MexcService, parent=None):
+    BALANCES_UPDATE_INTERVAL_MS = 5 * 60 * 1000  # Редкая сверка кэша балансов полным снимком
+    BALANCES_POST_ORDER_RECONCILE_DELAY_MS = 1500  # Сверка после исполнения, которое не удалось применить дельтой
+    ORDERS_POLL_INTERVAL_MS = 3 * 1000
+    ORDER_BOOK_UPDATE_INTERVAL_MS = 2 * 1000
+    ORDER_BOOK_LIMIT = 50
+    ORDER_BOOK_MAX_AGE_SEC = 10
+    TRADES_UPDATE_INTERVAL_MS = 1500
+    TRADES_LIMIT = 100
+    SYMBOL_STATE_CACHE_SIZE = 8  # Сколько недавно открытых пар держать в памяти для мгновенного возврата
+
+    def __init__(self, mexc_service: ExchangeService, parent=None, scheduler=None):
         super().__init__(parent)
-        if None in [TradeUi, MexcService, get_simple_price_prediction] and not isinstance(self, MockTradeWidgetForTest):
+        if None in [TradeUi, ExchangeService, get_simple_price_prediction] and not isinstance(self, MockTradeWidgetForTest):
             raise ImportError("TradeWidget: Critical components (UI, Service, Predictor) not available.")
 
         self.mexc_service = mexc_service
@@ -162,16 +277,45 @@ class TradeWidget(QWidget):
         self.current_market_data = None
         self.current_ohlcv_data = []
         self.current_last_price = None
+        self.order_book = L2OrderBook()
+        self.trade_tape = TradeTape()
+        # символ -> {'ohlcv', 'last_price', 'order_book', 'trade_tape'} для недавно открытых пар
+        self._symbol_states = OrderedDict()
+        self.suspended = False
 
         self.fetch_ohlcv_worker = None
+        self.fetch_order_book_worker = None
+        self.fetch_trades_worker = None
         self.fetch_balances_worker = None
         self.create_order_worker = None
-
-        self.ohlcv_update_timer = QTimer(self)
-        self.ohlcv_update_timer.timeout.connect(self._request_ohlcv_update)  # ИСПРАВЛЕНО
-
-        self.balances_update_timer = QTimer(self)
-        self.balances_update_timer.timeout.connect(self._request_balances_update)
+        self.poll_orders_worker = None
+        self.basket_order_worker = None
+        self.basket_dialog = None
+        # Локальное исполнение стоп-лимит/TWAP/айсберг; задачи живут независимо от открытой пары
+        self.execution_scheduler = ExecutionScheduler(mexc_service) if ExecutionScheduler else None
+        self.execution_scheduler_worker = None
+        self._execution_scheduler_stopped = False
+
+        # Опросы идут через общий RefreshScheduler: пауза, пока экран скрыт, и замедление в фоне
+        self.refresh_scheduler = scheduler or RefreshScheduler(mexc_service.metrics, self)
+        current_symbol = lambda: self.current_market_data.get('symbol') if self.current_market_data else None
+
+        self.ohlcv_update_timer = self.refresh_scheduler.add_job(
+            'trade.ohlcv', self._request_ohlcv_update, widget=self, symbol=current_symbol,
+            align_ms=timeframe_to_ms(self.OHLCV_TIMEFRAME)
+        )
+        self.balances_update_timer = self.refresh_scheduler.add_job(
+            'trade.balances', self._request_balances_update, widget=self
+        )
+        self.order_book_update_timer = self.refresh_scheduler.add_job(
+            'trade.order_book', self._request_order_book_update, widget=self, symbol=current_symbol
+        )
+        self.trades_update_timer = self.refresh_scheduler.add_job(
+            'trade.trades', self._request_trades_update, widget=self, symbol=current_symbol
+        )
+        # Один общий цикл опроса для всех отслеживаемых ордеров; работает только пока есть открытые.
+        # Без привязки к виджету: исполнения отслеживаются и с экрана списка монет
+        self.orders_poll_timer = self.refresh_scheduler.add_job('trade.orders_poll', self._request_orders_poll)
 
         self._connect_ui_signals()
 
@@ -179,13 +323,26 @@ class TradeWidget(QWidget):
         self.ui.back_button_clicked.connect(self.navigate_back.emit)
         self.ui.buy_button_clicked.connect(self._handle_buy_action)
         self.ui.sell_button_clicked.connect(self._handle_sell_action)
+        self.ui.amount_text_changed.connect(self._handle_amount_changed)
+        self.ui.basket_button_clicked.connect(self._open_basket_dialog)
 
     def set_market_data(self, market_data: dict):
+        symbol = market_data.get('symbol') if market_data else None
+        if symbol and self.current_market_data and symbol == self.current_market_data.get('symbol'):
+            # Та же пара: данные на экране актуальны, только возобновляем обновления
+            self.current_market_data = market_data
+            self.resume()
+            return
+
         self.stop_all_updates()
+        self._stash_symbol_state()
         self.current_market_data = market_data
-        self.current_ohlcv_data = []
-        self.current_last_price = None
+        self.suspended = False
+        self.refresh_scheduler.set_focus_symbol(symbol)
+        restored = self._restore_symbol_state(symbol)
         self.ui.clear_chart()
+        self.ui.clear_order_book()
+        self.ui.clear_trade_tape()
 
         if not market_data:
             self.ui.set_coin_pair_price("N/A", "N/A")
@@ -199,24 +356,96 @@ class TradeWidget(QWidget):
             try:
                 self.current_last_price = float(market_data['current_price_from_list'])
             except (ValueError, TypeError):
-                self.current_last_price = None
-            initial_price = str(self.current_last_price) if self.current_last_price is not None else "---"
-        else:
-            initial_price = "---"
+                pass  # Остается последняя цена из сохраненного состояния пары (или None)
+        initial_price = str(self.current_last_price) if self.current_last_price is not None else "---"
         self.ui.set_coin_pair_price(symbol, initial_price)
 
         base_asset = market_data.get('base', 'BASE')
         quote_asset = market_data.get('quote', 'QUOTE')
         self.ui.set_balances(base_asset, "загрузка...", quote_asset, "загрузка...")
 
-        if hasattr(self.ui, 'prediction_label') and self.ui.prediction_label:
+        if restored:
+            self._render_symbol_state()
+        elif hasattr(self.ui, 'prediction_label') and self.ui.prediction_label:
             self.ui.set_prediction("Загрузка графика...", self.ui.prediction_label.palette().color(QPalette.WindowText))
 
         self.ui.hide_order_status()
         self.ui.clear_amount()
 
         self.start_ohlcv_updates()
+        self.start_order_book_updates()
+        self.start_trades_updates()
         self.start_balances_updates()
+        self.start_orders_polling()
+
+    def suspend(self):
+        """Уход с экрана торговли: опросы пары останавливаются, ее данные остаются в памяти."""
+        self.suspended = True
+        self.refresh_scheduler.set_focus_symbol(None)
+        # Опрос ордеров и локальное исполнение продолжают работать с любого экрана
+        self.ohlcv_update_timer.stop()
+        self.order_book_update_timer.stop()
+        self.trades_update_timer.stop()
+        self.balances_update_timer.stop()
+
+    def resume(self):
+        """Возврат на экран: последние данные уже отрисованы, обновления продолжаются с места остановки."""
+        self.suspended = False
+        if not self.current_market_data: return
+        self.refresh_scheduler.set_focus_symbol(self.current_market_data.get('symbol'))
+        self.start_ohlcv_updates()
+        self.start_order_book_updates()
+        self.start_trades_updates()
+        self.start_balances_updates()
+        self.start_orders_polling()
+
+    def _stash_symbol_state(self):
+        symbol = self.current_market_data.get('symbol') if self.current_market_data else None
+        if not symbol: return
+        self._symbol_states[symbol] = {
+            'ohlcv': self.current_ohlcv_data, 'last_price': self.current_last_price,
+            'order_book': self.order_book, 'trade_tape': self.trade_tape,
+        }
+        self._symbol_states.move_to_end(symbol)
+        while len(self._symbol_states) > self.SYMBOL_STATE_CACHE_SIZE:
+            self._symbol_states.popitem(last=False)
+
+    def _restore_symbol_state(self, symbol) -> bool:
+        state = self._symbol_states.pop(symbol, None) if symbol else None
+        if state is None:
+            self.current_ohlcv_data = []
+            self.current_last_price = None
+            self.order_book = L2OrderBook(symbol)
+            self.trade_tape = TradeTape(symbol)
+            return False
+        self.current_ohlcv_data = state['ohlcv']
+        self.current_last_price = state['last_price']
+        self.order_book = state['order_book']
+        self.order_book.needs_resync = True  # Диффы за время отсутствия пропущены — ждем свежий снимок
+        self.trade_tape = state['trade_tape']
+        return True
+
+    def _render_symbol_state(self):
+        # Мгновенная отрисовка сохраненных данных пары до прихода свежих
+        symbol = self.current_market_data['symbol']
+        if self.current_ohlcv_data:
+            self._render_ohlcv(symbol)
+        if self.order_book.bids or self.order_book.asks:
+            self._refresh_order_book_view()
+        if len(self.trade_tape.buffer):
+            self._refresh_trade_tape_view()
+
+    def start_order_book_updates(self):
+        if self.current_market_data:
+            QTimer.singleShot(0, self._request_order_book_update)
+            if not self.order_book_update_timer.isActive():
+                self.order_book_update_timer.start(self.ORDER_BOOK_UPDATE_INTERVAL_MS)
+
+    def start_trades_updates(self):
+        if self.current_market_data:
+            QTimer.singleShot(0, self._request_trades_update)
+            if not self.trades_update_timer.isActive():
+                self.trades_update_timer.start(self.TRADES_UPDATE_INTERVAL_MS)
 
     def start_ohlcv_updates(self):
         if self.current_market_data:
@@ -226,7 +455,12 @@ class TradeWidget(QWidget):
 
     def start_balances_updates(self):
         if self.mexc_service.api_key and self.mexc_service.api_secret:
-            QTimer.singleShot(0, self._request_balances_update)
+            # Если кэш уже загружен, балансы показываются сразу, без запроса к бирже
+            cache = self.mexc_service.balance_cache
+            if cache.is_loaded():
+                self._render_balances_from_cache()
+            if cache.needs_reconciliation(self.BALANCES_UPDATE_INTERVAL_MS / 1000):
+                QTimer.singleShot(0, self._request_balances_update)
             if not self.balances_update_timer.isActive():
                 self.balances_update_timer.start(self.BALANCES_UPDATE_INTERVAL_MS)
         else:
@@ -239,13 +473,43 @@ class TradeWidget(QWidget):
         if self.fetch_ohlcv_worker and self.fetch_ohlcv_worker.isRunning(): return
 
         symbol = self.current_market_data['symbol']
+        # Есть свечи пары — догружаем только с последней (она могла быть еще не закрыта).
+        # Если пара не обновлялась дольше OHLCV_LIMIT свечей, догрузка с нее не дойдет до
+        # текущего времени: кэш сбрасываем и берем последние свечи целиком
+        since = self.current_ohlcv_data[-1][0] if self.current_ohlcv_data else None
+        max_gap_ms = (self.OHLCV_LIMIT - 1) * timeframe_to_ms(self.OHLCV_TIMEFRAME)
+        if since is not None and time.time() * 1000 - since >= max_gap_ms:
+            self.current_ohlcv_data = []
+            since = None
         self.fetch_ohlcv_worker = FetchOhlcvWorker(
-            self.mexc_service, symbol, self.OHLCV_TIMEFRAME, self.OHLCV_LIMIT, self
+            self.mexc_service, symbol, self.OHLCV_TIMEFRAME, self.OHLCV_LIMIT, since, self
         )
         self.fetch_ohlcv_worker.fetch_finished.connect(self._handle_ohlcv_fetched)
         self.fetch_ohlcv_worker.finished.connect(self._on_ohlcv_worker_finished)
         self.fetch_ohlcv_worker.start()
 
+    def _request_order_book_update(self):
+        if not self.current_market_data: return
+        if self.fetch_order_book_worker and self.fetch_order_book_worker.isRunning(): return
+
+        self.fetch_order_book_worker = FetchOrderBookWorker(
+            self.mexc_service, self.current_market_data['symbol'], self.ORDER_BOOK_LIMIT, self
+        )
+        self.fetch_order_book_worker.fetch_finished.connect(self._handle_order_book_fetched)
+        self.fetch_order_book_worker.finished.connect(self._on_order_book_worker_finished)
+        self.fetch_order_book_worker.start()
+
+    def _request_trades_update(self):
+        if not self.current_market_data: return
+        if self.fetch_trades_worker and self.fetch_trades_worker.isRunning(): return
+
+        self.fetch_trades_worker = FetchTradesWorker(
+            self.mexc_service, self.current_market_data['symbol'], self.TRADES_LIMIT, self
+        )
+        self.fetch_trades_worker.fetch_finished.connect(self._handle_trades_fetched)
+        self.fetch_trades_worker.finished.connect(self._on_trades_worker_finished)
+        self.fetch_trades_worker.start()
+
     def _request_balances_update(self):
         if not (self.mexc_service.api_key and self.mexc_service.api_secret):
             if self.current_market_data and hasattr(self.ui, 'balance_base_label') and self.ui.balance_base_label:
@@ -263,19 +527,35 @@ class TradeWidget(QWidget):
 
     @pyqtSlot(str, list, object)
     def _handle_ohlcv_fetched(self, symbol: str, ohlcv_data: list, error_message):
+        self.ohlcv_update_timer.report(error_message)
         if not self.current_market_data or symbol != self.current_market_data.get('symbol'): return
         if error_message:
             self.ui.set_prediction(f"Ошибка графика: {error_message}", QColor("red"))
             return
 
-        price_precision = self.current_market_data.get('precision', {}).get('price', 2)
+        if not ohlcv_data and self.current_ohlcv_data:
+            return  # Догрузка без новых свечей
         if not ohlcv_data:
+            price_precision = self.current_market_data.get('precision', {}).get('price', 2)
             self.ui.draw_price_chart([], None, price_precision)
             self.ui.set_prediction("Нет данных для графика", QColor("gray"))
             self.current_last_price = None
             return
 
-        self.current_ohlcv_data = ohlcv_data
+        self.current_ohlcv_data = self._merge_ohlcv(self.current_ohlcv_data, ohlcv_data)
+        self._render_ohlcv(symbol)
+
+    def _merge_ohlcv(self, existing: list, fetched: list) -> list:
+        # Свечи с отметкой >= первой полученной заменяются свежими; хвост ограничен OHLCV_LIMIT
+        if not existing or fetched[0][0] <= existing[0][0]:
+            return fetched[-self.OHLCV_LIMIT:]
+        first_ts = fetched[0][0]
+        kept = [candle for candle in existing if candle[0] < first_ts]
+        return (kept + fetched)[-self.OHLCV_LIMIT:]
+
+    def _render_ohlcv(self, symbol: str):
+        ohlcv_data = self.current_ohlcv_data
+        price_precision = self.current_market_data.get('precision', {}).get('price', 2)
         try:
             self.current_last_price = float(ohlcv_data[-1][4])
             self.ui.set_coin_pair_price(symbol, f"{self.current_last_price:.{price_precision}f}")
@@ -290,38 +570,92 @@ class TradeWidget(QWidget):
         prediction_chart_data = (predicted_price, trend_desc, trend_color) if predicted_price is not None else None
         self.ui.draw_price_chart(self.current_ohlcv_data, prediction_chart_data, price_precision)
 
+    @pyqtSlot(str, object, object)
+    def _handle_order_book_fetched(self, symbol: str, order_book_data, error_message):
+        self.order_book_update_timer.report(error_message)
+        if not self.current_market_data or symbol != self.current_market_data.get('symbol'): return
+        if error_message or not order_book_data:
+            # Книга считается рассинхронизированной до следующего успешного снимка
+            self.order_book.needs_resync = True
+            return
+        # Источник книги — REST-снимки по таймеру (потока диффов у сервиса пока нет)
+        self.order_book.apply_snapshot(order_book_data['bids'], order_book_data['asks'], order_book_data.get('nonce'))
+        self._refresh_order_book_view()
+
+    def _refresh_order_book_view(self):
+        precision = self.current_market_data.get('precision', {}) if self.current_market_data else {}
+        bids, asks = self.order_book.top(ORDER_BOOK_DEPTH)
+        self.ui.set_order_book(bids, asks, precision.get('price', 2), precision.get('amount', 4))
+
+    def _estimate_buy_cost_from_book(self, base_amount: float):
+        # Стоимость покупки по реальной глубине стакана; None если стакан недоступен
+        if not self.order_book.is_fresh(self.ORDER_BOOK_MAX_AGE_SEC):
+            return None
+        estimate = self.order_book.estimate_market_buy(base_amount)
+        if not estimate:
+            return None
+        if not estimate['fully_covered']:
+            # Остаток, не покрытый загруженной глубиной, оцениваем по худшей цене
+            estimate['cost'] += (base_amount - estimate['filled']) * estimate['worst_price']
+        return estimate
+
+    @pyqtSlot(str, object, object)
+    def _handle_trades_fetched(self, symbol: str, trades, error_message):
+        self.trades_update_timer.report(error_message)
+        if not self.current_market_data or symbol != self.current_market_data.get('symbol'): return
+        if error_message: return
+        # Разбор и сжатие сделок уже выполнены в потоке; здесь только O(k) вставка в кольцевой буфер
+        if not trades or self.trade_tape.add_trades(trades) == 0:
+            # Новых сделок нет — сдвигаем окна объемов, чтобы в тихом рынке статистика затухала
+            self.ui.set_trade_tape_stats(self.trade_tape.stats(now_ms=time.time() * 1000))
+            return
+        self._refresh_trade_tape_view()
+
+    def _refresh_trade_tape_view(self):
+        precision = self.current_market_data.get('precision', {})
+        self.ui.set_trade_tape(
+            self.trade_tape.buffer.latest(TRADE_TAPE_ROWS),
+            self.trade_tape.stats(now_ms=time.time() * 1000),
+            precision.get('price', 2), precision.get('amount', 4)
+        )
+
     @pyqtSlot(object, object)
     def _handle_balances_fetched(self, balances_data, error_message):
+        self.balances_update_timer.report(error_message)
+        # Снимок уже применен к mexc_service.balance_cache в потоке; здесь только отрисовка
         base_asset = self.current_market_data.get('base', 'B') if self.current_market_data else 'B'
         quote_asset = self.current_market_data.get('quote', 'Q') if self.current_market_data else 'Q'
-        base_precision = self.current_market_data.get('precision', {}).get('amount',
-                                                                           4) if self.current_market_data else 4
-        quote_precision = self.current_market_data.get('precision', {}).get('cost',
-                                                                            2) if self.current_market_data else 2
-
-        if error_message: self.ui.set_balances(base_asset, "Ошибка", quote_asset, "Ошибка");return
-        if not balances_data or not self.current_market_data: self.ui.set_balances(base_asset, "---", quote_asset,
-                                                                                   "---");return
-
-        base_val = 0.0;
-        qv = 0.0
-        if 'free' in balances_data and isinstance(balances_data['free'], dict):
-            base_val = balances_data['free'].get(base_asset, 0.0)
-            qv = balances_data['free'].get(quote_asset, 0.0)
 
-        try:
-            base_s = f"{float(base_val):.{base_precision}f}"
-        except:
-            base_s = str(base_val)
-        try:
-            quote_s = f"{float(qv):.{quote_precision}f}"
-        except:
-            quote_s = str(qv)
+        if error_message and not self.mexc_service.balance_cache.is_loaded():
+            self.ui.set_balances(base_asset, "Ошибка", quote_asset, "Ошибка");return
+        self._render_balances_from_cache()
 
+    def _render_balances_from_cache(self):
+        if not self.current_market_data: return
+        cache = self.mexc_service.balance_cache
+        base_asset = self.current_market_data.get('base', 'B')
+        quote_asset = self.current_market_data.get('quote', 'Q')
+        if not cache.is_loaded():
+            self.ui.set_balances(base_asset, "---", quote_asset, "---");return
+        base_precision = self.current_market_data.get('precision', {}).get('amount', 4)
+        quote_precision = self.current_market_data.get('precision', {}).get('cost', 2)
+
+        base_s = f"{cache.get_free(base_asset):.{base_precision}f}"
+        quote_s = f"{cache.get_free(quote_asset):.{quote_precision}f}"
         self.ui.set_balances(base_asset, base_s, quote_asset, quote_s)
 
-    @pyqtSlot(object, object, str)
-    def _handle_order_finished(self, order_response, error_message, order_side_str):
+    def _start_create_order_worker(self, worker: CreateOrderWorker):
+        # Ответ учитывается по паре, на которой ордер отправлен: пользователь мог уже сменить пару
+        market_data = self.current_market_data
+        self.create_order_worker = worker
+        worker.order_finished.connect(
+            lambda response, error, side_str: self._handle_order_finished(response, error, side_str, market_data)
+        )
+        worker.finished.connect(self._on_create_order_worker_finished)
+        worker.start()
+
+    def _handle_order_finished(self, order_response, error_message, order_side_str, market_data: dict = None):
+        market_data = market_data or self.current_market_data
         self.ui.buy_button.setEnabled(True)
         self.ui.sell_button.setEnabled(True)
 
@@ -335,17 +669,76 @@ class TradeWidget(QWidget):
             status_msg = f"Ордер ({order_side_str}) ID:{order_id}."
             try:
                 if filled is not None and float(filled) > 0:
-                    p_amt = self.current_market_data.get('precision', {}).get('amount', 4)
+                    p_amt = market_data.get('precision', {}).get('amount', 4)
                     status_msg += f" Исп.: {float(filled):.{p_amt}f}"
             except:
                 pass
 
             self.ui.show_order_status(status_msg, True)
-            self.ui.clear_amount()
-            self._request_balances_update()
+            if self.current_market_data and market_data.get('symbol') == self.current_market_data.get('symbol'):
+                self.ui.clear_amount()
+            # Ордер ставится на учет в OrderTracker: уже исполненная часть сразу попадает в кэш балансов,
+            # остальное придет через общий опрос ордеров
+            if not order_response.get('symbol'): order_response['symbol'] = market_data.get('symbol')
+            if not order_response.get('side'): order_response['side'] = order_side_str.lower()
+            events = self.mexc_service.order_tracker.track(
+                order_response, market_data.get('base'), market_data.get('quote')
+            )
+            self._handle_order_events(events)
+            self.start_orders_polling()
         else:
             self.ui.show_order_status(f"Ордер ({order_side_str}) не вернул данных.", False)
 
+    def start_orders_polling(self):
+        if self.mexc_service.order_tracker.has_open_orders() and not self.orders_poll_timer.isActive():
+            self.orders_poll_timer.start(self.ORDERS_POLL_INTERVAL_MS)
+
+    def _request_orders_poll(self):
+        if not self.mexc_service.order_tracker.has_open_orders():
+            self.orders_poll_timer.stop()
+            return
+        if self.poll_orders_worker and self.poll_orders_worker.isRunning(): return
+
+        self.poll_orders_worker = PollOrdersWorker(self.mexc_service, self)
+        self.poll_orders_worker.poll_finished.connect(self._handle_orders_polled)
+        self.poll_orders_worker.finished.connect(self._on_poll_orders_worker_finished)
+        self.poll_orders_worker.start()
+
+    @pyqtSlot(object, object)
+    def _handle_orders_polled(self, events, error_message):
+        self.orders_poll_timer.report(error_message)
+        if error_message:
+            print(f"TradeWidget: orders poll error: {error_message}")
+        self._handle_order_events(events or [])
+        if not self.mexc_service.order_tracker.has_open_orders():
+            self.orders_poll_timer.stop()
+
+    def _handle_order_events(self, events: list):
+        # События OrderTracker: частичное/полное исполнение, отмена
+        if not events:
+            return
+        balances_changed = False
+        for event in events:
+            order = event['order']
+            p_amt = 4
+            if self.current_market_data and order.get('symbol') == self.current_market_data.get('symbol'):
+                p_amt = self.current_market_data.get('precision', {}).get('amount', 4)
+            if event['type'] in ('fill', 'partial_fill'):
+                balances_changed = True
+                label = "исполнен" if event['type'] == 'fill' else "исполнен частично"
+                self.ui.show_order_status(
+                    f"Ордер {order.get('symbol')} ID:{order['id']} {label}: {order['filled']:.{p_amt}f}", True
+                )
+            else:
+                self.ui.show_order_status(f"Ордер {order.get('symbol')} ID:{order['id']}: {event['type']}", False)
+        if balances_changed:
+            self._render_balances_from_cache()
+        if self.mexc_service.balance_cache.stale:
+            QTimer.singleShot(self.BALANCES_POST_ORDER_RECONCILE_DELAY_MS, self._request_balances_update)
+
+    def _on_poll_orders_worker_finished(self):
+        self._on_worker_finished_generic("poll_orders_worker")
+
     def _on_worker_finished_generic(self, worker_attr_name):
         worker = getattr(self, worker_attr_name, None)
         if worker and self.sender() == worker:
@@ -355,6 +748,12 @@ class TradeWidget(QWidget):
     def _on_ohlcv_worker_finished(self):
         self._on_worker_finished_generic("fetch_ohlcv_worker")
 
+    def _on_order_book_worker_finished(self):
+        self._on_worker_finished_generic("fetch_order_book_worker")
+
+    def _on_trades_worker_finished(self):
+        self._on_worker_finished_generic("fetch_trades_worker")
+
     def _on_balances_worker_finished(self):
         self._on_worker_finished_generic("fetch_balances_worker")
 
@@ -378,33 +777,246 @@ class TradeWidget(QWidget):
             return
         try:
             amount_from_input_base = float(amount_str)
+            if not is_finite_number(amount_from_input_base): raise ValueError("ожидается число")
             if amount_from_input_base <= 0: raise ValueError("Количество должно быть положительным")
         except ValueError as e:
             QMessageBox.warning(self, "Ошибка ввода", f"Некорректное количество: {e}");
             return
 
+        order_type = self.ui.get_order_type()
+        if order_type == 'limit':
+            self._initiate_limit_order(side, amount_from_input_base)
+            return
+        if order_type in ('stop_limit', 'twap', 'iceberg'):
+            self._add_execution_task(order_type, side, amount_from_input_base)
+            return
+
         symbol = self.current_market_data['symbol']
-        price_for_buy_cost_calculation = self.current_last_price
+        validation, book_estimate = self._validate_order(side, amount_from_input_base)
+        if not validation['ok']:
+            QMessageBox.warning(self, "Ошибка ордера", f"{validation['error']}.");
+            return
+
+        status_msg = f"Отправка {side.lower()} ордера..."
+        if book_estimate:
+            status_msg += f" Проскальзывание ~{book_estimate['slippage_pct']:.2f}%"
+        self.ui.show_order_status(status_msg, False)
+        self.ui.buy_button.setEnabled(False);
+        self.ui.sell_button.setEnabled(False)
 
-        if side.lower() == 'buy' and (price_for_buy_cost_calculation is None or price_for_buy_cost_calculation <= 0):
-            QMessageBox.warning(self, "Ошибка цены",
-                                "Нет цены для расчета стоимости покупки. Дождитесь обновления графика.");
+        self._start_create_order_worker(CreateOrderWorker(
+            self.mexc_service, symbol, side, api_amount=validation['api_amount'], parent=self
+        ))
+
+    def _parse_order_param(self, key: str, title: str, as_int: bool = False):
+        raw = self.ui.get_order_params().get(key, '').replace(',', '.')
+        try:
+            value = int(raw) if as_int else float(raw)
+            if not is_finite_number(value) or value <= 0: raise ValueError
+            return value
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка ввода", f"Некорректное значение: {title}.")
+            return None
+
+    def _initiate_limit_order(self, side: str, amount_base: float):
+        price = self._parse_order_param('price', "лимитная цена")
+        if price is None:
+            return
+        rule = self.mexc_service.order_rules.get_or_build(self.current_market_data)
+        cache = self.mexc_service.balance_cache
+        free_base = cache.get_free(rule.base) if cache.is_loaded() else None
+        free_quote = cache.get_free(rule.quote) if cache.is_loaded() else None
+        validation = validate_limit_order(rule, side, amount_base, price, free_base, free_quote)
+        if not validation['ok']:
+            QMessageBox.warning(self, "Ошибка ордера", f"{validation['error']}.");
             return
 
-        self.ui.show_order_status(f"Отправка {side.lower()} ордера...", False)
+        self.ui.show_order_status(f"Отправка лимитного {side.lower()} ордера по {validation['price']}...", False)
         self.ui.buy_button.setEnabled(False);
         self.ui.sell_button.setEnabled(False)
+        self._start_create_order_worker(CreateOrderWorker(
+            self.mexc_service, self.current_market_data['symbol'], side, api_amount=validation['amount'],
+            order_type='limit', price=validation['price'], parent=self
+        ))
+
+    def _add_execution_task(self, order_type: str, side: str, amount_base: float):
+        if self.execution_scheduler is None:
+            QMessageBox.warning(self, "Ошибка", "Планировщик исполнения недоступен.");
+            return
+        symbol = self.current_market_data['symbol']
+        self.mexc_service.order_rules.get_or_build(self.current_market_data)
+        if order_type == 'stop_limit':
+            stop_price = self._parse_order_param('stop_price', "стоп-цена")
+            limit_price = self._parse_order_param('price', "лимитная цена") if stop_price else None
+            if limit_price is None:
+                return
+            task = StopLimitTask(symbol, side, amount_base, stop_price, limit_price)
+        else:
+            duration_min = self._parse_order_param('duration_min', "длительность")
+            slices = self._parse_order_param('slices', "кол-во частей", as_int=True) if duration_min else None
+            if slices is None:
+                return
+            task = SlicedOrderTask(symbol, side, amount_base, duration_min * 60, slices, mode=order_type)
+
+        self.execution_scheduler.add_task(task)
+        self.ui.show_order_status(f"Задача #{task.task_id} ({order_type}) добавлена в планировщик.", True)
+        self.ui.clear_amount()
+        self.start_execution_scheduler()
 
-        self.create_order_worker = CreateOrderWorker(
-            self.mexc_service, symbol, side,
-            amount_from_user=amount_from_input_base,
-            current_price=price_for_buy_cost_calculation,
-            market_data=self.current_market_data,  # Передаем полные market_data
-            parent=self
-        )
-        self.create_order_worker.order_finished.connect(self._handle_order_finished)
-        self.create_order_worker.finished.connect(self._on_create_order_worker_finished)
-        self.create_order_worker.start()
+    def start_execution_scheduler(self):
+        self._execution_scheduler_stopped = False
+        if self.execution_scheduler_worker and self.execution_scheduler_worker.isRunning():
+            return
+        self.execution_scheduler_worker = ExecutionSchedulerWorker(self.execution_scheduler, self)
+        self.execution_scheduler_worker.scheduler_progress.connect(self._handle_scheduler_progress)
+        self.execution_scheduler_worker.finished.connect(self._on_execution_scheduler_worker_finished)
+        self.execution_scheduler_worker.start()
+
+    @pyqtSlot(object, object)
+    def _handle_scheduler_progress(self, progress: list, events: list):
+        # Дочерние ордера уже зарегистрированы в OrderTracker; их исполнение приходит через общий опрос
+        self._handle_order_events(events or [])
+        self.start_orders_polling()
+        lines = []
+        for task in progress or []:
+            line = f"#{task['task_id']} {task['kind']} {task['symbol']} {task['side']}: {task['message']}"
+            if task['filled']:
+                line += f" (исп. {task['filled']:.8g})"
+            lines.append(line)
+        self.ui.set_execution_status("\n".join(lines))
+
+    def _on_execution_scheduler_worker_finished(self):
+        self._on_worker_finished_generic("execution_scheduler_worker")
+        # Задача могла быть добавлена, пока поток завершался
+        if (not self._execution_scheduler_stopped and self.execution_scheduler
+                and self.execution_scheduler.has_active_tasks()):
+            self.start_execution_scheduler()
+
+    def stop_execution_scheduler(self):
+        self._execution_scheduler_stopped = True
+        w = self.execution_scheduler_worker
+        if w and w.isRunning():
+            w.stop(); w.wait(2000)
+        if w and not w.isRunning(): w.deleteLater(); self.execution_scheduler_worker = None
+
+    def _validate_order(self, side: str, amount_base: float):
+        """
+        Синхронная проверка ордера по правилам пары, стакану и кэшу балансов (без запросов к бирже).
+        Returns:
+            tuple: (dict результата validate_market_order, dict оценки по стакану или None)
+        """
+        rule = self.mexc_service.order_rules.get_or_build(self.current_market_data)
+        side = side.lower()
+        price = self.current_last_price
+        cost_override = None
+        book_estimate = None
+        if side == 'buy':
+            book_estimate = self._estimate_buy_cost_from_book(amount_base)
+            if book_estimate:
+                price = book_estimate['avg_price']
+                cost_override = book_estimate['cost']
+        elif self.order_book.is_fresh(self.ORDER_BOOK_MAX_AGE_SEC):
+            book_estimate = self.order_book.estimate_market_sell(amount_base)
+            if book_estimate:
+                price = book_estimate['avg_price']
+
+        cache = self.mexc_service.balance_cache
+        free_base = cache.get_free(rule.base) if cache.is_loaded() else None
+        free_quote = cache.get_free(rule.quote) if cache.is_loaded() else None
+        validation = validate_market_order(rule, side, amount_base, price, cost_override, free_base, free_quote)
+        return validation, book_estimate
+
+    @pyqtSlot(str)
+    def _handle_amount_changed(self, amount_text: str):
+        # Живая подсказка при вводе количества: округление, стоимость, ошибки лимитов, максимум по балансу
+        if not self.current_market_data:
+            return
+        amount_text = amount_text.strip().replace(',', '.')
+        if not amount_text:
+            self.ui.set_order_hint("", False)
+            return
+        try:
+            amount_base = float(amount_text)
+        except ValueError:
+            amount_base = None
+        if not is_finite_number(amount_base):
+            self.ui.set_order_hint("Некорректное количество", True)
+            return
+
+        buy_check, _ = self._validate_order('buy', amount_base)
+        sell_check, _ = self._validate_order('sell', amount_base)
+        quote_asset = self.current_market_data.get('quote', 'QUOTE')
+        rule = self.mexc_service.order_rules.get_or_build(self.current_market_data)
+        amount_precision = rule.amount_precision
+
+        parts = []
+        if buy_check['cost'] is not None:
+            parts.append(f"≈ {buy_check['cost']:.{rule.cost_precision}f} {quote_asset}")
+        if buy_check['amount'] is not None and buy_check['amount'] != amount_base:
+            parts.append(f"округл.: {buy_check['amount']:.{amount_precision}f}")
+        max_parts = []
+        if buy_check['max_amount'] is not None:
+            max_parts.append(f"покупка {buy_check['max_amount']:.{amount_precision}f}")
+        if sell_check['max_amount'] is not None:
+            max_parts.append(f"продажа {sell_check['max_amount']:.{amount_precision}f}")
+        if max_parts:
+            parts.append("макс.: " + ", ".join(max_parts))
+
+        errors = []
+        if not buy_check['ok']: errors.append(f"Покупка: {buy_check['error']}")
+        if not sell_check['ok']: errors.append(f"Продажа: {sell_check['error']}")
+        text = " | ".join(parts)
+        if errors:
+            text = (text + "\n" if text else "") + "\n".join(errors)
+        self.ui.set_order_hint(text, bool(errors) and not (buy_check['ok'] or sell_check['ok']))
+
+    def _open_basket_dialog(self):
+        if not (self.mexc_service.api_key and self.mexc_service.api_secret):
+            QMessageBox.warning(self, "Ошибка", "API ключи не установлены для торговли.");
+            return
+        if self.basket_dialog is None:
+            self.basket_dialog = BasketOrderDialog(self)
+            self.basket_dialog.submit_requested.connect(self._submit_basket)
+        self.basket_dialog.show()
+        self.basket_dialog.raise_()
+
+    @pyqtSlot(str)
+    def _submit_basket(self, basket_text: str):
+        if self.basket_order_worker and self.basket_order_worker.isRunning():
+            self.basket_dialog.show_result("Предыдущая корзина еще обрабатывается.", False)
+            return
+        # Для текущей пары есть свежая цена; остальные executor запросит одним fetch_tickers
+        prices = {}
+        if self.current_market_data and self.current_last_price:
+            prices[self.current_market_data['symbol']] = self.current_last_price
+        self.basket_dialog.set_busy(True)
+        self.basket_order_worker = BasketOrderWorker(self.mexc_service, basket_text, prices, self)
+        self.basket_order_worker.basket_finished.connect(self._handle_basket_finished)
+        self.basket_order_worker.finished.connect(self._on_basket_order_worker_finished)
+        self.basket_order_worker.start()
+
+    @pyqtSlot(object, object)
+    def _handle_basket_finished(self, result, errors):
+        if self.basket_dialog:
+            self.basket_dialog.set_busy(False)
+        if errors or not result:
+            if self.basket_dialog:
+                self.basket_dialog.show_result("\n".join(errors or ["Корзина не исполнена"]), False)
+            return
+
+        lines = [f"Отправлено: {result['ok_count']}/{len(result['legs'])} за {result['elapsed'] * 1000:.0f} мс"]
+        for leg in result['legs']:
+            if leg.get('error'):
+                lines.append(f"✗ {leg['symbol']} {leg['side']}: {leg['error']}")
+            else:
+                lines.append(f"✓ {leg['symbol']} {leg['side']} ID:{(leg.get('order') or {}).get('id', 'N/A')}")
+        if self.basket_dialog:
+            self.basket_dialog.show_result("\n".join(lines), result['error_count'] == 0)
+        self._handle_order_events(result.get('events', []))
+        self.start_orders_polling()
+
+    def _on_basket_order_worker_finished(self):
+        self._on_worker_finished_generic("basket_order_worker")
 
     def _handle_buy_action(self):
         self._initiate_trade("buy")
@@ -413,15 +1025,26 @@ class TradeWidget(QWidget):
         self._initiate_trade("sell")
 
     def stop_all_updates(self):
+        # Только опросы пары: воркеры ордеров при смене пары должны донести результат до OrderTracker
         self.ohlcv_update_timer.stop();
         self.balances_update_timer.stop()
-        for wa in ["fetch_ohlcv_worker", "fetch_balances_worker", "create_order_worker"]:
+        self.order_book_update_timer.stop()
+        self.trades_update_timer.stop()
+        for wa in ["fetch_ohlcv_worker", "fetch_order_book_worker", "fetch_trades_worker", "fetch_balances_worker"]:
+            w = getattr(self, wa, None)
+            if w and w.isRunning(): w.stop()
+            if w and not w.isRunning(): w.deleteLater();setattr(self, wa, None)
+
+    def stop_order_workers(self):
+        """Остановка отправки и опроса ордеров и корзины — только при закрытии приложения."""
+        self.orders_poll_timer.stop()
+        for wa in ["create_order_worker", "poll_orders_worker", "basket_order_worker"]:
             w = getattr(self, wa, None)
             if w and w.isRunning(): w.stop()
             if w and not w.isRunning(): w.deleteLater();setattr(self, wa, None)
 
     def closeEvent(self, event):
-        self.stop_all_updates(); super().closeEvent(event)
+        self.stop_all_updates(); self.stop_order_workers(); self.stop_execution_scheduler(); super().closeEvent(event)
 
 
 class MockTradeWidgetForTest(QWidget): pass
@@ -0,0 +1,96 @@
+# tests/test_alerts.py
+import json
+
+import pytest
+
+from src.core.alerts import AlertEngine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return AlertEngine(str(tmp_path / 'alerts.json'))
+
+
+def _ticker(price, bid=None, ask=None, change_pct=None):
+    return {'last_price': price, 'bid': bid, 'ask': ask, 'change_pct': change_pct}
+
+
+def test_above_fires_at_and_over_threshold(engine):
+    low, _ = engine.add_rule('btc/usdt', 'price', 'above', 100)
+    high, _ = engine.add_rule('BTC/USDT', 'price', 'above', 110)
+    assert engine.check_tickers({'BTC/USDT': _ticker(99.99)}) == []
+    fired = engine.check_tickers({'BTC/USDT': _ticker(100)})
+    assert [rule['id'] for rule in fired] == [low['id']]
+    assert fired[0]['triggered_value'] == 100
+    assert [rule['id'] for rule in engine.check_tickers({'BTC/USDT': _ticker(120)})] == [high['id']]
+
+
+def test_below_fires_at_and_under_threshold(engine):
+    low, _ = engine.add_rule('BTC/USDT', 'price', 'below', 90)
+    high, _ = engine.add_rule('BTC/USDT', 'price', 'below', 95)
+    assert engine.check_tickers({'BTC/USDT': _ticker(95.01)}) == []
+    assert [rule['id'] for rule in engine.check_tickers({'BTC/USDT': _ticker(95)})] == [high['id']]
+    assert [rule['id'] for rule in engine.check_tickers({'BTC/USDT': _ticker(10)})] == [low['id']]
+
+
+def test_rule_fires_only_once(engine):
+    rule, _ = engine.add_rule('BTC/USDT', 'price', 'above', 100)
+    assert len(engine.check_tickers({'BTC/USDT': _ticker(101)})) == 1
+    assert engine.check_tickers({'BTC/USDT': _ticker(150)}) == []
+    stored = {item['id']: item for item in engine.list_rules()}[rule['id']]
+    assert not stored['active']
+    assert engine.active_symbols() == []
+
+
+def test_spread_and_missing_values(engine):
+    engine.add_rule('ETH/USDT', 'spread_pct', 'above', 1.0)
+    engine.add_rule('ETH/USDT', 'change_pct', 'below', -5)
+    assert engine.check_tickers({'ETH/USDT': _ticker(100, bid=None, ask=100)}) == []
+    fired = engine.check_tickers({'ETH/USDT': _ticker(100, bid=98, ask=100, change_pct=-6)})
+    assert sorted(rule['metric'] for rule in fired) == ['change_pct', 'spread_pct']
+
+
+def test_other_symbols_are_ignored(engine):
+    engine.add_rule('BTC/USDT', 'price', 'above', 1)
+    assert engine.check_tickers({'ETH/USDT': _ticker(1000)}) == []
+
+
+@pytest.mark.parametrize('args', [
+    ('', 'price', 'above', 1), ('BTC/USDT', 'volume', 'above', 1),
+    ('BTC/USDT', 'price', 'sideways', 1), ('BTC/USDT', 'price', 'above', 'abc'),
+    ('BTC/USDT', 'price', 'above', float('nan')),
+])
+def test_invalid_rules_are_rejected(engine, args):
+    rule, error_msg = engine.add_rule(*args)
+    assert rule is None and error_msg
+    assert len(engine) == 0
+
+
+def test_remove_rule_unindexes_it(engine):
+    rule, _ = engine.add_rule('BTC/USDT', 'price', 'above', 100)
+    assert engine.remove_rule(rule['id']) == (True, None)
+    assert engine.remove_rule(rule['id']) == (False, None)
+    assert engine.check_tickers({'BTC/USDT': _ticker(200)}) == []
+
+
+def test_save_and_load_round_trip(engine):
+    fired_rule, _ = engine.add_rule('BTC/USDT', 'price', 'above', 100)
+    active_rule, _ = engine.add_rule('BTC/USDT', 'price', 'below', 50)
+    engine.check_tickers({'BTC/USDT': _ticker(100)})
+    with open(engine.path, encoding='utf-8') as f:
+        assert len(json.load(f)['rules']) == 2
+
+    restored = AlertEngine(engine.path)
+    assert restored.load() == (2, None)
+    rules = {rule['id']: rule for rule in restored.list_rules()}
+    assert not rules[fired_rule['id']]['active']
+    assert rules[active_rule['id']]['active']
+    # Индекс порогов восстанавливается только для активных правил
+    assert [rule['id'] for rule in restored.check_tickers({'BTC/USDT': _ticker(40)})] == [active_rule['id']]
+
+
+def test_load_reports_broken_file(tmp_path):
+    path = tmp_path / 'alerts.json'
+    path.write_text('{broken', encoding='utf-8')
+    count, error_msg = AlertEngine(str(path)).load()
+    assert count == 0 and error_msg
@@ -0,0 +1,96 @@
+# tests/test_order_rules.py
+import math
+from decimal import Decimal
+
+import pytest
+
+from src.core.order_rules import OrderRule, validate_limit_order, validate_market_order, is_finite_number
+
+MARKET = {
+    'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT',
+    'precision': {'amount': 3, 'price': 2, 'cost': 2, 'raw_amount': 0.001, 'raw_price': 0.01},
+    'limits': {'amount': {'min': 0.01, 'max': 100}, 'cost': {'min': 5}},
+}
+
+
+@pytest.fixture
+def rule():
+    return OrderRule(MARKET)
+
+
+def test_round_amount_floors_to_step(rule):
+    assert rule.round_amount(0.12345) == Decimal('0.123')
+    assert rule.round_amount(0.1239999) == Decimal('0.123')
+    assert rule.round_price(100.019) == Decimal('100.01')
+
+
+def test_step_from_decimal_places_without_raw_tick():
+    rule = OrderRule({'symbol': 'X/USDT', 'precision': {'amount': 2}})
+    assert rule.amount_step == Decimal('0.01')
+    assert rule.round_amount(1.999) == Decimal('1.99')
+
+
+def test_market_sell_rounds_amount_and_uses_base_as_api_amount(rule):
+    result = validate_market_order(rule, 'sell', 0.0509, 200.0, free_base=1.0)
+    assert result['ok'], result['error']
+    assert result['amount'] == 0.05
+    assert result['api_amount'] == 0.05
+    assert result['cost'] == 10.0
+
+
+def test_market_buy_uses_cost_as_api_amount(rule):
+    result = validate_market_order(rule, 'buy', 0.05, 200.0, free_quote=100.0)
+    assert result['ok'], result['error']
+    assert result['api_amount'] == 10.0
+    assert result['max_amount'] == 0.5
+
+
+def test_amount_below_step_is_rejected(rule):
+    result = validate_market_order(rule, 'sell', 0.0009, 200.0)
+    assert not result['ok']
+    assert result['error'].startswith("Кол-во меньше шага")
+
+
+def test_amount_below_min_is_rejected(rule):
+    result = validate_market_order(rule, 'sell', 0.005, 2000.0)
+    assert not result['ok']
+    assert result['error'].startswith("Кол-во < min")
+
+
+def test_cost_below_min_notional_is_rejected(rule):
+    result = validate_market_order(rule, 'sell', 0.02, 100.0)
+    assert not result['ok']
+    assert result['error'].startswith("Сумма (2.00) < min")
+    limit_result = validate_limit_order(rule, 'buy', 0.02, 100.0)
+    assert not limit_result['ok']
+    assert limit_result['error'].startswith("Сумма")
+
+
+def test_insufficient_balance_is_rejected(rule):
+    assert validate_market_order(rule, 'buy', 0.05, 200.0, free_quote=9.99)['error'] == "Недостаточно USDT"
+    assert validate_limit_order(rule, 'sell', 0.05, 200.0, free_base=0.04)['error'] == "Недостаточно BTC"
+
+
+@pytest.mark.parametrize('value', [math.nan, math.inf, -math.inf, 'nan', 'abc', None])
+def test_non_finite_amount_is_rejected(rule, value):
+    assert not is_finite_number(value)
+    assert validate_market_order(rule, 'sell', value, 200.0)['error'] == "Некорректное количество"
+    assert validate_limit_order(rule, 'sell', value, 200.0)['error'] == "Некорректные кол-во или цена"
+
+
+@pytest.mark.parametrize('price', [math.nan, math.inf])
+def test_non_finite_limit_price_is_rejected(rule, price):
+    assert validate_limit_order(rule, 'buy', 0.05, price)['error'] == "Некорректные кол-во или цена"
+
+
+def test_nan_cost_override_falls_back_to_amount_times_price(rule):
+    result = validate_market_order(rule, 'buy', 0.05, 200.0, cost_override=math.nan)
+    assert result['ok'], result['error']
+    assert result['cost'] == 10.0
+
+
+def test_limit_order_rounds_price_to_tick(rule):
+    result = validate_limit_order(rule, 'buy', 0.0509, 200.019)
+    assert result['ok'], result['error']
+    assert result['amount'] == 0.05
+    assert result['price'] == 200.01